@@ -0,0 +1,144 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils.translation import gettext_lazy as _
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from issue_tracker.metrics import timed
+
+DEFAULT_USER_CACHE_SIZE = 10000
+DEFAULT_USER_CACHE_TTL = 60
+
+
+class UserCache:
+    """
+    Bounded LRU cache of ``User`` rows, keyed by the user id claim of access tokens (a string).
+
+    ``auth_api.signals`` drops a user as soon as it is saved or deleted. Those signals only reach the current process
+    and aren't sent by ``QuerySet.update()``, so entries also expire after ``AUTH_API_USER_CACHE_TTL`` seconds.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.entries: OrderedDict[str, tuple[User, float]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        return getattr(settings, 'AUTH_API_USER_CACHE_SIZE', DEFAULT_USER_CACHE_SIZE)
+
+    @property
+    def ttl(self) -> float:
+        return getattr(settings, 'AUTH_API_USER_CACHE_TTL', DEFAULT_USER_CACHE_TTL)
+
+    def get(self, user_id: str) -> User | None:
+        """Returns a copy of the cached user, so requests can't change each other's ``request.user``."""
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None or entry[1] <= self.clock():
+                return None
+            self.entries.move_to_end(user_id)
+            return copy.copy(entry[0])
+
+    def set(self, user_id: str, user: User):
+        with self.lock:
+            self.entries[user_id] = (copy.copy(user), self.clock() + self.ttl)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that takes users from ``user_cache`` instead of querying ``auth_user`` on every request.
+
+    ``request.user`` is still a real ``User`` instance, and the active and revoked token checks still run on
+    every request.
+    """
+
+    def authenticate(self, request: Request) -> tuple[User, Token] | None:
+        with timed('auth'):
+            validated_token = self.get_request_token(request)
+            if validated_token is None:
+                return None
+            return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token: Token) -> User:
+        user_id = self.get_user_id(validated_token)
+        user = user_cache.get(str(user_id))
+        if user is None:
+            user = self.remember_user(user_id, self.user_query(user_id).first())
+        return self.check_user(user, validated_token)
+
+    async def aauthenticate(self, request: Request) -> tuple[User, Token] | None:
+        """``authenticate()`` for async views, which only awaits the database when the user isn't cached."""
+        with timed('auth'):
+            validated_token = self.get_request_token(request)
+            if validated_token is None:
+                return None
+            return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token: Token) -> User:
+        user_id = self.get_user_id(validated_token)
+        user = user_cache.get(str(user_id))
+        if user is None:
+            user = self.remember_user(user_id, await self.user_query(user_id).afirst())
+        return self.check_user(user, validated_token)
+
+    def get_request_token(self, request: Request) -> Token | None:
+        """The validated token of the ``Authorization`` header, None without one."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        return self.get_validated_token(raw_token)
+
+    def user_query(self, user_id):
+        return self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+
+    @staticmethod
+    def remember_user(user_id, user: User | None) -> User:
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        user_cache.set(str(user_id), user)
+        return user
+
+    @staticmethod
+    def get_user_id(validated_token: Token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_('Token contained no recognizable user identification')) from e
+
+    @staticmethod
+    def check_user(user: User, validated_token: Token) -> User:
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN and \
+                validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return user
@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.views.decorators.debug import sensitive_variables
+
+from auth_api.hashing import hashing_pool
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """``ModelBackend`` that checks passwords on ``hashing_pool`` instead of the request thread."""
+
+    @sensitive_variables('password')
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            user = None
+
+        # An unusable password still costs one hashing, like in ModelBackend, so that response times don't reveal
+        # whether the user exists
+        encoded = user.password if user is not None else UNUSABLE_PASSWORD_PREFIX
+        is_correct, must_update = hashing_pool.verify_password(password, encoded)
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            user.password = hashing_pool.make_password(password)
+            user.save(update_fields=['password'])
+        return user
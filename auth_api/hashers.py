@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+DEFAULT_ARGON2_TIME_COST = 2
+DEFAULT_ARGON2_MEMORY_COST = 65536
+DEFAULT_ARGON2_PARALLELISM = 1
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with the costs of the ``AUTH_API_ARGON2_*`` settings, pick them with ``manage.py tune_argon2``.
+
+    Needs the ``argon2-cffi`` package. Passwords hashed with other costs are hashed again on the next login.
+    """
+
+    @property
+    def time_cost(self) -> int:
+        return getattr(settings, 'AUTH_API_ARGON2_TIME_COST', DEFAULT_ARGON2_TIME_COST)
+
+    @property
+    def memory_cost(self) -> int:
+        """In KiB."""
+        return getattr(settings, 'AUTH_API_ARGON2_MEMORY_COST', DEFAULT_ARGON2_MEMORY_COST)
+
+    @property
+    def parallelism(self) -> int:
+        return getattr(settings, 'AUTH_API_ARGON2_PARALLELISM', DEFAULT_ARGON2_PARALLELISM)
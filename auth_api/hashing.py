@@ -0,0 +1,99 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework.exceptions import APIException
+from rest_framework.status import HTTP_503_SERVICE_UNAVAILABLE
+
+DEFAULT_WORKERS = 0
+DEFAULT_QUEUE_LIMIT = 16
+DEFAULT_TIMEOUT = 10
+
+
+class HashingOverloaded(APIException):
+    status_code = HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many passwords are being checked right now, try again shortly.'
+    default_code = 'hashing_overloaded'
+    # Sent as Retry-After by DRF's exception handler
+    wait = 1
+
+
+def _setup_worker():
+    # Workers are spawned, not forked, so they have to load the settings of the parent themselves
+    import django
+    django.setup()
+
+
+class PasswordHashingPool:
+    """
+    Runs password hashing on a pool of ``AUTH_API_HASHING_WORKERS`` processes, so a burst of logins can't take every
+    request thread's CPU time and the GIL away from everything else.
+
+    At most ``AUTH_API_HASHING_QUEUE_LIMIT`` hashing jobs of this process may be queued or running at once, the next
+    ones are refused with ``HashingOverloaded`` (``503 Service Unavailable``) right away rather than piling up. With
+    no workers, hashing runs on the request thread but is still limited.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executor: ProcessPoolExecutor | None = None
+        self.pending = 0
+
+    @property
+    def workers(self) -> int:
+        return getattr(settings, 'AUTH_API_HASHING_WORKERS', DEFAULT_WORKERS)
+
+    @property
+    def queue_limit(self) -> int:
+        return getattr(settings, 'AUTH_API_HASHING_QUEUE_LIMIT', DEFAULT_QUEUE_LIMIT)
+
+    def run(self, function: Callable, *args):
+        with self.lock:
+            if self.pending >= self.queue_limit:
+                raise HashingOverloaded()
+            self.pending += 1
+            if self.workers and self.executor is None:
+                self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                                    initializer=_setup_worker)
+            executor = self.executor if self.workers else None
+
+        if executor is None:
+            try:
+                return function(*args)
+            finally:
+                self._release()
+        try:
+            future = executor.submit(function, *args)
+        except BaseException:
+            self._release()
+            raise
+        # A job that timed out keeps its worker busy until it finishes, it stays pending until then
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=getattr(settings, 'AUTH_API_HASHING_TIMEOUT', DEFAULT_TIMEOUT))
+        except TimeoutError:
+            future.cancel()
+            raise HashingOverloaded()
+
+    def _release(self, future: Future | None = None):
+        with self.lock:
+            self.pending -= 1
+
+    def make_password(self, password: str) -> str:
+        return self.run(hashers.make_password, password)
+
+    def verify_password(self, password: str, encoded: str | None) -> tuple[bool, bool]:
+        """Whether ``password`` matches ``encoded``, and whether it should be hashed again with the current hasher."""
+        return self.run(hashers.verify_password, password, encoded)
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+hashing_pool = PasswordHashingPool()
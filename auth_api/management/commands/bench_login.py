@@ -0,0 +1,60 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+
+def bench_login(logins: int, concurrency: int) -> tuple[float, list[tuple[int, float]]]:
+    """
+    Logs a throwaway user in ``logins`` times through ``token/``, from ``concurrency`` threads.
+
+    Returns the total time and the status code and time of every login, in seconds.
+    """
+    username, password = f'bench-login-{uuid.uuid4().hex}', uuid.uuid4().hex
+    user = User.objects.create_user(username=username, password=password)
+    url = reverse('token_obtain_pair')
+    host = next((host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost')
+
+    def login(_) -> tuple[int, float]:
+        start = time.perf_counter()
+        try:
+            status = Client(HTTP_HOST=host).post(url, {'username': username, 'password': password},
+                                   content_type='application/json').status_code
+        finally:
+            connections.close_all()
+        return status, time.perf_counter() - start
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            results = list(executor.map(login, range(logins)))
+        return time.perf_counter() - start, results
+    finally:
+        user.delete()
+
+
+class Command(BaseCommand):
+    help = 'Measures login throughput through token/, including password hashing on the hashing pool.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=8)
+
+    def handle(self, *args, **options):
+        elapsed, results = bench_login(options['logins'], options['concurrency'])
+        timings = sorted(timing * 1000 for status, timing in results if status == 200)
+        refused = sum(status == 503 for status, timing in results)
+        failed = len(results) - len(timings) - refused
+
+        self.stdout.write(f'{len(timings)} logins in {elapsed:.2f} s: {len(timings) / elapsed:.1f}/s, '
+                          f'{refused} refused, {failed} failed')
+        if timings:
+            self.stdout.write(f'p50 {timings[len(timings) // 2]:.1f} ms, '
+                              f'p99 {timings[int(len(timings) * 0.99)]:.1f} ms, '
+                              f'max {timings[-1]:.1f} ms')
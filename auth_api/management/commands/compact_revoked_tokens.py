@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from auth_api.revocation import revocation_store
+
+
+class Command(BaseCommand):
+    help = 'Deletes revoked refresh tokens that have expired anyway. Meant to run periodically, e.g. from cron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        deleted = revocation_store.compact(options['batch_size'])
+        self.stdout.write(f'Deleted {deleted} expired revoked tokens')
@@ -0,0 +1,55 @@
+import os
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def measure(hash_secret, argon2_type, time_cost: int, memory_cost: int, parallelism: int, rounds: int) -> float:
+    """Median time of one hashing with the given costs, in seconds."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        hash_secret(os.urandom(16), os.urandom(16), time_cost=time_cost, memory_cost=memory_cost,
+                    parallelism=parallelism, hash_len=32, type=argon2_type)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = 'Finds the Argon2 costs that use the most memory while hashing a password within a time budget.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target-ms', type=float, default=250, help='Time budget of one hashing')
+        parser.add_argument('--max-memory-mib', type=int, default=256)
+        parser.add_argument('--parallelism', type=int, default=1)
+        parser.add_argument('--rounds', type=int, default=3, help='Hashings measured per combination of costs')
+
+    def handle(self, *args, **options):
+        try:
+            from argon2.low_level import Type, hash_secret
+        except ImportError:
+            raise CommandError('Argon2 needs the argon2-cffi package')
+
+        target = options['target_ms'] / 1000
+
+        def timed(time_cost: int, memory_cost: int) -> float:
+            elapsed = measure(hash_secret, Type.ID, time_cost, memory_cost, options['parallelism'], options['rounds'])
+            self.stdout.write(f'time_cost={time_cost} memory_cost={memory_cost} KiB: {elapsed * 1000:.1f} ms')
+            return elapsed
+
+        # Memory first, it's what makes guessing on GPUs expensive, then as many passes as still fit
+        best = None
+        memory_cost = 8 * 1024
+        while memory_cost <= options['max_memory_mib'] * 1024 and timed(1, memory_cost) <= target:
+            best = (1, memory_cost)
+            memory_cost *= 2
+        if best is None:
+            raise CommandError('Even 8 MiB and a single pass take longer than the target')
+        while timed(best[0] + 1, best[1]) <= target:
+            best = (best[0] + 1, best[1])
+
+        self.stdout.write('\nAdd to the settings:')
+        self.stdout.write(f'AUTH_API_ARGON2_TIME_COST = {best[0]}')
+        self.stdout.write(f'AUTH_API_ARGON2_MEMORY_COST = {best[1]}')
+        self.stdout.write(f'AUTH_API_ARGON2_PARALLELISM = {options["parallelism"]}')
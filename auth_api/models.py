@@ -1,3 +1,16 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class RevokedToken(models.Model):
+    """Refresh token that can't be used anymore, see auth_api.revocation."""
+    jti = models.CharField(max_length=64, unique=True)
+    # Past this, the token is refused for having expired and the row can go
+    expires_at = models.DateTimeField(db_index=True)
+    # Lets other processes pick up the rows revoked since they last synced, see RevocationStore.sync()
+    revoked_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = 'revoked_tokens'
+        verbose_name = 'Revoked token'
+        verbose_name_plural = 'Revoked tokens'
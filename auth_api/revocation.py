@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Callable
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from auth_api.models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 1000000
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_SYNC_INTERVAL = 1
+DEFAULT_SYNC_OVERLAP = 60
+DEFAULT_REBUILD_INTERVAL = 3600
+
+
+class BloomFilter:
+    """
+    Set of strings that never misses an added one, but may claim to contain one that wasn't added.
+
+    Sized so that this happens with a probability of ``error_rate`` once ``capacity`` strings were added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+def start_thread(function: Callable[[], None]):
+    threading.Thread(target=function, name='revocation-filter', daemon=True).start()
+
+
+class RevocationStore:
+    """
+    Revoked refresh tokens, in the ``revoked_tokens`` table with a Bloom filter of their ids in front of it.
+
+    Checking a token that wasn't revoked, the common case, normally costs no query whatever the size of the table:
+    only the rare tokens the filter reports are looked up. Each process keeps its own filter and adds the rows other
+    processes revoked every ``AUTH_API_REVOCATION_SYNC_INTERVAL`` seconds, which is how long a token revoked by another
+    process may still be accepted. Every sync reads the rows revoked since the previous one started, minus
+    ``AUTH_API_REVOCATION_SYNC_OVERLAP`` seconds, so rows committed late or stamped by a process whose clock is behind
+    aren't missed.
+
+    The filter is rebuilt from the unexpired rows every ``AUTH_API_REVOCATION_REBUILD_INTERVAL`` seconds and whenever
+    it outgrows its capacity. Rebuilds run in the background (``run_in_background``), requests keep using the
+    previous filter until the new one is ready, and look tokens up in the table until the first one is.
+    """
+
+    def __init__(self, clock=time.monotonic, run_in_background: Callable[[Callable[[], None]], None] = start_thread):
+        self.clock = clock
+        self.run_in_background = run_in_background
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.reset()
+
+    def reset(self):
+        """Forgets everything, the filter is rebuilt from the table on the next check."""
+        with self.lock:
+            self.bloom: BloomFilter | None = None
+            self.synced_at: datetime | None = None
+            self.next_sync = 0.0
+            self.next_rebuild = 0.0
+            self.rebuilding = False
+            # Filters built before the reset are thrown away
+            self.generation += 1
+
+    def revoke(self, jti: str, expires_at: datetime):
+        RevokedToken.objects.bulk_create([RevokedToken(jti=jti, expires_at=expires_at)], ignore_conflicts=True)
+        with self.lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        self.sync()
+        bloom = self.bloom
+        if bloom is not None and jti not in bloom:
+            return False
+        return RevokedToken.objects.filter(jti=jti, expires_at__gt=timezone.now()).exists()
+
+    def sync(self):
+        now = self.clock()
+        if now < self.next_sync:
+            return
+        with self.lock:
+            if now < self.next_sync:
+                return
+            if self.bloom is not None:
+                started_at = timezone.now()
+                overlap = timedelta(seconds=getattr(settings, 'AUTH_API_REVOCATION_SYNC_OVERLAP', DEFAULT_SYNC_OVERLAP))
+                self._add_rows(RevokedToken.objects.filter(revoked_at__gte=self.synced_at - overlap), self.bloom)
+                self.synced_at = started_at
+            rebuild = not self.rebuilding and (
+                self.bloom is None or now >= self.next_rebuild or self.bloom.count > self.bloom.capacity
+            )
+            if rebuild:
+                self.rebuilding = True
+                self.next_rebuild = now + getattr(settings, 'AUTH_API_REVOCATION_REBUILD_INTERVAL',
+                                                  DEFAULT_REBUILD_INTERVAL)
+            generation = self.generation
+            self.next_sync = now + getattr(settings, 'AUTH_API_REVOCATION_SYNC_INTERVAL', DEFAULT_SYNC_INTERVAL)
+        if rebuild:
+            self.run_in_background(lambda: self.rebuild(generation))
+
+    def rebuild(self, generation: int):
+        """Builds a new filter from the unexpired rows, without holding the lock, and swaps it in."""
+        try:
+            started_at = timezone.now()
+            rows = RevokedToken.objects.filter(expires_at__gt=started_at)
+            capacity = max(getattr(settings, 'AUTH_API_REVOCATION_CAPACITY', DEFAULT_CAPACITY), rows.count() * 2)
+            bloom = BloomFilter(capacity, getattr(settings, 'AUTH_API_REVOCATION_ERROR_RATE', DEFAULT_ERROR_RATE))
+            self._add_rows(rows, bloom)
+            with self.lock:
+                if generation == self.generation:
+                    self.bloom = bloom
+                    # Rows revoked while the filter was being built are added by the next sync
+                    self.synced_at = started_at
+        except Exception:
+            logger.exception('Could not rebuild the filter of revoked tokens')
+        finally:
+            with self.lock:
+                if generation == self.generation:
+                    self.rebuilding = False
+            if threading.current_thread() is not threading.main_thread():
+                connections.close_all()
+
+    @staticmethod
+    def _add_rows(rows, bloom: BloomFilter):
+        for jti in rows.values_list('jti', flat=True).iterator(chunk_size=10000):
+            # Rows of the overlap are read again, they shouldn't count twice towards the capacity
+            if jti not in bloom:
+                bloom.add(jti)
+
+    def compact(self, batch_size: int = 10000) -> int:
+        """Deletes the rows of expired tokens, returns how many. Run it periodically, see compact_revoked_tokens."""
+        deleted = 0
+        while True:
+            batch = list(RevokedToken.objects.filter(expires_at__lte=timezone.now())
+                         .values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                return deleted
+            deleted += RevokedToken.objects.filter(pk__in=batch).delete()[0]
+
+
+revocation_store = RevocationStore()
+
+
+class RevocationMixin:
+    """
+    Makes a simplejwt token check ``revocation_store``, and revoke itself from ``blacklist()``.
+
+    ``TokenRefreshSerializer`` calls ``blacklist()`` on the old refresh token when ``BLACKLIST_AFTER_ROTATION`` is on.
+    """
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        if revocation_store.is_revoked(self[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is revoked'))
+
+    def blacklist(self):
+        revocation_store.revoke(self[api_settings.JTI_CLAIM], datetime.fromtimestamp(self['exp'], tz=dt_timezone.utc))
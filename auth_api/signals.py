@@ -0,0 +1,12 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+
+from auth_api.authentication import user_cache
+
+
+@receiver([post_save, post_delete], sender=User)
+def forget_user(sender, instance: User, **kwargs):
+    # Deactivated users and changed passwords have to be noticed by the next request
+    user_cache.invalidate(str(getattr(instance, api_settings.USER_ID_FIELD)))
@@ -1,8 +1,22 @@
-﻿from rest_framework.test import APITestCase
+﻿from unittest import mock
+
+from rest_framework.test import APITestCase
+
+from auth_api.revocation import revocation_store
+
+
+def run_now(function):
+    function()
 
 
 class BaseTestCase(APITestCase):
     def setUp(self):
+        # Rolled back rows may still be in the Bloom filter
+        revocation_store.reset()
+        # A thread wouldn't see the rows of the test's transaction
+        patcher = mock.patch.object(revocation_store, 'run_in_background', run_now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.test_user_data = {
             'username': 'testuser',
             'password': 'testpass123',
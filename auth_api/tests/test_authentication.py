@@ -0,0 +1,106 @@
+﻿from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from auth_api.authentication import UserCache, user_cache
+from auth_api.tests.base import BaseTestCase
+from issue_tracker.models import Project, ProjectMembership, ProjectPermission
+
+
+class CachedJWTAuthenticationTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        user_cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.authenticate(self.user)
+
+    def authenticate(self, user: User):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+    def test_user_is_cached(self):
+        self.assertEqual(self.client.get(reverse('ping')).status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('ping'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_views_get_a_real_user(self):
+        project = Project.objects.create(name='Project')
+        ProjectMembership.objects.create(user=self.user, project=project, role=ProjectPermission.Read)
+        url = reverse('project issues view', kwargs={'project_id': project.name})
+        self.client.get(url)
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIs(type(response.wsgi_request.user), User)
+
+    def test_requests_get_their_own_copy(self):
+        self.client.get(reverse('ping'))
+        user = self.client.get(reverse('ping')).wsgi_request.user
+        user.username = 'changed'
+
+        self.assertEqual(self.client.get(reverse('ping')).wsgi_request.user.username, 'testuser')
+
+    def test_deactivated_user(self):
+        self.client.get(reverse('ping'))
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get(reverse('ping')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user(self):
+        self.client.get(reverse('ping'))
+
+        self.user.delete()
+
+        self.assertEqual(self.client.get(reverse('ping')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True)
+    def test_changed_password(self):
+        self.authenticate(self.user)
+        self.assertEqual(self.client.get(reverse('ping')).status_code, status.HTTP_200_OK)
+
+        self.user.password = make_password('newpass123')
+        self.user.save()
+
+        self.assertEqual(self.client.get(reverse('ping')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_without_user_id(self):
+        token = AccessToken()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        self.assertEqual(self.client.get(reverse('ping')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class UserCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = UserCache(clock=lambda: self.now)
+
+    @override_settings(AUTH_API_USER_CACHE_TTL=60)
+    def test_entries_expire(self):
+        self.cache.set('1', User(pk=1))
+
+        self.now = 59
+        self.assertEqual(self.cache.get('1').pk, 1)
+        self.now = 60
+        self.assertIsNone(self.cache.get('1'))
+
+    @override_settings(AUTH_API_USER_CACHE_SIZE=2)
+    def test_least_recently_used_entries_are_dropped(self):
+        for user_id in (1, 2):
+            self.cache.set(str(user_id), User(pk=user_id))
+        self.cache.get('1')
+        self.cache.set('3', User(pk=3))
+
+        self.assertIsNone(self.cache.get('2'))
+        self.assertIsNotNone(self.cache.get('1'))
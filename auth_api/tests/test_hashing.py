@@ -0,0 +1,140 @@
+﻿import importlib.util
+import os
+import time
+import unittest
+from io import StringIO
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command, CommandError
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from auth_api.hashers import TunedArgon2PasswordHasher
+from auth_api.hashing import HashingOverloaded, PasswordHashingPool
+from auth_api.management.commands.bench_login import bench_login
+from auth_api.tests.base import BaseTestCase
+
+HAS_ARGON2 = importlib.util.find_spec('argon2') is not None
+
+
+@override_settings(AUTH_API_HASHING_WORKERS=0)
+class PasswordHashingPoolTest(SimpleTestCase):
+    def test_inline(self):
+        pool = PasswordHashingPool()
+        encoded = pool.make_password('testpass123')
+
+        self.assertTrue(check_password('testpass123', encoded))
+        self.assertEqual(pool.verify_password('testpass123', encoded), (True, False))
+        self.assertEqual(pool.verify_password('wrong', encoded), (False, False))
+        self.assertEqual(pool.pending, 0)
+
+    @override_settings(AUTH_API_HASHING_QUEUE_LIMIT=0)
+    def test_load_shedding(self):
+        with self.assertRaises(HashingOverloaded):
+            PasswordHashingPool().make_password('testpass123')
+
+    @override_settings(AUTH_API_HASHING_WORKERS=1)
+    def test_process_pool(self):
+        pool = PasswordHashingPool()
+        self.addCleanup(pool.shutdown)
+
+        self.assertNotEqual(pool.run(os.getpid), os.getpid())
+        self.assertTrue(check_password('testpass123', pool.make_password('testpass123')))
+
+    @override_settings(AUTH_API_HASHING_WORKERS=1, AUTH_API_HASHING_QUEUE_LIMIT=1)
+    def test_timeout(self):
+        pool = PasswordHashingPool()
+        self.addCleanup(pool.shutdown)
+        # Start the worker, so that the job below is running rather than queued when it times out
+        pool.run(os.getpid)
+
+        with override_settings(AUTH_API_HASHING_TIMEOUT=0.01), self.assertRaises(HashingOverloaded):
+            pool.run(time.sleep, 0.5)
+        # The job still runs in the worker and is counted until it finishes
+        self.assertEqual(pool.pending, 1)
+        with self.assertRaises(HashingOverloaded):
+            pool.run(os.getpid)
+        deadline = time.monotonic() + 10
+        while pool.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(pool.pending, 0)
+
+
+class PooledModelBackendTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def test_authenticate(self):
+        self.assertEqual(authenticate(username='testuser', password='testpass123'), self.user)
+        self.assertIsNone(authenticate(username='testuser', password='wrong'))
+        self.assertIsNone(authenticate(username='nobody', password='testpass123'))
+        self.assertIsNone(authenticate(username='testuser'))
+
+    def test_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertIsNone(authenticate(username='testuser', password='testpass123'))
+
+    def test_outdated_hash_is_upgraded(self):
+        self.user.password = make_password('testpass123', hasher='pbkdf2_sha1')
+        self.user.save()
+
+        authenticate(username='testuser', password='testpass123')
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+
+    @override_settings(AUTH_API_HASHING_QUEUE_LIMIT=0)
+    def test_login_is_shed(self):
+        response = self.client.post(reverse('token_obtain_pair'), self.test_user_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.headers['Retry-After'], '1')
+
+    @override_settings(AUTH_API_HASHING_QUEUE_LIMIT=0)
+    def test_registration_is_shed(self):
+        response = self.client.post(reverse('register'), {'username': 'newuser', 'password': 'newpass123'},
+                                    format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(User.objects.filter(username='newuser').exists())
+
+
+class BenchLoginTest(TransactionTestCase):
+    def test_bench_login(self):
+        elapsed, results = bench_login(logins=4, concurrency=2)
+
+        self.assertEqual([status for status, timing in results], [200] * 4)
+        self.assertFalse(User.objects.exists())
+
+
+@unittest.skipUnless(HAS_ARGON2, 'Needs argon2-cffi')
+class TunedArgon2PasswordHasherTest(SimpleTestCase):
+    @override_settings(AUTH_API_ARGON2_TIME_COST=1, AUTH_API_ARGON2_MEMORY_COST=8192, AUTH_API_ARGON2_PARALLELISM=1)
+    def test_costs_come_from_the_settings(self):
+        hasher = TunedArgon2PasswordHasher()
+        encoded = hasher.encode('testpass123', hasher.salt())
+
+        self.assertIn('m=8192,t=1,p=1', encoded)
+        self.assertTrue(hasher.verify('testpass123', encoded))
+        with self.settings(AUTH_API_ARGON2_TIME_COST=2):
+            self.assertTrue(hasher.must_update(encoded))
+
+    def test_tune_command(self):
+        out = StringIO()
+
+        call_command('tune_argon2', target_ms=1000, max_memory_mib=16, rounds=1, stdout=out)
+
+        self.assertIn('AUTH_API_ARGON2_MEMORY_COST = 16384', out.getvalue())
+
+
+@unittest.skipIf(HAS_ARGON2, 'argon2-cffi is installed')
+class TuneArgon2WithoutArgon2Test(SimpleTestCase):
+    def test_tune_command(self):
+        with self.assertRaises(CommandError):
+            call_command('tune_argon2')
@@ -0,0 +1,181 @@
+﻿import uuid
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from auth_api.models import RevokedToken
+from auth_api.revocation import BloomFilter, RevocationStore, revocation_store
+from auth_api.tests.base import BaseTestCase, run_now
+
+
+class BloomFilterTest(SimpleTestCase):
+    def test_added_values_are_found(self):
+        bloom = BloomFilter(1000, 0.01)
+        values = [uuid.uuid4().hex for _ in range(1000)]
+        for value in values:
+            bloom.add(value)
+
+        self.assertTrue(all(value in bloom for value in values))
+        self.assertEqual(bloom.count, 1000)
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(10000, 0.01)
+        for _ in range(10000):
+            bloom.add(uuid.uuid4().hex)
+
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+
+        self.assertLess(false_positives, 200)
+
+
+@override_settings(AUTH_API_REVOCATION_CAPACITY=1000)
+class RevocationStoreTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = 0.0
+        self.store = RevocationStore(clock=lambda: self.now, run_in_background=run_now)
+        self.expires_at = timezone.now() + timedelta(days=1)
+
+    def test_revoke(self):
+        self.store.revoke('revoked', self.expires_at)
+
+        self.assertTrue(self.store.is_revoked('revoked'))
+        self.assertFalse(self.store.is_revoked('valid'))
+
+    def test_unrevoked_tokens_cost_no_query(self):
+        RevokedToken.objects.bulk_create([RevokedToken(jti=uuid.uuid4().hex, expires_at=self.expires_at)
+                                          for _ in range(5000)])
+        self.store.sync()
+
+        with self.assertNumQueries(0):
+            revoked = [self.store.is_revoked(uuid.uuid4().hex) for _ in range(100)]
+
+        self.assertEqual(revoked, [False] * 100)
+        # Outgrew the configured capacity
+        self.assertGreaterEqual(self.store.bloom.capacity, 10000)
+
+    def test_tokens_revoked_by_other_processes(self):
+        self.store.sync()
+        other_process = RevocationStore(run_in_background=run_now)
+        other_process.revoke('revoked', self.expires_at)
+
+        self.assertFalse(self.store.is_revoked('revoked'))
+        self.now += 1
+        self.assertTrue(self.store.is_revoked('revoked'))
+
+    def test_rows_committed_out_of_order(self):
+        self.store.sync()
+        # Revoked by another process before the last sync, but committed after it with a higher id
+        RevokedToken.objects.create(jti='late', expires_at=self.expires_at,
+                                    revoked_at=timezone.now() - timedelta(seconds=30))
+        RevokedToken.objects.create(jti='skewed', expires_at=self.expires_at,
+                                    revoked_at=timezone.now() - timedelta(seconds=59))
+
+        self.now += 1
+        self.store.sync()
+
+        self.assertIn('late', self.store.bloom)
+        self.assertIn('skewed', self.store.bloom)
+
+    def test_overlap_is_not_counted_twice(self):
+        self.store.sync()
+        self.store.revoke('revoked', self.expires_at)
+        for _ in range(3):
+            self.now += 1
+            self.store.sync()
+
+        self.assertEqual(self.store.bloom.count, 1)
+
+    @override_settings(AUTH_API_REVOCATION_REBUILD_INTERVAL=10)
+    def test_rebuild_is_off_the_request(self):
+        rebuilds = []
+        store = RevocationStore(clock=lambda: self.now, run_in_background=rebuilds.append)
+        store.revoke('revoked', self.expires_at)
+
+        # Looked up in the table until the first filter is built
+        with self.assertNumQueries(2):
+            self.assertTrue(store.is_revoked('revoked'))
+            self.assertFalse(store.is_revoked('valid'))
+        self.assertEqual(len(rebuilds), 1)
+        rebuilds.pop()()
+        self.assertIn('revoked', store.bloom)
+
+        self.now += 10
+        bloom = store.bloom
+        with self.assertNumQueries(1):
+            # Only the sync, the rebuild is left to the background
+            self.assertFalse(store.is_revoked('valid'))
+        self.assertIs(store.bloom, bloom)
+        self.now += 1
+        store.sync()
+        self.assertEqual(len(rebuilds), 1)
+
+        rebuilds.pop()()
+        self.assertIsNot(store.bloom, bloom)
+        self.assertIn('revoked', store.bloom)
+
+    def test_reset_discards_running_rebuilds(self):
+        rebuilds = []
+        store = RevocationStore(clock=lambda: self.now, run_in_background=rebuilds.append)
+        store.sync()
+        store.reset()
+
+        rebuilds.pop()()
+
+        self.assertIsNone(store.bloom)
+
+    def test_expired_tokens(self):
+        self.store.revoke('expired', timezone.now() - timedelta(seconds=1))
+
+        self.assertFalse(self.store.is_revoked('expired'))
+
+    @override_settings(AUTH_API_REVOCATION_REBUILD_INTERVAL=10)
+    def test_rebuild_drops_expired_tokens(self):
+        self.store.sync()
+        self.store.revoke('expired', timezone.now() - timedelta(seconds=1))
+        self.assertIn('expired', self.store.bloom)
+
+        self.now += 10
+        self.store.sync()
+
+        self.assertNotIn('expired', self.store.bloom)
+
+    def test_compact(self):
+        for n in range(5):
+            self.store.revoke(f'expired {n}', timezone.now() - timedelta(seconds=1))
+        self.store.revoke('revoked', self.expires_at)
+
+        self.assertEqual(self.store.compact(batch_size=2), 5)
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), ['revoked'])
+
+    def test_compact_command(self):
+        revocation_store.revoke('expired', timezone.now() - timedelta(seconds=1))
+        out = StringIO()
+
+        call_command('compact_revoked_tokens', stdout=out)
+
+        self.assertEqual(out.getvalue().strip(), 'Deleted 1 expired revoked tokens')
+
+
+class TokenRotationTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        User.objects.create_user(username='testuser', password='testpass123')
+        self.refresh = self.client.post(reverse('token_obtain_pair'), self.test_user_data, format='json').data['refresh']
+
+    def refresh_tokens(self, refresh: str):
+        return self.client.post(reverse('token_refresh'), {'refresh': refresh}, format='json')
+
+    def test_rotated_token_is_revoked(self):
+        response = self.refresh_tokens(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.refresh_tokens(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh_tokens(response.data['refresh']).status_code, status.HTTP_200_OK)
+        self.assertEqual(RevokedToken.objects.count(), 2)
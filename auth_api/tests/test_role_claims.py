@@ -0,0 +1,141 @@
+﻿import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from auth_api.authentication import user_cache
+from auth_api.tests.base import BaseTestCase
+from issue_tracker.models import Issue, Project, ProjectMembership, ProjectPermission
+from issue_tracker.services.permissions import permission_cache
+
+
+@override_settings(AUTH_API_ROLE_CLAIMS=True)
+class RoleClaimsTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        user_cache.clear()
+        permission_cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.project = Project.objects.create(name='Project')
+        ProjectMembership.objects.create(user=self.user, project=self.project, role=ProjectPermission.Read)
+        Issue.objects.create(issue_id=1, title='Issue', project=self.project, reporter=self.user)
+        # Tokens issued in the same second as a membership change aren't trusted, pretend that was long ago
+        caches['roles'].clear()
+
+    def obtain_tokens(self) -> dict:
+        response = self.client.post(reverse('token_obtain_pair'), self.test_user_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def get_issue(self, access: str, project: str = 'Project'):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return self.client.get(reverse('issue view', kwargs={'project_id': project, 'issue_id': 1}))
+
+    def test_obtained_access_token_has_roles(self):
+        tokens = self.obtain_tokens()
+
+        self.assertEqual(AccessToken(tokens['access'])['roles'], {'Project': ProjectPermission.Read})
+        self.assertNotIn('roles', AccessToken(tokens['refresh'], verify=False).payload)
+
+    def test_registered_access_token_has_roles(self):
+        response = self.client.post(reverse('register'), {'username': 'newuser', 'password': 'newpass123'},
+                                    format='json')
+
+        self.assertEqual(AccessToken(response.data['access'])['roles'], {})
+
+    def test_refresh_reads_roles_again(self):
+        tokens = self.obtain_tokens()
+        ProjectMembership.objects.filter(user=self.user).update(role=ProjectPermission.Read | ProjectPermission.Write)
+
+        response = self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']}, format='json')
+
+        self.assertEqual(AccessToken(response.data['access'])['roles'], {'Project': 3})
+
+    def test_authorization_from_the_claim(self):
+        access = self.obtain_tokens()['access']
+        self.get_issue(access)
+        permission_cache.clear()
+
+        # Only the ETag lookup, the issue comes from the response cache and the role from the token
+        with self.assertNumQueries(1):
+            response = self.get_issue(access)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_other_projects_are_forbidden(self):
+        Project.objects.create(name='Other project')
+        access = self.obtain_tokens()['access']
+
+        self.get_issue(access)
+
+        with self.assertNumQueries(0):
+            response = self.get_issue(access, project='Other project')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_membership_changes_distrust_the_claim(self):
+        other = Project.objects.create(name='Other project')
+        Issue.objects.create(issue_id=1, title='Issue', project=other, reporter=self.user)
+        access = self.obtain_tokens()['access']
+        self.assertEqual(self.get_issue(access, project='Other project').status_code, status.HTTP_403_FORBIDDEN)
+
+        manager = User.objects.create_user(username='manager')
+        ProjectMembership.objects.create(user=manager, project=other, role=ProjectPermission.Manage)
+        self.client.force_authenticate(manager)
+        response = self.client.post(reverse('project members view', kwargs={'project_id': other.name}),
+                                    {'username': self.user.username, 'role': int(ProjectPermission.Read)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(None)
+
+        self.assertEqual(self.get_issue(access, project='Other project').status_code, status.HTTP_200_OK)
+
+    def test_removed_membership_distrusts_the_claim(self):
+        access = self.obtain_tokens()['access']
+
+        ProjectMembership.objects.get(user=self.user).delete()
+
+        self.assertEqual(self.get_issue(access).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_filling_the_default_cache_keeps_the_markers(self):
+        access = self.obtain_tokens()['access']
+        ProjectMembership.objects.get(user=self.user).delete()
+
+        caches['default'].set_many({f'filler {n}': n for n in range(1000)})
+
+        self.assertEqual(self.get_issue(access).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_refreshed_claim_is_trusted_again(self):
+        tokens = self.obtain_tokens()
+        with mock.patch('auth_api.tokens.time.time', return_value=time.time() - 5):
+            ProjectMembership.objects.filter(user=self.user).get().delete()
+
+        access = self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']}, format='json').data['access']
+        self.get_issue(access)
+
+        with self.assertNumQueries(0):
+            response = self.get_issue(access)
+
+        self.assertEqual(AccessToken(access)['roles'], {})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(AUTH_API_ROLE_CLAIMS_MAX_PROJECTS=1)
+    def test_large_membership_sets_fall_back_to_the_database(self):
+        other = Project.objects.create(name='Other project')
+        ProjectMembership.objects.create(user=self.user, project=other, role=ProjectPermission.Read)
+
+        access = self.obtain_tokens()['access']
+
+        self.assertNotIn('roles', AccessToken(access).payload)
+        self.assertEqual(self.get_issue(access).status_code, status.HTTP_200_OK)
+
+    @override_settings(AUTH_API_ROLE_CLAIMS=False)
+    def test_disabled(self):
+        access = self.obtain_tokens()['access']
+
+        self.assertNotIn('roles', AccessToken(access).payload)
+        self.assertEqual(self.get_issue(access).status_code, status.HTTP_200_OK)
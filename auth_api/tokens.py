@@ -0,0 +1,94 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches, BaseCache
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken, Token
+
+from auth_api.revocation import RevocationMixin
+
+ROLES_CLAIM = 'roles'
+
+DEFAULT_ROLE_CLAIMS_MAX_PROJECTS = 100
+DEFAULT_ROLE_CLAIMS_CACHE = 'roles'
+
+
+def role_claims_enabled() -> bool:
+    return getattr(settings, 'AUTH_API_ROLE_CLAIMS', False)
+
+
+def get_cache() -> BaseCache:
+    return caches[getattr(settings, 'AUTH_API_ROLE_CLAIMS_CACHE', DEFAULT_ROLE_CLAIMS_CACHE)]
+
+
+def _changed_key(user_id) -> str:
+    return f'auth_api:roles-changed:{user_id}'
+
+
+def mark_roles_changed(*user_ids):
+    """Makes the role claims of every access token issued to the users until now untrusted."""
+    now = time.time()
+    get_cache().set_many({_changed_key(user_id): now for user_id in user_ids},
+                         timeout=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()))
+
+
+def add_role_claims(token: Token, user_id):
+    """
+    Stores the user's project roles in ``token``, as ``{"<project>": <role>}``.
+
+    The roles come from ``AUTH_API_ROLE_CLAIMS_LOADER``, the dotted path of a ``loader(user_id, limit)`` returning
+    at most ``limit`` of them. Users with more than ``AUTH_API_ROLE_CLAIMS_MAX_PROJECTS`` projects get no claim, their
+    roles are looked up in the database instead.
+    """
+    loader = getattr(settings, 'AUTH_API_ROLE_CLAIMS_LOADER', None)
+    if loader is None:
+        return
+    limit = getattr(settings, 'AUTH_API_ROLE_CLAIMS_MAX_PROJECTS', DEFAULT_ROLE_CLAIMS_MAX_PROJECTS)
+    roles = import_string(loader)(user_id, limit + 1)
+    if len(roles) <= limit:
+        token[ROLES_CLAIM] = roles
+
+
+def get_claimed_roles(token: Token | None) -> dict[str, int] | None:
+    """
+    Project roles according to the claim of an access token, ``{"<project>": <role>}``.
+
+    Returns ``None`` if the roles have to be looked up in the database: the token has no claim, or the user's roles
+    changed after it was issued.
+    """
+    if token is None or not role_claims_enabled():
+        return None
+    roles = token.get(ROLES_CLAIM)
+    if roles is None:
+        return None
+    changed_at = get_cache().get(_changed_key(token[api_settings.USER_ID_CLAIM]))
+    # iat is rounded down to the second, a token issued in the same second as the change isn't trusted
+    if changed_at is not None and token['iat'] <= changed_at:
+        return None
+    return roles
+
+
+class RoleRefreshToken(RevocationMixin, RefreshToken):
+    """
+    Refresh token whose access tokens carry the user's project roles, if ``AUTH_API_ROLE_CLAIMS`` is enabled.
+
+    Rotated refresh tokens are revoked, see ``auth_api.revocation``.
+    """
+
+    @property
+    def access_token(self) -> AccessToken:
+        access = super().access_token
+        if role_claims_enabled():
+            # Roles are read again every time, the refresh token itself carries none
+            add_role_claims(access, self.payload[api_settings.USER_ID_CLAIM])
+        return access
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
@@ -1,9 +1,10 @@
-from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+
+from auth_api.hashing import hashing_pool
+from auth_api.tokens import RoleRefreshToken
 
 
 @api_view(['POST'])
@@ -22,10 +23,10 @@ def register(request):
     if User.objects.filter(username=username).exists():
         return Response({"error": "User already exists."}, status=status.HTTP_400_BAD_REQUEST)
 
-    user = User(username=username, password=make_password(password))
+    user = User(username=username, password=hashing_pool.make_password(password))
     user.save()
 
-    refresh = RefreshToken.for_user(user)
+    refresh = RoleRefreshToken.for_user(user)
     return Response({
         "refresh": str(refresh),
         "access": str(refresh.access_token),
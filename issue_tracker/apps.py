@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class IssueTrackerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'issue_tracker'
+
+    def ready(self):
+        from issue_tracker import signals  # noqa: F401
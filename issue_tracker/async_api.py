@@ -0,0 +1,84 @@
+from typing import Awaitable, Callable
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.http import HttpRequest, HttpResponseBase
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class AsyncReadView(APIView):
+    """
+    ``APIView`` whose ``GET`` handler is a coroutine, for ASGI deployments, see ``ISSUE_TRACKER_ASYNC_READS``.
+
+    Authenticators with an ``aauthenticate()`` coroutine are awaited, the others run in a thread. Every other method
+    is handed to ``sync_view``, the regular ``@api_view`` of the endpoint, in a thread. Subclasses define the
+    ``async def get()`` handler.
+    """
+    sync_view: Callable[..., HttpResponseBase] | None = None
+    get: Callable[..., Awaitable[Response]]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Fails when the view is defined rather than on its first request
+        if not iscoroutinefunction(getattr(cls, 'get', None)):
+            raise TypeError(f'{cls.__name__} must define an async get() handler')
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+        if request.method != 'GET':
+            return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.aperform_authentication(request)
+            # Content negotiation, permission classes and throttles, none of which touch the database here
+            self.initial(request, *args, **kwargs)
+            response = await self.get(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def aperform_authentication(self, request: Request):
+        # Same as Request._authenticate(), which initial() skips once request.user is set
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
+
+
+def async_api_view(sync_view: Callable[..., HttpResponseBase]):
+    """
+    Turns a coroutine into the async ``GET`` handler of the endpoint served by ``sync_view``, like ``@api_view``.
+
+    The resulting view answers other methods with ``sync_view``, so both can be routed to the same URL.
+    """
+
+    def decorator(func: Callable[..., Awaitable[Response]]):
+        async def get(self, request: Request, *args, **kwargs) -> Response:
+            return await func(request, *args, **kwargs)
+
+        view_class = type(func.__name__, (AsyncReadView,), {'__doc__': func.__doc__, 'get': get})
+        view_class.__module__ = func.__module__
+        return view_class.as_view(sync_view=sync_view)
+
+    return decorator
@@ -0,0 +1,150 @@
+import asyncio
+import io
+import itertools
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from issue_tracker.models import Issue, Project, ProjectMembership, ProjectPermission
+from issue_tracker.urls import get_api_urlconf
+
+HOST = 'localhost'
+
+
+def bench_read_path(async_reads: bool, urls: list[str], token: str, requests: int, concurrency: int,
+                    threads: int) -> tuple[float, list[tuple[int, float]]]:
+    """
+    Sends ``requests`` GET requests, cycling through ``urls``, from ``concurrency`` clients at once.
+
+    With ``async_reads``, requests are handed to Django's ASGI handler and the async views from tasks of one event
+    loop, like an ASGI server does. Otherwise they are handed to the WSGI handler and the sync views by a pool of
+    ``threads`` threads, like a threaded WSGI worker, and wait for a free thread. No sockets are involved, only the
+    application is measured. Timings include the wait.
+
+    Returns the total time and the status code and time of every request, in seconds.
+    """
+    targets = list(itertools.islice(itertools.cycle(urls), requests))
+
+    wsgi_handler = WSGIHandler()
+
+    def get(url: str, start: float) -> tuple[int, float]:
+        statuses = []
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': url, 'QUERY_STRING': '', 'SERVER_NAME': HOST, 'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': HOST, 'HTTP_AUTHORIZATION': f'Bearer {token}',
+            'wsgi.input': io.BytesIO(), 'wsgi.url_scheme': 'http', 'wsgi.errors': io.StringIO(),
+        }
+        response = wsgi_handler(environ, lambda status, headers: statuses.append(int(status.split()[0])))
+        try:
+            b''.join(response)
+        finally:
+            # Sends request_finished, which closes the database connection
+            response.close()
+        return statuses[0], time.perf_counter() - start
+
+    asgi_handler = ASGIHandler()
+
+    async def aget(semaphore: asyncio.Semaphore, url: str) -> tuple[int, float]:
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': url, 'raw_path': url.encode(), 'query_string': b'', 'root_path': '',
+            'headers': [(b'host', HOST.encode()), (b'authorization', f'Bearer {token}'.encode())],
+            'client': ('127.0.0.1', 0), 'server': (HOST, 80),
+        }
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+        statuses = []
+
+        async def receive() -> dict:
+            if messages:
+                return messages.pop()
+            # The client never disconnects, the handler stops listening once the response is sent
+            return await asyncio.Future()
+
+        async def send(message: dict):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+
+        async with semaphore:
+            start = time.perf_counter()
+            await asgi_handler(scope, receive, send)
+            return statuses[0], time.perf_counter() - start
+
+    async def run_async() -> list[tuple[int, float]]:
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(aget(semaphore, url) for url in targets))
+
+    with override_settings(ROOT_URLCONF=get_api_urlconf(async_reads), ALLOWED_HOSTS=[HOST]):
+        start = time.perf_counter()
+        if async_reads:
+            results = asyncio.run(run_async())
+        else:
+            with ThreadPoolExecutor(threads) as worker, ThreadPoolExecutor(concurrency) as clients:
+                results = list(clients.map(lambda url: worker.submit(get, url, time.perf_counter()).result(),
+                                           targets))
+        return time.perf_counter() - start, results
+
+
+class Command(BaseCommand):
+    help = 'Compares the concurrent throughput of the sync (WSGI) and async (ASGI) views of the read endpoints.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=50, help='Clients sending requests at once')
+        parser.add_argument('--threads', type=int, default=8, help='Threads of the WSGI worker')
+        parser.add_argument('--issues', type=int, default=100, help='Issues in the throwaway project')
+        parser.add_argument('--db-latency', type=float, default=0,
+                            help='Milliseconds added to every query, to stand in for a remote database')
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(username=f'bench-reads-{uuid.uuid4().hex}')
+        project = Project.objects.create(name=f'bench-reads-{uuid.uuid4().hex}')
+        ProjectMembership.objects.create(user=user, project=project, role=ProjectPermission.Read)
+        Issue.objects.bulk_create([
+            Issue(issue_id=n, title=f'Issue {n}', project=project, reporter=user)
+            for n in range(1, options['issues'] + 1)
+        ])
+        token = str(AccessToken.for_user(user))
+        latency = options['db_latency'] / 1000
+
+        def delay(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        def add_delay(sender, connection, **kwargs):
+            connection.execute_wrappers.append(delay)
+
+        if latency:
+            connection_created.connect(add_delay)
+        try:
+            for async_reads in (False, True):
+                with override_settings(ROOT_URLCONF=get_api_urlconf(async_reads)):
+                    urls = [
+                        reverse('issue view', kwargs={'project_id': project.name, 'issue_id': 1}),
+                        reverse('project issues view', kwargs={'project_id': project.name}),
+                        reverse('projects view'),
+                        reverse('project members view', kwargs={'project_id': project.name}),
+                    ]
+                elapsed, results = bench_read_path(async_reads, urls, token, options['requests'],
+                                                   options['concurrency'], options['threads'])
+                self.report('ASGI, async views' if async_reads else 'WSGI, sync views', elapsed, results)
+        finally:
+            connection_created.disconnect(add_delay)
+            project.delete()
+            user.delete()
+
+    def report(self, label: str, elapsed: float, results: list[tuple[int, float]]):
+        timings = sorted(timing * 1000 for status, timing in results)
+        failed = sum(status != 200 for status, timing in results)
+        self.stdout.write(
+            f'{label}: {len(results) / elapsed:.0f} requests/s, {failed} failed, '
+            f'p50 {timings[len(timings) // 2]:.1f} ms, p99 {timings[int(len(timings) * 0.99)]:.1f} ms'
+        )
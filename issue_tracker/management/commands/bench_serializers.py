@@ -0,0 +1,74 @@
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from issue_tracker.models import Issue, IssueSerializer, Project
+from issue_tracker.services.row_serializers import issue_rows
+
+
+class _Rollback(Exception):
+    pass
+
+
+def bench_serializers(rows: int, repeat: int) -> dict[str, tuple[float, float]]:
+    """
+    Lists a project of ``rows`` issues ``repeat`` times with ``IssueSerializer`` on model instances and with
+    ``issue_rows`` on ``values_list`` tuples, fetching included, and checks that both give the same data.
+
+    Returns the best time per row of each path to fetch and to serialize the rows, in seconds. The issues are created
+    in a transaction that is rolled back, nothing is left in the database.
+    """
+    timings = {}
+    try:
+        with transaction.atomic():
+            reporter = User.objects.create(username=f'bench-{uuid.uuid4().hex[:12]}')
+            project = Project.objects.create(name=f'bench-{uuid.uuid4().hex[:12]}')
+            Issue.objects.bulk_create(
+                Issue(issue_id=n, title=f'Issue {n}', description=f'Description of issue {n}', project=project,
+                      reporter=reporter, status=n % 3, priority=n % 3)
+                for n in range(1, rows + 1)
+            )
+            queryset = Issue.objects.filter(project=project).order_by('issue_id')
+
+            paths = {
+                'model serializer': (lambda: list(queryset.all()),
+                                     lambda instances: IssueSerializer(instances, many=True).data),
+                'row serializer': (lambda: list(issue_rows.values_list(queryset)), issue_rows.data),
+            }
+            results = {}
+            for name, (fetch, serialize) in paths.items():
+                best_fetch = best_serialize = float('inf')
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    fetched = fetch()
+                    fetched_at = time.perf_counter()
+                    results[name] = serialize(fetched)
+                    best_fetch = min(best_fetch, fetched_at - start)
+                    best_serialize = min(best_serialize, time.perf_counter() - fetched_at)
+                timings[name] = (best_fetch / rows, best_serialize / rows)
+            if results['model serializer'] != results['row serializer']:
+                raise AssertionError('The serializers disagree')
+            raise _Rollback
+    except _Rollback:
+        pass
+    return timings
+
+
+class Command(BaseCommand):
+    help = 'Compares the CPU time per row of listing issues with IssueSerializer and with issue_rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        timings = bench_serializers(options['rows'], options['repeat'])
+        for name, (fetch, serialize) in timings.items():
+            self.stdout.write(f'{name}: {fetch * 1e6:.1f} µs to fetch and {serialize * 1e6:.1f} µs to serialize '
+                              f'per row')
+        (model_fetch, model_serialize), (row_fetch, row_serialize) = timings.values()
+        self.stdout.write(f'Rows serialize {model_serialize / row_serialize:.1f}x faster, '
+                          f'{(model_fetch + model_serialize) / (row_fetch + row_serialize):.1f}x faster in total')
@@ -0,0 +1,110 @@
+import itertools
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from issue_tracker.models import Issue, Project, ProjectMembership, ProjectPermission
+
+HOST = '127.0.0.1'
+
+
+def wait_for_port(port: int, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((HOST, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise CommandError(f'Nothing listens on port {port} after {timeout} s')
+
+
+def load(base_url: str, paths: list[str], token: str, requests: int,
+         concurrency: int) -> tuple[float, list[tuple[int, float]]]:
+    """Sends ``requests`` GET requests over HTTP from ``concurrency`` threads, returns the total time and results."""
+    def get(path: str) -> tuple[int, float]:
+        request = urllib.request.Request(base_url + path, headers={'Authorization': f'Bearer {token}'})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except OSError:
+            status = 0
+        return status, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(get, itertools.islice(itertools.cycle(paths), requests)))
+    return time.perf_counter() - start, results
+
+
+class Command(BaseCommand):
+    help = 'Compares the HTTP throughput of `python -m myapp.server` with `manage.py runserver`.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--workers', type=int, default=None, help='Workers of myapp.server, see its --help')
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(username=f'bench-server-{uuid.uuid4().hex}')
+        project = Project.objects.create(name=f'bench-server-{uuid.uuid4().hex}')
+        ProjectMembership.objects.create(user=user, project=project, role=ProjectPermission.Read)
+        Issue.objects.bulk_create([Issue(issue_id=n, title=f'Issue {n}', project=project, reporter=user)
+                                   for n in range(1, 51)])
+        token = str(AccessToken.for_user(user))
+        paths = [
+            reverse('issue view', kwargs={'project_id': project.name, 'issue_id': 1}),
+            reverse('project issues view', kwargs={'project_id': project.name}),
+            reverse('projects view'),
+        ]
+
+        port = options['port']
+        server = [sys.executable, '-m', 'myapp.server', '--bind', f'{HOST}:{port}']
+        if options['workers'] is not None:
+            server += ['--workers', str(options['workers'])]
+        commands = {
+            'runserver': [sys.executable, 'manage.py', 'runserver', f'{HOST}:{port}'],
+            'myapp.server': server,
+        }
+        try:
+            for label, command in commands.items():
+                # Its own process group, so that runserver's autoreloader child is stopped too
+                process = subprocess.Popen(command, cwd=settings.BASE_DIR, start_new_session=True,
+                                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                try:
+                    wait_for_port(port, timeout=60)
+                    elapsed, results = load(f'http://{HOST}:{port}', paths, token, options['requests'],
+                                            options['concurrency'])
+                finally:
+                    os.killpg(process.pid, signal.SIGTERM)
+                    process.wait(timeout=60)
+                self.report(label, elapsed, results)
+        finally:
+            project.delete()
+            user.delete()
+
+    def report(self, label: str, elapsed: float, results: list[tuple[int, float]]):
+        timings = sorted(timing * 1000 for status, timing in results)
+        failed = sum(status != 200 for status, timing in results)
+        self.stdout.write(
+            f'{label}: {len(results) / elapsed:.0f} requests/s, {failed} failed, '
+            f'p50 {timings[len(timings) // 2]:.1f} ms, p99 {timings[int(len(timings) * 0.99)]:.1f} ms'
+        )
@@ -0,0 +1,59 @@
+import math
+import statistics
+import time
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from issue_tracker.models import ProjectPermission
+from issue_tracker.services.permissions import permission_cache
+from issue_tracker.throttling import IssueCreationThrottle, token_buckets
+
+
+def bench_throttle(requests: int, users: int, projects: int, cache_alias: str | None = None) -> list[float]:
+    """
+    Runs ``IssueCreationThrottle`` on ``requests`` fake requests spread over ``users`` users and ``projects`` projects.
+
+    Returns the time each check took, in seconds. Nothing touches the database: every user may write to every
+    project, and their roles are in the permission cache, as they would be after the first request.
+    """
+    clients = [SimpleNamespace(user=User(pk=n), auth=None) for n in range(users)]
+    views = [SimpleNamespace(kwargs={'project_id': f'Project {n}'}) for n in range(projects)]
+    timings = []
+    with override_settings(ISSUE_TRACKER_THROTTLE_CACHE=cache_alias):
+        token_buckets.clear()
+        for n in range(min(requests, math.lcm(users, projects))):
+            permission_cache.set(n % users, f'Project {n % projects}', ProjectPermission.Write)
+        for n in range(requests):
+            throttle = IssueCreationThrottle()
+            start = time.perf_counter()
+            throttle.allow_request(clients[n % users], views[n % projects])
+            timings.append(time.perf_counter() - start)
+        token_buckets.clear()
+        permission_cache.clear()
+    return timings
+
+
+class Command(BaseCommand):
+    help = 'Measures the overhead of the issue creation throttle per request.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=100)
+        parser.add_argument('--cache', default=None, help='Also count requests in this cache, like '
+                                                          'ISSUE_TRACKER_THROTTLE_CACHE does')
+
+    def handle(self, *args, **options):
+        timings = bench_throttle(options['requests'], options['users'], options['projects'], options['cache'])
+        timings.sort()
+        microseconds = [timing * 1e6 for timing in timings]
+        self.stdout.write(
+            f'{len(timings)} requests: '
+            f'mean {statistics.fmean(microseconds):.1f} µs, '
+            f'p50 {microseconds[len(timings) // 2]:.1f} µs, '
+            f'p99 {microseconds[int(len(timings) * 0.99)]:.1f} µs, '
+            f'max {microseconds[-1]:.1f} µs'
+        )
@@ -0,0 +1,429 @@
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, NamedTuple
+from urllib.parse import urlencode
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+
+from auth_api import urls as auth_urls
+from auth_api.tokens import RoleRefreshToken
+from issue_tracker import urls as issue_tracker_urls
+from issue_tracker.models import (Assignment, Issue, IssueCount, IssuePriority, IssueStatus, Project,
+                                  ProjectMembership, ProjectPermission)
+from issue_tracker.services.bulk_delete import delete_rows
+from issue_tracker.services.issue_stats import rebuild_issue_counts
+
+HOST = 'localhost'
+SEED_BATCH_SIZE = 2000
+# Issues or changes sent by one request to the bulk endpoints
+BULK_SIZE = 10
+
+
+class Call(NamedTuple):
+    method: str
+    path: str
+    body: object = None
+    token: str | None = None
+    # Send the body as a form rather than as JSON
+    form: bool = False
+
+
+class Sample(NamedTuple):
+    status: int
+    seconds: float
+    queries: int
+    sql_seconds: float
+
+
+@dataclass
+class Dataset:
+    """Rows seeded by ``seed()``, every user and project name starts with ``prefix``."""
+    prefix: str
+    password: str
+    users: list[User]
+    members: dict[str, list[User]]
+    issues: int
+    tokens: dict[int, str] = field(default_factory=dict)
+    # (project, issue_id, user pk) of the assignments already picked to be removed
+    unassigned: set[tuple[str, int, int]] = field(default_factory=set)
+
+    def token(self, user: User) -> str:
+        if user.pk not in self.tokens:
+            self.tokens[user.pk] = str(RoleRefreshToken.for_user(user).access_token)
+        return self.tokens[user.pk]
+
+    def pick_member(self, rng: random.Random) -> tuple[User, str]:
+        project = rng.choice(list(self.members))
+        return rng.choice(self.members[project]), project
+
+    def cleanup(self):
+        projects = Project.objects.filter(name__startswith=self.prefix)
+        # Deleting the projects one by one would send signals for every issue and assignment, which only keep
+        # counters and caches of these projects up to date
+        for queryset in (Assignment.objects.filter(issue__project__in=projects),
+                         IssueCount.objects.filter(project__in=projects),
+                         Issue.objects.filter(project__in=projects),
+                         ProjectMembership.objects.filter(project__in=projects)):
+            delete_rows(queryset)
+        projects.delete()
+        User.objects.filter(username__startswith=self.prefix).delete()
+
+
+def seed(users: int, projects: int, members: int, issues: int, rng: random.Random) -> Dataset:
+    """
+    Bulk inserts ``users`` users and ``projects`` projects of ``members`` members and ``issues`` issues each.
+
+    The first member of a project manages it, the others can read and write. Every issue is reported by a member and
+    assigned to one. Users share a password, hashed once.
+    """
+    prefix = f'loadtest-{uuid.uuid4().hex[:8]}'
+    password = uuid.uuid4().hex
+    encoded = make_password(password)
+    User.objects.bulk_create([User(username=f'{prefix}-user-{n}', password=encoded) for n in range(users)],
+                             batch_size=SEED_BATCH_SIZE)
+    seeded_users = list(User.objects.filter(username__startswith=f'{prefix}-user-').order_by('pk'))
+
+    names = [f'{prefix}-project-{n}' for n in range(projects)]
+    project_members = {name: rng.sample(seeded_users, members) for name in names}
+    seed_projects(project_members, issues, rng)
+    return Dataset(prefix=prefix, password=password, users=seeded_users, members=project_members, issues=issues)
+
+
+def seed_projects(project_members: dict[str, list[User]], issues: int, rng: random.Random):
+    """Bulk inserts the projects of ``project_members``, of these members and ``issues`` issues each."""
+    Project.objects.bulk_create([Project(name=name, last_issue_id=issues) for name in project_members])
+    ProjectMembership.objects.bulk_create([
+        ProjectMembership(project_id=name, user=user, role=ProjectPermission.Read | ProjectPermission.Write
+                          | (ProjectPermission.Manage if n == 0 else ProjectPermission.Null))
+        for name, users_of_project in project_members.items() for n, user in enumerate(users_of_project)
+    ], batch_size=SEED_BATCH_SIZE)
+
+    statuses, priorities = [status.value for status in IssueStatus], [priority.value for priority in IssuePriority]
+    for name, users_of_project in project_members.items():
+        Issue.objects.bulk_create([
+            Issue(issue_id=n, title=f'Issue {n}', project_id=name, reporter=rng.choice(users_of_project),
+                  status=rng.choice(statuses), priority=rng.choice(priorities))
+            for n in range(1, issues + 1)
+        ], batch_size=SEED_BATCH_SIZE)
+        Assignment.objects.bulk_create([
+            Assignment(issue_id=pk, user=rng.choice(users_of_project))
+            for pk in Issue.objects.filter(project=name).values_list('pk', flat=True)
+        ], batch_size=SEED_BATCH_SIZE)
+        # bulk_create doesn't send post_save
+        rebuild_issue_counts(name)
+
+
+def _project_call(data: Dataset, rng: random.Random, method: str, route: str, body=None,
+                  with_issue: bool = False) -> Call:
+    user, project = data.pick_member(rng)
+    kwargs = {'project_id': project}
+    if with_issue:
+        kwargs['issue_id'] = rng.randint(1, data.issues)
+    return Call(method, reverse(route, kwargs=kwargs), body, data.token(user))
+
+
+def _bulk_assign_call(data: Dataset, rng: random.Random) -> Call:
+    user, project = data.pick_member(rng)
+    changes = [
+        {'issue_id': rng.randint(1, data.issues), 'username': rng.choice(data.members[project]).username,
+         'action': rng.choice(('assign', 'unassign'))}
+        for _ in range(BULK_SIZE)
+    ]
+    return Call('POST', reverse('bulk assign', kwargs={'project_id': project}), changes, data.token(user))
+
+
+def _members_call(data: Dataset, rng: random.Random) -> Call:
+    # The manager gives a member the role it already has, so that the other calls keep their permissions
+    project = rng.choice(list(data.members))
+    manager, *others = data.members[project]
+    member = rng.choice(others) if others else manager
+    role = ProjectPermission.Read | ProjectPermission.Write | (
+        ProjectPermission.Manage if member == manager else ProjectPermission.Null)
+    return Call('POST', reverse('project members view', kwargs={'project_id': project}),
+                {'username': member.username, 'role': role.value}, data.token(manager), form=True)
+
+
+def _assignee_call(data: Dataset, rng: random.Random, method: str) -> Call:
+    user, project = data.pick_member(rng)
+    issue_id, assignee = rng.randint(1, data.issues), rng.choice(data.members[project])
+    if method == 'DELETE':
+        # Each call removes an assignment of its own, created here, as long as there are some left to pick
+        for _ in range(100):
+            if (project, issue_id, assignee.pk) not in data.unassigned:
+                break
+            issue_id, assignee = rng.randint(1, data.issues), rng.choice(data.members[project])
+        data.unassigned.add((project, issue_id, assignee.pk))
+        Assignment.objects.get_or_create(issue=Issue.objects.get(project=project, issue_id=issue_id), user=assignee)
+    return Call(method, reverse('issue assignees view', kwargs={'project_id': project, 'issue_id': issue_id}),
+                {'username': assignee.username}, data.token(user))
+
+
+def _create_project_call(data: Dataset, rng: random.Random) -> Call:
+    return Call('POST', reverse('projects view'), {'name': f'{data.prefix}-project-{uuid.uuid4().hex[:12]}'},
+                data.token(rng.choice(data.users)))
+
+
+def _delete_project_call(data: Dataset, rng: random.Random) -> Call:
+    # A project of its own, as large as the others, which no other call picks
+    name = f'{data.prefix}-project-{uuid.uuid4().hex[:12]}'
+    members = rng.sample(data.users, len(next(iter(data.members.values()))))
+    seed_projects({name: members}, data.issues, rng)
+    return Call('DELETE', reverse('projects view'), {'name': name}, data.token(members[0]))
+
+
+def _login_call(data: Dataset, rng: random.Random) -> Call:
+    user = rng.choice(data.users)
+    return Call('POST', reverse('token_obtain_pair'), {'username': user.username, 'password': data.password})
+
+
+def _refresh_call(data: Dataset, rng: random.Random) -> Call:
+    # Refresh tokens are rotated, each one can only be used once
+    return Call('POST', reverse('token_refresh'), {'refresh': str(RoleRefreshToken.for_user(rng.choice(data.users)))})
+
+
+# One request to every method of every route of issue_tracker/urls.py and auth_api/urls.py, by route name and method
+SCENARIOS: dict[tuple[str, str], Callable[[Dataset, random.Random], Call]] = {
+    ('projects view', 'GET'): lambda data, rng: Call('GET', reverse('projects view'),
+                                                     token=data.token(rng.choice(data.users))),
+    ('projects view', 'POST'): _create_project_call,
+    ('projects view', 'DELETE'): _delete_project_call,
+    ('project members view', 'GET'): lambda data, rng: _project_call(data, rng, 'GET', 'project members view'),
+    ('project members view', 'POST'): _members_call,
+    ('project issues view', 'GET'): lambda data, rng: _project_call(data, rng, 'GET', 'project issues view'),
+    # Answered like GET
+    ('project issues view', 'POST'): lambda data, rng: _project_call(data, rng, 'POST', 'project issues view'),
+    ('issue view', 'GET'): lambda data, rng: _project_call(data, rng, 'GET', 'issue view', with_issue=True),
+    ('create issue', 'POST'): lambda data, rng: _project_call(data, rng, 'POST', 'create issue',
+                                                              {'title': 'Load test issue', 'priority': 1}),
+    ('bulk create issues', 'POST'): lambda data, rng: _project_call(
+        data, rng, 'POST', 'bulk create issues', [{'title': f'Load test issue {n}'} for n in range(BULK_SIZE)]),
+    ('export issues', 'GET'): lambda data, rng: _project_call(data, rng, 'GET', 'export issues'),
+    ('project stats view', 'GET'): lambda data, rng: _project_call(data, rng, 'GET', 'project stats view'),
+    ('issue assignees view', 'GET'): lambda data, rng: _project_call(data, rng, 'GET', 'issue assignees view',
+                                                                     with_issue=True),
+    ('issue assignees view', 'POST'): lambda data, rng: _assignee_call(data, rng, 'POST'),
+    ('issue assignees view', 'DELETE'): lambda data, rng: _assignee_call(data, rng, 'DELETE'),
+    ('bulk assign', 'POST'): _bulk_assign_call,
+    ('my issues', 'GET'): lambda data, rng: Call('GET', reverse('my issues'), token=data.token(rng.choice(data.users))),
+    ('register', 'POST'): lambda data, rng: Call(
+        'POST', reverse('register'), {'username': f'{data.prefix}-new-{uuid.uuid4().hex}', 'password': data.password}),
+    ('ping', 'GET'): lambda data, rng: Call('GET', reverse('ping'), token=data.token(rng.choice(data.users))),
+    ('token_obtain_pair', 'POST'): _login_call,
+    ('token_refresh', 'POST'): _refresh_call,
+}
+
+
+def api_endpoints() -> list[tuple[str, str]]:
+    """Names and methods of the routes of issue_tracker/urls.py and auth_api/urls.py."""
+    # The sync views, which serve every method, whatever ISSUE_TRACKER_ASYNC_READS says
+    patterns = [*issue_tracker_urls.get_urlpatterns(False), *auth_urls.urlpatterns]
+    return [(pattern.name, method.upper()) for pattern in patterns for method in pattern.callback.cls.http_method_names
+            if method != 'options' and hasattr(pattern.callback.cls, method)]
+
+
+def endpoint_label(endpoint: tuple[str, str]) -> str:
+    route, method = endpoint
+    return f'{method} {route}'
+
+
+def drive(calls: list[Call], concurrency: int) -> tuple[float, list[Sample]]:
+    """
+    Sends ``calls`` to Django's WSGI handler from ``concurrency`` threads, each waiting for its response before
+    sending the next one. No sockets are involved, only the application is measured.
+
+    Returns the total time, in seconds, and a sample of every request.
+    """
+    handler = WSGIHandler()
+
+    def send(call: Call) -> Sample:
+        queries, sql_time, statuses = 0, 0.0, []
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries, sql_time
+            queries += 1
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                sql_time += time.perf_counter() - start
+
+        if call.body is None:
+            body = b''
+        else:
+            body = (urlencode(call.body) if call.form else json.dumps(call.body)).encode()
+        environ = {
+            'REQUEST_METHOD': call.method, 'PATH_INFO': call.path, 'QUERY_STRING': '', 'SERVER_NAME': HOST,
+            'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': HOST,
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded' if call.form else 'application/json',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': io.BytesIO(body), 'wsgi.url_scheme': 'http', 'wsgi.errors': io.StringIO(),
+        }
+        if call.token is not None:
+            environ['HTTP_AUTHORIZATION'] = f'Bearer {call.token}'
+
+        # The connection of this thread, which the handler uses
+        with connection.execute_wrapper(count):
+            start = time.perf_counter()
+            response = handler(environ, lambda status, headers: statuses.append(int(status.split()[0])))
+            try:
+                b''.join(response)
+            finally:
+                # Sends request_finished, which closes the database connection
+                response.close()
+            elapsed = time.perf_counter() - start
+        return Sample(statuses[0], elapsed, queries, sql_time)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as clients:
+        samples = list(clients.map(send, calls))
+    return time.perf_counter() - start, samples
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(elapsed: float, samples: list[Sample]) -> dict:
+    timings = sorted(sample.seconds * 1000 for sample in samples)
+    queries = [sample.queries for sample in samples]
+    statuses = Counter(sample.status for sample in samples)
+    return {
+        'requests': len(samples),
+        'failed': sum(sample.status >= 400 for sample in samples),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'throughput': round(len(samples) / elapsed, 1),
+        'latency_ms': {
+            'mean': round(statistics.fmean(timings), 2),
+            'p50': round(percentile(timings, 0.5), 2),
+            'p95': round(percentile(timings, 0.95), 2),
+            'p99': round(percentile(timings, 0.99), 2),
+            'max': round(timings[-1], 2),
+        },
+        'queries_per_request': round(statistics.fmean(queries), 2),
+        'max_queries': max(queries),
+        'sql_ms_per_request': round(statistics.fmean(sample.sql_seconds * 1000 for sample in samples), 2),
+    }
+
+
+def describe_environment() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'database': connection.vendor,
+        'database_version': '.'.join(map(str, connection.get_database_version())),
+        'django': django.get_version(),
+        'python': platform.python_version(),
+        'cpus': len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count(),
+        'async_reads': getattr(settings, 'ISSUE_TRACKER_ASYNC_READS', False),
+    }
+
+
+class Command(BaseCommand):
+    help = ('Seeds a throwaway dataset, then loads every API route in turn and reports latency percentiles, '
+            'throughput and queries per request as JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('routes', nargs='*',
+                            help='Names of the routes to load with each of their methods, all of them by default')
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=20)
+        parser.add_argument('--members', type=int, default=20, help='Members of each project')
+        parser.add_argument('--issues', type=int, default=1000, help='Issues of each project')
+        parser.add_argument('--requests', type=int, default=200, help='Requests sent to each route')
+        parser.add_argument('--concurrency', type=int, default=8, help='Clients sending requests at once')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the dataset and of the requests')
+        parser.add_argument('--output', default='-', help='File the JSON report is written to, - for stdout')
+        parser.add_argument('--baseline', help='JSON report of an earlier run to compare with')
+        parser.add_argument('--yes', action='store_true',
+                            help='Confirm that rows may be seeded into and deleted from the configured database')
+
+    def handle(self, *args, **options):
+        endpoints = api_endpoints()
+        missing = [endpoint_label(endpoint) for endpoint in endpoints if endpoint not in SCENARIOS]
+        if missing:
+            raise CommandError(f'No load test scenario for {", ".join(missing)}')
+        unknown = [route for route in options['routes'] if route not in {route for route, _ in endpoints}]
+        if unknown:
+            raise CommandError(f'Unknown routes: {", ".join(unknown)}')
+        if options['routes']:
+            endpoints = [endpoint for endpoint in endpoints if endpoint[0] in options['routes']]
+        if min(options['users'], options['projects'], options['members'], options['issues'],
+               options['requests'], options['concurrency']) < 1:
+            raise CommandError('Sizes, requests and concurrency must be positive')
+        if options['members'] > options['users']:
+            raise CommandError('Projects can\'t have more members than there are users')
+        if not options['yes']:
+            raise CommandError(f'The load test inserts and deletes rows in the {connection.vendor} database '
+                               f'{connection.settings_dict["NAME"]}, pass --yes to run it there')
+
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as file:
+                baseline = json.load(file)
+
+        report = {
+            'environment': describe_environment(),
+            'parameters': {name: options[name] for name in
+                           ('users', 'projects', 'members', 'issues', 'requests', 'concurrency', 'seed')},
+            'routes': {},
+        }
+        rng = random.Random(options['seed'])
+        start = time.perf_counter()
+        data = seed(options['users'], options['projects'], options['members'], options['issues'], rng)
+        report['seed_seconds'] = round(time.perf_counter() - start, 2)
+
+        # Issue creation would mostly measure the throttle turning requests away
+        with override_settings(ALLOWED_HOSTS=[HOST], ISSUE_TRACKER_ISSUE_CREATION_RATES={}):
+            try:
+                for endpoint in endpoints:
+                    label = endpoint_label(endpoint)
+                    calls = [SCENARIOS[endpoint](data, rng) for _ in range(options['requests'])]
+                    report['routes'][label] = summarize(*drive(calls, options['concurrency']))
+                    if options['output'] != '-':
+                        self.stdout.write(self.format_route(label, report['routes'][label], baseline))
+            finally:
+                data.cleanup()
+
+        if options['output'] == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            with open(options['output'], 'w') as file:
+                json.dump(report, file, indent=2)
+            self.stdout.write(f'Report written to {options["output"]}')
+
+    @staticmethod
+    def format_route(route: str, result: dict, baseline: dict | None) -> str:
+        latency = result['latency_ms']
+        line = (f'{route:<29} {result["throughput"]:8.1f} req/s  p50 {latency["p50"]:7.1f} ms  '
+                f'p95 {latency["p95"]:7.1f} ms  p99 {latency["p99"]:7.1f} ms  '
+                f'{result["queries_per_request"]:5.1f} queries ({result["sql_ms_per_request"]:.1f} ms)  '
+                f'{result["failed"]} failed')
+        before = (baseline or {}).get('routes', {}).get(route)
+        if before:
+            line += (f'  (was {before["throughput"]:.1f} req/s, p99 {before["latency_ms"]["p99"]:.1f} ms, '
+                     f'{before["queries_per_request"]:.1f} queries)')
+        return line
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from issue_tracker.models import Project
+from issue_tracker.services.issue_stats import find_issue_count_drift, rebuild_issue_counts
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the issue counters behind project stats from the issues, or checks them with --check.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('projects', nargs='*', help='Projects to process, all of them by default')
+        parser.add_argument('--check', action='store_true',
+                            help='Only compare the counters with a live GROUP BY, fail if any of them is off')
+
+    def handle(self, *args, **options):
+        projects = options['projects'] or None
+
+        if options['check']:
+            drift = find_issue_count_drift(projects)
+            for (project, status, priority), stored, actual in drift:
+                self.stdout.write(f'{project} status={status} priority={priority}: counted {stored}, actual {actual}')
+            if drift:
+                raise CommandError(f'{len(drift)} issue counters are off, run rebuild_issue_counts to fix them')
+            self.stdout.write('Issue counters are consistent')
+            return
+
+        for project in projects or list(Project.objects.order_by('pk').values_list('pk', flat=True)):
+            rebuild_issue_counts(project)
+            self.stdout.write(f'Rebuilt the issue counters of {project}')
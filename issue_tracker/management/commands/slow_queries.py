@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from issue_tracker.models import SlowQuery
+
+ORDERINGS = {'total': '-total_ms', 'count': '-count', 'max': '-max_ms', 'recent': '-last_seen'}
+
+
+class Command(BaseCommand):
+    help = 'Lists the shapes of the queries logged as slow, see ISSUE_TRACKER_SLOW_QUERY_MS.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--order', choices=ORDERINGS, default='total', help='Slowest first by total time by default')
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--plans', action='store_true', help='Also show the plan captured for each shape')
+        parser.add_argument('--clear', action='store_true', help='Forget every slow query instead')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted, _ = SlowQuery.objects.all().delete()
+            self.stdout.write(f'Forgot {deleted} slow queries')
+            return
+
+        queries = SlowQuery.objects.order_by(ORDERINGS[options['order']], 'pk')[:options['limit']]
+        for query in queries:
+            self.stdout.write(
+                f'{query.count} × {query.total_ms / query.count:.1f} ms (max {query.max_ms:.1f} ms, '
+                f'total {query.total_ms:.1f} ms) in {query.view or "-"} [{query.route or "-"}], '
+                f'last seen {query.last_seen:%Y-%m-%d %H:%M:%S}'
+            )
+            self.stdout.write(f'  {query.sql}')
+            if options['plans'] and query.plan:
+                self.stdout.write('\n'.join(f'    {line}' for line in query.plan.splitlines()))
+        if not queries:
+            self.stdout.write('No slow queries were logged')
@@ -0,0 +1,211 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBase
+from rest_framework import serializers
+
+# Phases reported in Server-Timing and in the phase histogram. They may overlap: the query of a permission check
+# counts in both permissions and db
+PHASES = ('auth', 'permissions', 'db', 'serialize')
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+METRICS = {
+    'issue_tracker_request_duration_seconds': ('Time from receiving a request to returning its response',
+                                               DURATION_BUCKETS),
+    'issue_tracker_request_phase_seconds': ('Time spent in each phase of a request', DURATION_BUCKETS),
+    'issue_tracker_request_queries': ('SQL queries run by a request', QUERY_BUCKETS),
+}
+
+
+class RequestTimer:
+    """Time spent in each phase of the current request, and the number of queries it ran."""
+    __slots__ = ('request', 'phases', 'queries')
+
+    def __init__(self, request: HttpRequest | None = None):
+        self.request = request
+        self.phases: dict[str, float] = {}
+        self.queries = 0
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+
+# Copied into the threads of sync_to_async, so queries of async views are counted too
+current_timer: contextvars.ContextVar[RequestTimer | None] = contextvars.ContextVar('current_timer', default=None)
+
+
+@contextmanager
+def timed(phase: str):
+    """Adds the time spent in the block to ``phase`` of the current request, if it is being timed."""
+    timer = current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(phase, time.perf_counter() - start)
+
+
+def time_query(execute, sql, params, many, context):
+    """Execute wrapper counting and timing the queries of the current request, installed on every connection."""
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    timer.queries += 1
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.add('db', time.perf_counter() - start)
+
+
+class TimedSerializerMixin:
+    """Counts building ``.data`` as the ``serialize`` phase."""
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """``list_serializer_class`` of timed serializers, for ``many=True``."""
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum')
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        # The last count is for values above every bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: tuple[tuple[str, object], ...]) -> str:
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels)
+
+
+class RequestMetrics:
+    """
+    Histograms of request durations, phases and queries per route and method, kept by each process.
+
+    Observing a request only takes a lock and a few increments. ``render()`` writes them in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms: dict[str, dict[tuple, Histogram]] = {name: {} for name in METRICS}
+
+    def observe(self, name: str, labels: tuple, value: float):
+        histogram = self.histograms[name].get(labels)
+        if histogram is None:
+            histogram = self.histograms[name].setdefault(labels, Histogram(METRICS[name][1]))
+        histogram.observe(value)
+
+    def record(self, route: str, method: str, timer: RequestTimer, duration: float):
+        labels = (('route', route), ('method', method))
+        with self.lock:
+            self.observe('issue_tracker_request_duration_seconds', labels, duration)
+            self.observe('issue_tracker_request_queries', labels, timer.queries)
+            for phase, seconds in timer.phases.items():
+                self.observe('issue_tracker_request_phase_seconds', labels + (('phase', phase),), seconds)
+
+    def render(self) -> str:
+        lines = []
+        with self.lock:
+            for name, (description, buckets) in METRICS.items():
+                lines += [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+                for labels, histogram in sorted(self.histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip((*buckets, '+Inf'), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{_labels(labels + (("le", bound),))}}} {cumulative}')
+                    lines.append(f'{name}_sum{{{_labels(labels)}}} {histogram.sum}')
+                    lines.append(f'{name}_count{{{_labels(labels)}}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self.lock:
+            for histograms in self.histograms.values():
+                histograms.clear()
+
+
+request_metrics = RequestMetrics()
+
+
+def server_timing(timer: RequestTimer, duration: float) -> str:
+    metrics = []
+    for phase in PHASES:
+        if phase in timer.phases:
+            metric = f'{phase};dur={timer.phases[phase] * 1000:.2f}'
+            if phase == 'db':
+                metric += f';desc="{timer.queries} queries"'
+            metrics.append(metric)
+    metrics.append(f'total;dur={duration * 1000:.2f}')
+    return ', '.join(metrics)
+
+
+class TimingMiddleware:
+    """
+    Times every request and its phases, see ``PHASES``, and counts its queries.
+
+    The result is recorded in ``request_metrics``, which ``/metrics`` serves, and sent in a ``Server-Timing`` header
+    if ``ISSUE_TRACKER_SERVER_TIMING`` is on, by default only with ``DEBUG``. Streamed responses are timed until the
+    view returns them.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        if self.is_async:
+            return self.__acall__(request)
+        timer = RequestTimer(request)
+        token = current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        return self.finish(request, response, timer, time.perf_counter() - start)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        timer = RequestTimer(request)
+        token = current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        return self.finish(request, response, timer, time.perf_counter() - start)
+
+    @staticmethod
+    def finish(request: HttpRequest, response: HttpResponseBase, timer: RequestTimer,
+               duration: float) -> HttpResponseBase:
+        match = request.resolver_match
+        request_metrics.record(match.route if match is not None else 'unmatched', request.method, timer, duration)
+        if getattr(settings, 'ISSUE_TRACKER_SERVER_TIMING', settings.DEBUG):
+            response['Server-Timing'] = server_timing(timer, duration)
+        return response
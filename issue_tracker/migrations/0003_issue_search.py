@@ -0,0 +1,55 @@
+from django.db import migrations
+
+POSTGRESQL_FORWARD = [
+    "CREATE INDEX issues_search_idx ON issues USING GIN (to_tsvector('english', title || ' ' || description))",
+]
+POSTGRESQL_BACKWARD = [
+    'DROP INDEX IF EXISTS issues_search_idx',
+]
+
+SQLITE_FORWARD = [
+    """CREATE VIRTUAL TABLE issues_fts USING fts5(
+        title, description, content='issues', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER issues_fts_insert AFTER INSERT ON issues BEGIN
+        INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER issues_fts_delete AFTER DELETE ON issues BEGIN
+        INSERT INTO issues_fts(issues_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER issues_fts_update AFTER UPDATE OF title, description ON issues BEGIN
+        INSERT INTO issues_fts(issues_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    "INSERT INTO issues_fts(issues_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS issues_fts_update',
+    'DROP TRIGGER IF EXISTS issues_fts_delete',
+    'DROP TRIGGER IF EXISTS issues_fts_insert',
+    'DROP TABLE IF EXISTS issues_fts',
+]
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+    """Full-text search over issue titles and descriptions: a GIN index on PostgreSQL, an FTS5 table on SQLite."""
+
+    dependencies = [
+        ('issue_tracker', '0002_issue_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor({'postgresql': POSTGRESQL_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            run_for_vendor({'postgresql': POSTGRESQL_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
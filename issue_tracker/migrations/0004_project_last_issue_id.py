@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-18 17:27
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_last_issue_id(apps, schema_editor):
+    Project = apps.get_model('issue_tracker', 'Project')
+    Issue = apps.get_model('issue_tracker', 'Issue')
+    latest = Issue.objects.filter(project=OuterRef('pk')).order_by('-issue_id').values('issue_id')[:1]
+    Project.objects.update(last_issue_id=Coalesce(Subquery(latest), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issue_tracker', '0003_issue_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='last_issue_id',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_last_issue_id, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-18 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issue_tracker', '0004_project_last_issue_id'),
+    ]
+
+    operations = [
+        # auto_now is handled by Django alone, the column stays as it is. Altering it for real would make SQLite
+        # rebuild the table and lose the full-text search triggers of migration 0003
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='issue',
+                    name='updated_at',
+                    field=models.DateTimeField(auto_now=True),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'updated_at'], name='issues_updated_at_idx'),
+        ),
+    ]
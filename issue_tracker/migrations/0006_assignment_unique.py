@@ -0,0 +1,29 @@
+# Generated by Django 6.1.2 on 2026-10-18 18:05
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def delete_duplicate_assignments(apps, schema_editor):
+    Assignment = apps.get_model('issue_tracker', 'Assignment')
+    kept = Assignment.objects.values('user', 'issue').annotate(kept=Min('pk')).values('kept')
+    Assignment.objects.exclude(pk__in=kept).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issue_tracker', '0005_issue_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_assignments, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='assignment',
+            name='assignments_user_issue_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='assignment',
+            constraint=models.UniqueConstraint(fields=('user', 'issue'), name='assignments_user_issue_uniq'),
+        ),
+    ]
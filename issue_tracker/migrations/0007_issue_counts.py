@@ -0,0 +1,42 @@
+# Generated by Django 6.1.2 on 2026-10-18 18:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing_issues(apps, schema_editor):
+    Issue = apps.get_model('issue_tracker', 'Issue')
+    IssueCount = apps.get_model('issue_tracker', 'IssueCount')
+    rows = Issue.objects.order_by().values_list('project', 'status', 'priority').annotate(count=Count('*'))
+    IssueCount.objects.bulk_create([
+        IssueCount(project_id=project, status=status, priority=priority, count=count)
+        for project, status, priority, count in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issue_tracker', '0006_assignment_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.SmallIntegerField()),
+                ('priority', models.SmallIntegerField()),
+                ('count', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='issue_tracker.project')),
+            ],
+            options={
+                'verbose_name': 'Issue count',
+                'verbose_name_plural': 'Issue counts',
+                'db_table': 'issue_counts',
+                'constraints': [models.UniqueConstraint(fields=('project', 'status', 'priority'), name='issue_counts_uniq')],
+            },
+        ),
+        migrations.RunPython(count_existing_issues, migrations.RunPython.noop),
+    ]
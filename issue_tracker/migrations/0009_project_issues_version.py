@@ -0,0 +1,32 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:14
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_issues_changed_at(apps, schema_editor):
+    Project = apps.get_model('issue_tracker', 'Project')
+    Issue = apps.get_model('issue_tracker', 'Issue')
+    latest = Issue.objects.filter(project=OuterRef('pk')).order_by('-updated_at').values('updated_at')[:1]
+    Project.objects.update(issues_changed_at=Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issue_tracker', '0008_slow_queries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='issues_changed_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='issues_version',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_issues_changed_at, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,22 @@
 import enum
 
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
 from rest_framework import serializers
 
+from issue_tracker.metrics import TimedListSerializer, TimedSerializerMixin
+
 
 class Project(models.Model):
     name = models.CharField(max_length=63, unique=True, primary_key=True)
     description = models.TextField(max_length=255, default='No description provided')
     creation_date = models.DateTimeField(auto_now_add=True)
+    # Highest issue_id handed out in this project, see issue_tracker.services.issue_numbers
+    last_issue_id = models.IntegerField(default=0)
+    # Bumped by every change to the project's issues, the validators of issue listings, see
+    # issue_tracker.services.conditional_requests
+    issues_version = models.BigIntegerField(default=0)
+    issues_changed_at = models.DateTimeField(null=True)
 
     class Meta:
         db_table = 'projects'
@@ -16,9 +24,10 @@ class Project(models.Model):
         verbose_name_plural = 'Projects'
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
+        list_serializer_class = TimedListSerializer
         fields = ['name', 'description', 'creation_date']
         read_only_fields = ['creation_date']
 
@@ -52,20 +61,32 @@ class Issue(models.Model):
     status = models.SmallIntegerField(default=0)
     priority = models.SmallIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'issues'
         verbose_name = 'Issue'
         verbose_name_plural = 'Issues'
         unique_together = ('project', 'issue_id')
+        indexes = [
+            models.Index(fields=['project', 'status', 'issue_id'], name='issues_status_idx'),
+            models.Index(fields=['project', 'priority', 'issue_id'], name='issues_priority_idx'),
+            models.Index(fields=['project', 'reporter', 'issue_id'], name='issues_reporter_idx'),
+            models.Index(fields=['project', 'updated_at'], name='issues_updated_at_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # The signals keeping IssueCount up to date run inside save(), this makes them commit or roll back with it
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())
     reporter = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
 
     class Meta:
         model = Issue
+        list_serializer_class = TimedListSerializer
         fields = [
             'issue_id',
             'title',
@@ -80,27 +101,76 @@ class IssueSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
+class IssueCount(models.Model):
+    """Number of issues of a project with a given status and priority, see issue_tracker.services.issue_stats"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+    status = models.SmallIntegerField()
+    priority = models.SmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'issue_counts'
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'status', 'priority'], name='issue_counts_uniq'),
+        ]
+        verbose_name = 'Issue count'
+        verbose_name_plural = 'Issue counts'
+
+
 class Assignment(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE)
 
     class Meta:
         db_table = 'assignments'
+        constraints = [
+            # Also the index behind the assignee filter and the issues of a user
+            models.UniqueConstraint(fields=['user', 'issue'], name='assignments_user_issue_uniq'),
+        ]
         verbose_name = 'Assignment'
         verbose_name_plural = 'Assignments'
 
 
+class SlowQuery(models.Model):
+    """Queries slower than ISSUE_TRACKER_SLOW_QUERY_MS with the same shape, see issue_tracker.slow_queries"""
+    fingerprint = models.CharField(max_length=40, unique=True)
+    # Normalized, without literal values
+    sql = models.TextField()
+    # Where the query was first seen slow, empty outside of requests
+    route = models.CharField(max_length=255, blank=True)
+    view = models.CharField(max_length=255, blank=True)
+    plan = models.TextField(blank=True)
+    count = models.IntegerField(default=1)
+    total_ms = models.FloatField()
+    max_ms = models.FloatField()
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        db_table = 'slow_queries'
+        verbose_name = 'Slow query'
+        verbose_name_plural = 'Slow queries'
+
+
 class ProjectPermission(enum.IntFlag):
     Null = 0
     Read = 1
     Write = 2
     Manage = 4
 
+class ProjectMembershipQuerySet(models.QuerySet):
+    def with_permission(self, permission: ProjectPermission):
+        """Memberships whose role has any of the ``permission`` bits, filtered by the database."""
+        return self.alias(granted=models.F('role').bitand(int(permission))).filter(granted__gt=0)
+
+
 class ProjectMembership(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     project = models.ForeignKey(Project, on_delete=models.CASCADE)
     role = models.SmallIntegerField(default=0)
 
+    objects = ProjectMembershipQuerySet.as_manager()
+
     class Meta:
         db_table = 'memberships'
         verbose_name = 'Project membership'
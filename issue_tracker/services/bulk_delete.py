@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models import QuerySet
+
+from auth_api.tokens import mark_roles_changed
+from issue_tracker.models import Assignment, Issue, IssueCount, Project, ProjectMembership
+
+
+def delete_rows(queryset: QuerySet) -> int:
+    """
+    Deletes the rows of ``queryset`` with a single ``DELETE``, without loading them, and returns how many.
+
+    Unlike ``QuerySet.delete()`` it neither sends ``pre_delete`` and ``post_delete`` nor follows ``on_delete``: the
+    caller does what the receivers would have done and deletes the rows referencing these first. This is
+    ``QuerySet._raw_delete()``, the private method ``delete()`` itself falls back to when there is nothing to send or
+    cascade, so check it on Django upgrades.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def delete_project(project: Project):
+    """
+    Deletes ``project`` with its issues, their assignments, its issue counters and its memberships in a few queries,
+    whatever the number of issues and members.
+
+    ``Project.delete()`` alone would load every issue, assignment and membership and delete them 100 at a time. The
+    receivers of the issues and assignments would have nothing to do, ``forget_project_roles`` forgets what is cached
+    about the project. Those of the memberships are replaced by marking the roles of every member changed at once.
+    """
+    with transaction.atomic():
+        members = list(ProjectMembership.objects.filter(project=project).values_list('user_id', flat=True))
+        for queryset in (Assignment.objects.filter(issue__project=project),
+                         IssueCount.objects.filter(project=project),
+                         Issue.objects.filter(project=project),
+                         ProjectMembership.objects.filter(project=project)):
+            delete_rows(queryset)
+        project.delete()
+        mark_roles_changed(*members)
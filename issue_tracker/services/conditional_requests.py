@@ -0,0 +1,121 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK
+
+from issue_tracker.models import Issue, Project
+
+# Columns behind the validators of issue listings. The creation date tells a project from a deleted one of the same name
+PROJECT_ISSUES_VERSION = ('creation_date', 'issues_version', 'issues_changed_at')
+
+
+@dataclass
+class Validators:
+    """``ETag`` and ``Last-Modified`` of a resource, both ``None`` if it doesn't exist."""
+    etag: str | None = None
+    last_modified: datetime | None = None
+
+    def set_headers(self, response: Response):
+        if self.etag is not None:
+            response.headers['ETag'] = self.etag
+        if self.last_modified is not None:
+            response.headers['Last-Modified'] = http_date(self.last_modified.timestamp())
+
+
+def _etag(*parts) -> str:
+    return quote_etag(hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest())
+
+
+def issues_changed(project_id: str):
+    """
+    Changes the validators of the project's issue listings. Call it in the transaction of every write to the project's
+    issues or assignments.
+    """
+    Project.objects.filter(pk=project_id).update(issues_version=F('issues_version') + 1,
+                                                 issues_changed_at=timezone.now())
+
+
+def project_issues_validators(project_id: str) -> Validators:
+    """
+    Validators of every listing of the project's issues, read from the project row whatever the number of issues.
+
+    The version is bumped by ``issues_changed()`` when an issue is created, modified, deleted, assigned or unassigned.
+    """
+    return _project_issues_validators(_project_issues_version(project_id).first())
+
+
+async def aproject_issues_validators(project_id: str) -> Validators:
+    return _project_issues_validators(await _project_issues_version(project_id).afirst())
+
+
+def _project_issues_version(project_id: str):
+    return Project.objects.filter(pk=project_id).values_list(*PROJECT_ISSUES_VERSION)
+
+
+def _project_issues_validators(version: tuple | None) -> Validators:
+    if version is None:
+        return Validators()
+    creation_date, issues_version, changed_at = version
+    return Validators(etag=_etag(creation_date.isoformat(), issues_version), last_modified=changed_at)
+
+
+def issue_validators(project_id: str, issue_id: int) -> Validators:
+    return _issue_validators(_issue_updated_at(project_id, issue_id).first())
+
+
+async def aissue_validators(project_id: str, issue_id: int) -> Validators:
+    return _issue_validators(await _issue_updated_at(project_id, issue_id).afirst())
+
+
+def _issue_updated_at(project_id: str, issue_id: int):
+    return Issue.objects.filter(project=project_id, issue_id=issue_id).values_list('updated_at', flat=True)
+
+
+def _issue_validators(updated_at: datetime | None) -> Validators:
+    if updated_at is None:
+        return Validators()
+    return Validators(etag=_etag(updated_at.isoformat()), last_modified=updated_at)
+
+
+def conditional_response(request: Request, validators: Validators, build: Callable[[], Response]) -> Response:
+    """
+    Answers ``If-None-Match``/``If-Modified-Since`` requests for a fresh representation with ``304 Not Modified``,
+    without building the response, otherwise returns ``build()`` with the validators attached if it succeeded.
+    """
+    response = _not_modified(request, validators)
+    if response is None:
+        response = build()
+        _set_validators(response, validators)
+    return response
+
+
+async def aconditional_response(request: Request, validators: Validators,
+                                build: Callable[[], Awaitable[Response]]) -> Response:
+    response = _not_modified(request, validators)
+    if response is None:
+        response = await build()
+        _set_validators(response, validators)
+    return response
+
+
+def _not_modified(request: Request, validators: Validators) -> Response | None:
+    last_modified = validators.last_modified and int(validators.last_modified.timestamp())
+    precondition = get_conditional_response(request, etag=validators.etag, last_modified=last_modified)
+    if precondition is None:
+        return None
+    response = Response(status=precondition.status_code)
+    validators.set_headers(response)
+    return response
+
+
+def _set_validators(response: Response, validators: Validators):
+    if response.status_code == HTTP_200_OK:
+        validators.set_headers(response)
@@ -0,0 +1,79 @@
+import csv
+import json
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+from issue_tracker.models import IssueSerializer
+
+DEFAULT_EXPORT_CHUNK_SIZE = 2000
+
+# Database columns in the order of IssueSerializer.Meta.fields
+EXPORT_COLUMNS = (
+    'issue_id',
+    'title',
+    'description',
+    'project_id',
+    'reporter_id',
+    'status',
+    'priority',
+    'created_at',
+    'updated_at',
+)
+EXPORT_FIELDS = tuple(IssueSerializer.Meta.fields)
+
+# Formats the timestamps exactly like IssueSerializer does
+_datetime = serializers.DateTimeField()
+
+
+def iter_issue_rows(queryset: QuerySet, ordering: Iterable[str] = ('issue_id',)) -> Iterator[tuple]:
+    """
+    Yields one tuple per issue, with the values of ``EXPORT_FIELDS``.
+
+    Rows are fetched ``ISSUE_TRACKER_EXPORT_CHUNK_SIZE`` at a time (from a server-side cursor on PostgreSQL),
+    so memory use does not depend on the size of the queryset.
+    """
+    chunk_size = getattr(settings, 'ISSUE_TRACKER_EXPORT_CHUNK_SIZE', DEFAULT_EXPORT_CHUNK_SIZE)
+    rows = queryset.order_by(*ordering).values_list(*EXPORT_COLUMNS).iterator(chunk_size=chunk_size)
+    for *values, created_at, updated_at in rows:
+        yield *values, _datetime.to_representation(created_at), _datetime.to_representation(updated_at)
+
+
+def to_ndjson(rows: Iterable[tuple], batch_size: int = 100) -> Iterator[bytes]:
+    batch = []
+    for row in rows:
+        batch.append(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False, separators=(',', ':')))
+        if len(batch) == batch_size:
+            yield ('\n'.join(batch) + '\n').encode()
+            batch = []
+    if batch:
+        yield ('\n'.join(batch) + '\n').encode()
+
+
+def to_csv(rows: Iterable[tuple], batch_size: int = 100) -> Iterator[bytes]:
+    buffer = _LineBuffer()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        writer.writerow(row)
+        if len(buffer.lines) >= batch_size:
+            yield buffer.flush()
+    if buffer.lines:
+        yield buffer.flush()
+
+
+class _LineBuffer:
+    """File-like sink for csv.writer that hands the written lines over in batches."""
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, line: str):
+        self.lines.append(line)
+
+    def flush(self) -> bytes:
+        data = ''.join(self.lines).encode()
+        self.lines = []
+        return data
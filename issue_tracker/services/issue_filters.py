@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+
+from django.db.models import QuerySet
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import HTTP_400_BAD_REQUEST
+
+from issue_tracker.models import Assignment, IssueStatus, IssuePriority
+from issue_tracker.services.issue_search import search_issues, SEARCH_RANK
+from issue_tracker.services.issue_validator import validate_in_enum
+
+# `?ordering=` value -> keyset columns. issue_id is the tie-breaker, so every ordering is served by one of the
+# (project, <column>, issue_id) indexes on `issues`.
+ORDERINGS = {
+    'issue_id': ('issue_id',),
+    '-issue_id': ('-issue_id',),
+    'status': ('status', 'issue_id'),
+    '-status': ('-status', '-issue_id'),
+    'priority': ('priority', 'issue_id'),
+    '-priority': ('-priority', '-issue_id'),
+}
+# Best matches first, used for `?q=` unless another ordering is requested explicitly
+RANK_ORDERING = ('-' + SEARCH_RANK, 'issue_id')
+
+
+@dataclass
+class IssueFilter:
+    status: int | None = None
+    priority: int | None = None
+    reporter: str | None = None
+    assignee: str | None = None
+    search: str | None = None
+    ordering: tuple[str, ...] = ORDERINGS['issue_id']
+
+    @classmethod
+    def parse_from_request(cls, request: Request):
+        params = request.query_params
+        issue_filter = cls()
+
+        if params.get('status'):
+            is_valid, issue_filter.status = validate_in_enum(params['status'], IssueStatus)
+            if not is_valid:
+                return None, Response(data={'error': 'Invalid issue status'}, status=HTTP_400_BAD_REQUEST)
+
+        if params.get('priority'):
+            is_valid, issue_filter.priority = validate_in_enum(params['priority'], IssuePriority)
+            if not is_valid:
+                return None, Response(data={'error': 'Invalid issue priority'}, status=HTTP_400_BAD_REQUEST)
+
+        issue_filter.reporter = params.get('reporter') or None
+        issue_filter.assignee = params.get('assignee') or None
+        issue_filter.search = params.get('q', '').strip() or None
+
+        ordering = params.get('ordering')
+        if ordering is not None:
+            if ordering not in ORDERINGS:
+                return None, Response(data={'error': 'Invalid ordering'}, status=HTTP_400_BAD_REQUEST)
+            issue_filter.ordering = ORDERINGS[ordering]
+        elif issue_filter.search is not None:
+            issue_filter.ordering = RANK_ORDERING
+
+        return issue_filter, None
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        if self.status is not None:
+            queryset = queryset.filter(status=self.status)
+        if self.priority is not None:
+            queryset = queryset.filter(priority=self.priority)
+        if self.reporter is not None:
+            queryset = queryset.filter(reporter__username=self.reporter)
+        if self.assignee is not None:
+            # Semi-join through the (user, issue) index instead of joining every assignment of the project
+            assigned = Assignment.objects.filter(user__username=self.assignee).values('issue')
+            queryset = queryset.filter(pk__in=assigned)
+        if self.search is not None:
+            queryset = search_issues(queryset, self.search)
+        return queryset
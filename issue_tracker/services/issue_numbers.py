@@ -0,0 +1,29 @@
+from django.db import connection, transaction
+
+from issue_tracker.models import Project
+
+
+def reserve_issue_ids(project_id: str, count: int = 1) -> range:
+    """
+    Hands out ``count`` consecutive issue numbers of a project.
+
+    The numbers come from the project's ``last_issue_id`` counter, bumped with a single ``UPDATE ... RETURNING``.
+    The row stays locked until the surrounding transaction ends, so call this inside the transaction that inserts
+    the issues: concurrent creates then queue on one row for the duration of an INSERT, and a rolled back insert
+    gives its numbers back.
+    """
+    if not transaction.get_connection().in_atomic_block:
+        raise transaction.TransactionManagementError('Issue numbers must be reserved inside a transaction')
+
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {quote(Project._meta.db_table)} SET {quote("last_issue_id")} = {quote("last_issue_id")} + %s '
+            f'WHERE {quote("name")} = %s RETURNING {quote("last_issue_id")}',
+            [count, project_id],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        raise Project.DoesNotExist(f'Project {project_id!r} does not exist')
+
+    return range(row[0] - count + 1, row[0] + 1)
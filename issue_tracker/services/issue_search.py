@@ -0,0 +1,64 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+# Must stay identical to the expression of the GIN index created in migration 0003, otherwise PostgreSQL won't use it
+POSTGRESQL_DOCUMENT = "to_tsvector('english', \"issues\".\"title\" || ' ' || \"issues\".\"description\")"
+POSTGRESQL_QUERY = "websearch_to_tsquery('english', %s)"
+
+# FTS5 shadow table over `issues`, kept in sync by the triggers of migration 0003
+SQLITE_FTS_TABLE = 'issues_fts'
+
+SEARCH_RANK = 'search_rank'
+
+_TOKEN = re.compile(r'\w+')
+
+
+def search_issues(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Narrows ``queryset`` down to the issues matching ``query`` and annotates them with ``search_rank``,
+    which is higher for better matches.
+
+    Full-text search needs PostgreSQL or SQLite, other databases fall back to issues containing every word of the
+    query, all ranked the same.
+    """
+    if connection.vendor == 'postgresql':
+        return _search_postgresql(queryset, query)
+    if connection.vendor == 'sqlite':
+        return _search_sqlite(queryset, query)
+    return _search_contains(queryset, query)
+
+
+def _search_postgresql(queryset: QuerySet, query: str) -> QuerySet:
+    # Cast to float8 so the rank survives the round trip through keyset cursors exactly
+    rank = RawSQL(f'ts_rank({POSTGRESQL_DOCUMENT}, {POSTGRESQL_QUERY})::float8', (query,), output_field=FloatField())
+    matches = RawSQL(f'{POSTGRESQL_DOCUMENT} @@ {POSTGRESQL_QUERY}', (query,), output_field=BooleanField())
+    return queryset.filter(matches).annotate(**{SEARCH_RANK: rank})
+
+
+def _search_sqlite(queryset: QuerySet, query: str) -> QuerySet:
+    # Every word of the query has to match, quoting them keeps FTS5 operators in user input from being interpreted
+    match = ' '.join(f'"{token}"' for token in _TOKEN.findall(query))
+    if not match:
+        return queryset.annotate(**{SEARCH_RANK: Value(0.0)}).none()
+
+    matches = RawSQL(f'SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s', (match,))
+    # bm25() is lower for better matches, and only available in a query matching the FTS table
+    rank = RawSQL(
+        f'SELECT -bm25({SQLITE_FTS_TABLE}) FROM {SQLITE_FTS_TABLE} '
+        f'WHERE {SQLITE_FTS_TABLE} MATCH %s AND {SQLITE_FTS_TABLE}.rowid = "issues"."id"',
+        (match,),
+        output_field=FloatField(),
+    )
+    return queryset.filter(pk__in=matches).annotate(**{SEARCH_RANK: rank})
+
+
+def _search_contains(queryset: QuerySet, query: str) -> QuerySet:
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return queryset.annotate(**{SEARCH_RANK: Value(0.0)}).none()
+    for token in tokens:
+        queryset = queryset.filter(Q(title__icontains=token) | Q(description__icontains=token))
+    return queryset.annotate(**{SEARCH_RANK: Value(0.0, output_field=FloatField())})
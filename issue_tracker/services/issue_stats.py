@@ -0,0 +1,88 @@
+from collections import Counter
+from typing import Iterable, Mapping
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from issue_tracker.models import Issue, IssueCount, IssuePriority, IssueStatus, Project
+
+# (project, status, priority)
+CountKey = tuple[str, int, int]
+
+
+def count_issues(project_id: str, deltas: Mapping[tuple[int, int], int]):
+    """
+    Adds ``deltas``, ``{(status, priority): change}``, to the issue counters of a project.
+
+    Call it in the transaction that inserts, updates or deletes the issues, so that the counters change with them.
+    """
+    # Always in the same order, so that concurrent A -> B and B -> A changes don't lock the rows in opposite orders
+    for (status, priority), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        rows = IssueCount.objects.filter(project=project_id, status=status, priority=priority)
+        # A missing row can only be decremented while its project is being deleted
+        if rows.update(count=F('count') + delta) or delta < 0:
+            continue
+        # First issue with this status and priority. Another transaction may be inserting the same row, whichever
+        # comes second inserts nothing and increments the row of the first
+        IssueCount.objects.bulk_create([IssueCount(project_id=project_id, status=status, priority=priority)],
+                                       ignore_conflicts=True)
+        rows.update(count=F('count') + delta)
+
+
+def get_issue_stats(project_id: str) -> dict:
+    """
+    Issue counts of a project per status, per priority and per both.
+
+    Reads at most one counter row per status and priority, whatever the number of issues.
+    """
+    matrix = {status.name: {priority.name: 0 for priority in IssuePriority} for status in IssueStatus}
+    for status, priority, count in IssueCount.objects.filter(project=project_id) \
+            .values_list('status', 'priority', 'count'):
+        matrix[IssueStatus(status).name][IssuePriority(priority).name] += count
+
+    return {
+        'total': sum(sum(row.values()) for row in matrix.values()),
+        'status': {status: sum(row.values()) for status, row in matrix.items()},
+        'priority': {priority.name: sum(row[priority.name] for row in matrix.values()) for priority in IssuePriority},
+        'status_priority': matrix,
+    }
+
+
+def live_issue_counts(project_ids: Iterable[str] | None = None) -> Counter[CountKey]:
+    """Issue counts computed with a ``GROUP BY`` on ``issues``, the source of truth for the counters."""
+    issues = Issue.objects.all() if project_ids is None else Issue.objects.filter(project__in=project_ids)
+    rows = issues.order_by().values_list('project', 'status', 'priority').annotate(count=Count('*'))
+    return Counter({(project, status, priority): count for project, status, priority, count in rows})
+
+
+def stored_issue_counts(project_ids: Iterable[str] | None = None) -> Counter[CountKey]:
+    counts = IssueCount.objects.all() if project_ids is None else IssueCount.objects.filter(project__in=project_ids)
+    rows = counts.exclude(count=0).values_list('project', 'status', 'priority', 'count')
+    return Counter({(project, status, priority): count for project, status, priority, count in rows})
+
+
+def find_issue_count_drift(project_ids: Iterable[str] | None = None) -> list[tuple[CountKey, int, int]]:
+    """Counters that disagree with the issues, as ``(key, stored count, actual count)``."""
+    if project_ids is not None:
+        project_ids = list(project_ids)
+    with transaction.atomic():
+        # One transaction, so that both sides see the same snapshot on databases that isolate reads
+        live, stored = live_issue_counts(project_ids), stored_issue_counts(project_ids)
+    return [(key, stored[key], live[key]) for key in sorted(live.keys() | stored.keys()) if stored[key] != live[key]]
+
+
+def rebuild_issue_counts(project_id: str):
+    """
+    Recomputes the counters of a project from its issues.
+
+    Locks the project row, which issue creation takes too, so no issue can be created in the meantime.
+    """
+    with transaction.atomic():
+        list(Project.objects.select_for_update().filter(pk=project_id).values_list('pk'))
+        IssueCount.objects.filter(project=project_id).delete()
+        IssueCount.objects.bulk_create([
+            IssueCount(project_id=project_id, status=status, priority=priority, count=count)
+            for (_, status, priority), count in live_issue_counts([project_id]).items()
+        ])
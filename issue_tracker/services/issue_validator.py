@@ -4,7 +4,7 @@ from typing import Any
 def try_int(value: Any) -> int | None:
     try:
         return int(value)
-    except ValueError:
+    except (TypeError, ValueError):
         return None
 
 def validate_in_enum(value: Any, target_type) -> tuple[bool, int]:
@@ -0,0 +1,176 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Field, Q, QuerySet
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import HTTP_400_BAD_REQUEST
+
+from issue_tracker.services.issue_validator import try_int
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_MAX_PAGE_SIZE = 500
+
+FORWARD = 'n'
+BACKWARD = 'p'
+
+
+def encode_cursor(direction: str, ordering: tuple[str, ...], values: list) -> str:
+    raw = json.dumps([direction, list(ordering), values], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str, ordering: tuple[str, ...]) -> tuple[str, list] | None:
+    """Returns ``(direction, key values)`` or None if the cursor is malformed or was issued for another ordering."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, cursor_ordering, values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+
+    if direction not in (FORWARD, BACKWARD) or cursor_ordering != list(ordering):
+        return None
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None
+    if not all(isinstance(value, (int, float, str)) and not isinstance(value, bool) for value in values):
+        return None
+    return direction, values
+
+
+@dataclass
+class KeysetPage:
+    rows: list
+    next: str | None
+    prev: str | None
+
+    def envelope(self, data: Any) -> dict:
+        return {'data': data, 'next': self.next, 'prev': self.prev}
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over a strictly ordered set of columns.
+
+    Every page is a ``WHERE (keys) > (cursor) ORDER BY keys LIMIT n`` query, so the cost of a page does not depend
+    on how deep it is. The last ordering column has to be unique within the paginated queryset.
+    """
+
+    def __init__(self, ordering: Iterable[str], key_getter: Callable[[Any], list] | None = None):
+        self.ordering = tuple(ordering)
+        self.fields = [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+        self.key_getter = key_getter or self._attribute_key
+
+    def paginate(self, queryset: QuerySet, request: Request) -> tuple[KeysetPage | None, Response | None]:
+        params, err = self.parse_params(request, queryset)
+        if err:
+            return None, err
+        return self.get_page(queryset, *params), None
+
+    async def apaginate(self, queryset: QuerySet, request: Request) -> tuple[KeysetPage | None, Response | None]:
+        params, err = self.parse_params(request, queryset)
+        if err:
+            return None, err
+        return await self.aget_page(queryset, *params), None
+
+    def parse_params(self, request: Request,
+                     queryset: QuerySet) -> tuple[tuple[int, str, list | None] | None, Response | None]:
+        """
+        Returns the page size, direction and cursor values asked for by ``?limit=`` and ``?cursor=``, the values
+        converted to the types of the ordering columns of ``queryset``.
+        """
+        limit = request.query_params.get('limit')
+        page_size = get_page_size()
+        if limit is not None:
+            page_size = try_int(limit)
+            if page_size is None or page_size < 1:
+                return None, Response(data={'error': 'Invalid page size'}, status=HTTP_400_BAD_REQUEST)
+            page_size = min(page_size, get_max_page_size())
+
+        direction, values = FORWARD, None
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            decoded = decode_cursor(cursor, self.ordering)
+            if decoded is not None:
+                direction, values = decoded
+                values = self._clean_values(queryset, values)
+            if decoded is None or values is None:
+                return None, Response(data={'error': 'Invalid cursor'}, status=HTTP_400_BAD_REQUEST)
+
+        return (page_size, direction, values), None
+
+    def get_page(self, queryset: QuerySet, page_size: int, direction: str, values: list | None) -> KeysetPage:
+        rows = list(self._page_query(queryset, page_size, direction, values))
+        return self._make_page(rows, page_size, direction, values)
+
+    async def aget_page(self, queryset: QuerySet, page_size: int, direction: str, values: list | None) -> KeysetPage:
+        rows = [row async for row in self._page_query(queryset, page_size, direction, values)]
+        return self._make_page(rows, page_size, direction, values)
+
+    def _page_query(self, queryset: QuerySet, page_size: int, direction: str, values: list | None) -> QuerySet:
+        backward = direction == BACKWARD
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, backward))
+        order_by = [('-' if descending != backward else '') + name for name, descending in self.fields]
+        # One extra row tells whether there is a next page
+        return queryset.order_by(*order_by)[:page_size + 1]
+
+    def _make_page(self, rows: list, page_size: int, direction: str, values: list | None) -> KeysetPage:
+        backward = direction == BACKWARD
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backward:
+            rows.reverse()
+
+        if not rows:
+            return KeysetPage(rows, next=None, prev=None)
+
+        first, last = self.key_getter(rows[0]), self.key_getter(rows[-1])
+        if backward:
+            return KeysetPage(
+                rows,
+                next=encode_cursor(FORWARD, self.ordering, last),
+                prev=encode_cursor(BACKWARD, self.ordering, first) if has_more else None,
+            )
+        return KeysetPage(
+            rows,
+            next=encode_cursor(FORWARD, self.ordering, last) if has_more else None,
+            prev=encode_cursor(BACKWARD, self.ordering, first) if values is not None else None,
+        )
+
+    def _seek(self, values: list, backward: bool) -> Q:
+        """Builds ``(a, b, c) > (x, y, z)`` as ``a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)``."""
+        condition = Q()
+        equal = {}
+        for (name, descending), value in zip(self.fields, values):
+            lookup = 'lt' if descending != backward else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def _clean_values(self, queryset: QuerySet, values: list) -> list | None:
+        """Converts cursor values with the fields of their columns, None if one isn't valid for its column."""
+        try:
+            return [_column_field(queryset, name).to_python(value) for (name, _), value in zip(self.fields, values)]
+        except ValidationError:
+            return None
+
+    def _attribute_key(self, row: Any) -> list:
+        return [getattr(row, name) for name, _ in self.fields]
+
+
+def _column_field(queryset: QuerySet, name: str) -> Field:
+    annotation = queryset.query.annotations.get(name)
+    return annotation.output_field if annotation is not None else queryset.model._meta.get_field(name)
+
+
+def get_page_size() -> int:
+    return getattr(settings, 'ISSUE_TRACKER_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+
+
+def get_max_page_size() -> int:
+    return getattr(settings, 'ISSUE_TRACKER_MAX_PAGE_SIZE', DEFAULT_MAX_PAGE_SIZE)
@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import Token
+
+from auth_api.tokens import get_claimed_roles
+
+from issue_tracker.metrics import timed
+from issue_tracker.models import ProjectMembership, ProjectPermission
+
+DEFAULT_CACHE_SIZE = 10000
+DEFAULT_CACHE_TTL = 60
+
+
+class PermissionCache:
+    """
+    Bounded LRU cache of project roles, keyed by ``(user id, project name)``.
+
+    Entries are dropped by the signal handlers in ``issue_tracker.signals`` as soon as a membership or project
+    changes. Those only reach the current process, so entries also expire after a TTL: other worker processes may
+    keep serving a stale role for at most ``ISSUE_TRACKER_PERMISSION_CACHE_TTL`` seconds.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.entries: OrderedDict[tuple[int, str], tuple[int, float]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        return getattr(settings, 'ISSUE_TRACKER_PERMISSION_CACHE_SIZE', DEFAULT_CACHE_SIZE)
+
+    @property
+    def ttl(self) -> float:
+        return getattr(settings, 'ISSUE_TRACKER_PERMISSION_CACHE_TTL', DEFAULT_CACHE_TTL)
+
+    def get(self, user_id: int, project_id: str) -> int | None:
+        key = (user_id, project_id)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[1] <= self.clock():
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, user_id: int, project_id: str, role: int):
+        key = (user_id, project_id)
+        with self.lock:
+            self.entries[key] = (role, self.clock() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id: int, project_id: str):
+        with self.lock:
+            self.entries.pop((user_id, project_id), None)
+
+    def invalidate_project(self, project_id: str):
+        with self.lock:
+            for key in [key for key in self.entries if key[1] == project_id]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries)}
+
+
+permission_cache = PermissionCache()
+
+
+def claimable_roles(user_id: int, limit: int) -> dict[str, int]:
+    """At most ``limit`` of the user's project roles, the ``AUTH_API_ROLE_CLAIMS_LOADER`` of access tokens."""
+    return dict(ProjectMembership.objects.filter(user=user_id, role__gt=0).values_list('project', 'role')[:limit])
+
+
+def get_claimed_role(token: Token | None, project_id: str) -> ProjectPermission | None:
+    """Role in the project according to the claim of ``token``, None if there is no claim that can be trusted."""
+    roles = get_claimed_roles(token)
+    return None if roles is None else ProjectPermission(roles.get(project_id, 0))
+
+
+def get_project_role(user: User, project_id: str, token: Token | None = None) -> ProjectPermission:
+    """
+    Role of ``user`` in a project, ``Null`` if they are not a member or the project doesn't exist.
+
+    Pass the request's access token to use its role claim when there is one that can be trusted.
+    """
+    with timed('permissions'):
+        role = _known_role(user, project_id, token)
+        if role is None:
+            role = _remember_role(user, project_id, _membership_role(user, project_id).first())
+        return role
+
+
+def has_project_permission(user: User, project_id: str, permission: ProjectPermission,
+                           token: Token | None = None) -> bool:
+    """Whether the role of ``user`` in the project has any of the ``permission`` bits."""
+    return bool(get_project_role(user, project_id, token) & permission)
+
+
+async def aget_project_role(user: User, project_id: str, token: Token | None = None) -> ProjectPermission:
+    """``get_project_role()`` for async views."""
+    with timed('permissions'):
+        role = _known_role(user, project_id, token)
+        if role is None:
+            role = _remember_role(user, project_id, await _membership_role(user, project_id).afirst())
+        return role
+
+
+async def ahas_project_permission(user: User, project_id: str, permission: ProjectPermission,
+                                  token: Token | None = None) -> bool:
+    return bool(await aget_project_role(user, project_id, token) & permission)
+
+
+def _known_role(user: User, project_id: str, token: Token | None) -> ProjectPermission | None:
+    """Role from the token's claim or from ``permission_cache``, None if it has to be looked up."""
+    role = get_claimed_role(token, project_id)
+    if role is None:
+        role = permission_cache.get(user.pk, project_id)
+    return None if role is None else ProjectPermission(role)
+
+
+def _membership_role(user: User, project_id: str):
+    return ProjectMembership.objects.filter(user=user, project=project_id).values_list('role', flat=True)
+
+
+def _remember_role(user: User, project_id: str, role: int | None) -> ProjectPermission:
+    role = role or 0
+    permission_cache.set(user.pk, project_id, role)
+    return ProjectPermission(role)
@@ -0,0 +1,115 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from django.core.cache import BaseCache
+
+DEFAULT_MAX_BUCKETS = 100000
+
+PERIODS = {'s': 1, 'sec': 1, 'second': 1, 'm': 60, 'min': 60, 'minute': 60, 'h': 3600, 'hour': 3600,
+           'd': 86400, 'day': 86400}
+
+
+@dataclass(frozen=True)
+class Rate:
+    count: int
+    period: float
+
+    @classmethod
+    def parse(cls, rate: str) -> 'Rate':
+        """Parses rates like ``5/min`` or ``100/hour``."""
+        count, period = rate.split('/')
+        return cls(int(count), PERIODS[period.strip()])
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.count / self.period
+
+
+class TokenBuckets:
+    """
+    In-process token buckets, one per key, refilled continuously at their rate up to ``rate.count`` tokens.
+
+    Only the least recently used ``max_size`` buckets are kept. A dropped bucket comes back full, which can only let
+    a client through earlier than it should.
+    """
+
+    def __init__(self, clock=time.monotonic, max_size: int = DEFAULT_MAX_BUCKETS):
+        self.clock = clock
+        self.max_size = max_size
+        # key -> (tokens, time of the last refill)
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def acquire(self, limits: list[tuple[str, Rate]], cost: int = 1) -> float | None:
+        """
+        Takes ``cost`` tokens from the bucket of every key, or none of them if one doesn't have enough.
+
+        Returns ``0`` on success, otherwise the number of seconds until every bucket has enough tokens again, or None
+        if ``cost`` is more than a bucket can ever hold.
+        """
+        if any(cost > rate.count for key, rate in limits):
+            return None
+        now = self.clock()
+        with self.lock:
+            tokens = [self._refill(key, rate, now) for key, rate in limits]
+            wait = max([(cost - available) / rate.refill_per_second
+                        for available, (key, rate) in zip(tokens, limits) if available < cost], default=0.0)
+            if wait:
+                return wait
+            for available, (key, rate) in zip(tokens, limits):
+                self.buckets[key] = (available - cost, now)
+                self.buckets.move_to_end(key)
+            while len(self.buckets) > self.max_size:
+                self.buckets.popitem(last=False)
+            return 0.0
+
+    def _refill(self, key: str, rate: Rate, now: float) -> float:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            return rate.count
+        tokens, updated = bucket
+        return min(rate.count, tokens + (now - updated) * rate.refill_per_second)
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class SlidingWindowCounters:
+    """
+    Request counters in a Django cache, shared by every process using it.
+
+    The number of requests in the last ``rate.period`` seconds is estimated from the counters of the current and the
+    previous fixed window, the previous one weighted by how much of it still overlaps the sliding window. Counters are
+    only ever incremented, so the backend has to support atomic ``incr`` (Redis and Memcached do).
+    """
+
+    def __init__(self, cache: BaseCache, clock=time.time):
+        self.cache = cache
+        self.clock = clock
+
+    def acquire(self, limits: list[tuple[str, Rate]], cost: int = 1) -> float:
+        """Counts ``cost`` requests for every key, returns ``0`` if all of them are within their rate, else a wait."""
+        now = self.clock()
+        wait = 0.0
+        for key, rate in limits:
+            window, elapsed = divmod(now, rate.period)
+            # Keys may contain project names, with characters that memcached doesn't accept
+            key = hashlib.md5(key.encode()).hexdigest()
+            current_key = f'issue_tracker:rate:{key}:{int(window)}'
+            previous_key = f'issue_tracker:rate:{key}:{int(window) - 1}'
+            self.cache.add(current_key, 0, timeout=math.ceil(rate.period * 2))
+            try:
+                current = self.cache.incr(current_key, cost)
+            except ValueError:
+                # Expired right after add()
+                current = cost
+                self.cache.set(current_key, current, timeout=math.ceil(rate.period * 2))
+            previous = self.cache.get(previous_key, 0)
+            if previous * (1 - elapsed / rate.period) + current > rate.count:
+                wait = max(wait, rate.period - elapsed)
+        return wait
@@ -0,0 +1,137 @@
+import hashlib
+import threading
+import time
+from typing import Awaitable, Callable
+
+from django.conf import settings
+from django.core.cache import caches, BaseCache
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK
+
+DEFAULT_CACHE_ALIAS = 'default'
+DEFAULT_CACHE_TIMEOUT = 300
+
+
+class ResponseCacheStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def reset(self):
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            total = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'hit_ratio': self.hits / total if total else 0.0}
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+def get_cache() -> BaseCache:
+    return caches[getattr(settings, 'ISSUE_TRACKER_RESPONSE_CACHE', DEFAULT_CACHE_ALIAS)]
+
+
+def _digest(value: str) -> str:
+    # Project names and URLs may contain characters that memcached doesn't accept in keys
+    return hashlib.md5(value.encode()).hexdigest()
+
+
+def _version_key(project_id: str) -> str:
+    return f'issue_tracker:project-version:{_digest(project_id)}'
+
+
+def get_project_version(project_id: str) -> int:
+    cache = get_cache()
+    key = _version_key(project_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock rather than from 1, so responses cached under the versions of an evicted counter
+        # can't be picked up again
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_project_version(project_id: str) -> int:
+    cache = get_cache()
+    key = _version_key(project_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_project_version(project_id: str):
+    """
+    Makes every cached response of the project unreachable.
+
+    The version is bumped once right away and once more after the surrounding transaction commits: a response
+    built from the old data between those two moments is cached under a version nobody asks for afterwards.
+    """
+    _bump(project_id)
+    transaction.on_commit(lambda: _bump(project_id))
+
+
+def _bump(project_id: str):
+    cache = get_cache()
+    key = _version_key(project_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def cached_response(request: Request, project_id: str, build: Callable[[], Response]) -> Response:
+    """
+    Returns the cached data of a ``200 OK`` response to the same URL, or builds and caches a new one.
+
+    Check permissions before calling this, the cache is shared between all users with access to the project.
+    """
+    cache = get_cache()
+    key = _response_key(request, project_id, get_project_version(project_id))
+    response = _cached(cache.get(key))
+    if response is None:
+        response = build()
+        if response.status_code == HTTP_200_OK:
+            cache.set(key, response.data, _get_timeout())
+    return response
+
+
+async def acached_response(request: Request, project_id: str, build: Callable[[], Awaitable[Response]]) -> Response:
+    """``cached_response()`` for async views, shares its entries."""
+    cache = get_cache()
+    key = _response_key(request, project_id, await aget_project_version(project_id))
+    response = _cached(await cache.aget(key))
+    if response is None:
+        response = await build()
+        if response.status_code == HTTP_200_OK:
+            await cache.aset(key, response.data, _get_timeout())
+    return response
+
+
+def _cached(data) -> Response | None:
+    response_cache_stats.record(hit=data is not None)
+    return None if data is None else Response(data, status=HTTP_200_OK)
+
+
+def _response_key(request: Request, project_id: str, version: int) -> str:
+    return f'issue_tracker:response:{_digest(project_id)}:{version}:{_digest(request.get_full_path())}'
+
+
+def _get_timeout() -> int:
+    return getattr(settings, 'ISSUE_TRACKER_RESPONSE_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT)
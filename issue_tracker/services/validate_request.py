@@ -1,11 +1,13 @@
-﻿from dataclasses import dataclass
+﻿from collections.abc import Mapping
+from dataclasses import dataclass
 from django.contrib.auth.models import User
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.status import *
 
-from issue_tracker.models import ProjectPermission, ProjectMembership, IssueStatus, IssuePriority
+from issue_tracker.models import Issue, ProjectPermission, IssueStatus, IssuePriority
 from issue_tracker.services.issue_validator import validate_in_enum
+from issue_tracker.services.permissions import ahas_project_permission, has_project_permission
 
 
 @dataclass
@@ -17,28 +19,34 @@ class IssueInfo:
 
     @classmethod
     def parse_from_request(cls, request):
-        title = request.data.get('title')
+        return cls.parse(request.data)
+
+    @classmethod
+    def parse(cls, data):
+        if not isinstance(data, Mapping):
+            return None, Response(data={'error': 'Issue must be an object'}, status=HTTP_400_BAD_REQUEST)
+
+        title = data.get('title')
         if not title or not isinstance(title, str):
             return None, Response(data={'error': 'Title is required'}, status=HTTP_400_BAD_REQUEST)
+        if len(title) > Issue._meta.get_field('title').max_length:
+            return None, Response(data={'error': 'Title is too long'}, status=HTTP_400_BAD_REQUEST)
 
-        description = request.data.get('description', 'No description provided.')
+        description = data.get('description', 'No description provided.')
         if not isinstance(description, str):
             return None, Response(data={'error': 'Description must be a string'}, status=HTTP_400_BAD_REQUEST)
+        if len(description) > Issue._meta.get_field('description').max_length:
+            return None, Response(data={'error': 'Description is too long'}, status=HTTP_400_BAD_REQUEST)
 
-        is_valid, status = validate_in_enum(request.data.get('status'), IssueStatus)
+        is_valid, status = validate_in_enum(data.get('status'), IssueStatus)
         if not is_valid:
             return None, Response(data={'error': 'Invalid issue status'}, status=HTTP_400_BAD_REQUEST)
 
-        is_valid, priority = validate_in_enum(request.data.get('priority'), IssuePriority)
+        is_valid, priority = validate_in_enum(data.get('priority'), IssuePriority)
         if not is_valid:
             return None, Response(data={'error': 'Invalid issue priority'}, status=HTTP_400_BAD_REQUEST)
 
-        cls.title = title
-        cls.description = description
-        cls.status = status
-        cls.priority = priority
-
-        return cls, None
+        return cls(title=title, description=description, status=status, priority=priority), None
 
 
 class RequestValidator:
@@ -47,7 +55,16 @@ class RequestValidator:
         if type(request.user) is not User:
             return Response(status=HTTP_403_FORBIDDEN)
 
-        membership = ProjectMembership.objects.filter(user=request.user, project=project_id).first()
-        if membership is None or not membership.role & target_permissions:
+        if not has_project_permission(request.user, project_id, target_permissions, request.auth):
+            return Response(status=HTTP_403_FORBIDDEN)
+        return None
+
+    @staticmethod
+    async def avalidate_request_permissions(request: Request, project_id: str,
+                                            target_permissions: ProjectPermission) -> Response | None:
+        if type(request.user) is not User:
+            return Response(status=HTTP_403_FORBIDDEN)
+
+        if not await ahas_project_permission(request.user, project_id, target_permissions, request.auth):
             return Response(status=HTTP_403_FORBIDDEN)
         return None
@@ -0,0 +1,104 @@
+from django.db.backends.signals import connection_created
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from auth_api.tokens import mark_roles_changed
+from issue_tracker.metrics import time_query
+from issue_tracker.models import Assignment, Issue, Project, ProjectMembership
+from issue_tracker.services.conditional_requests import issues_changed
+from issue_tracker.services.issue_stats import count_issues
+from issue_tracker.services.permissions import permission_cache
+from issue_tracker.services.response_cache import bump_project_version
+from issue_tracker.slow_queries import log_slow_query
+
+
+def deleting_project(origin) -> bool:
+    """
+    Whether the rows are deleted along with their project, ``origin`` being the ``origin`` of the delete signals.
+
+    ``forget_project_roles`` then forgets everything cached about the project once, and its counters are deleted too,
+    so the receivers of the issues, assignments and memberships that the cascade deletes one by one skip their work.
+    """
+    return isinstance(origin, Project) or isinstance(origin, QuerySet) and origin.model is Project
+
+
+@receiver([post_save, post_delete], sender=ProjectMembership)
+def forget_membership_role(sender, instance: ProjectMembership, origin=None, **kwargs):
+    permission_cache.invalidate(instance.user_id, instance.project_id)
+    mark_roles_changed(instance.user_id)
+    if not deleting_project(origin):
+        bump_project_version(instance.project_id)
+
+
+@receiver([post_save, post_delete], sender=Project)
+def forget_project_roles(sender, instance: Project, **kwargs):
+    # A project created under the name of a deleted one must not inherit its cached roles
+    permission_cache.invalidate_project(instance.pk)
+    bump_project_version(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Issue)
+def forget_issue_responses(sender, instance: Issue, origin=None, **kwargs):
+    if deleting_project(origin):
+        return
+    issues_changed(instance.project_id)
+    bump_project_version(instance.project_id)
+
+
+COUNTED_FIELDS = ('status', 'priority')
+
+
+@receiver(pre_save, sender=Issue)
+def remember_counted_issue(sender, instance: Issue, update_fields=None, **kwargs):
+    instance._counted_as = None
+    if instance._state.adding or (update_fields is not None and not update_fields.intersection(COUNTED_FIELDS)):
+        return
+    # The instance may have been loaded long ago, the counters have to be moved from the status and priority in the row
+    instance._counted_as = Issue.objects.select_for_update().filter(pk=instance.pk) \
+        .values_list(*COUNTED_FIELDS).first()
+
+
+@receiver(post_save, sender=Issue)
+def count_saved_issue(sender, instance: Issue, created: bool, update_fields=None, **kwargs):
+    counted_as = instance._counted_as
+    if created:
+        count_issues(instance.project_id, {(instance.status, instance.priority): 1})
+    elif counted_as is not None:
+        saved_as = tuple(getattr(instance, field) if update_fields is None or field in update_fields else value
+                         for field, value in zip(COUNTED_FIELDS, counted_as))
+        if saved_as != counted_as:
+            count_issues(instance.project_id, {saved_as: 1, counted_as: -1})
+
+
+@receiver(post_delete, sender=Issue)
+def count_deleted_issue(sender, instance: Issue, origin=None, **kwargs):
+    if deleting_project(origin):
+        return
+    count_issues(instance.project_id, {(instance.status, instance.priority): -1})
+
+
+@receiver([post_save, post_delete], sender=Assignment)
+def forget_assignment_responses(sender, instance: Assignment, origin=None, **kwargs):
+    if deleting_project(origin):
+        return
+    # Listings filtered by assignee change too, so their ETag has to
+    Issue.objects.filter(pk=instance.issue_id).update(updated_at=timezone.now())
+    if Assignment.issue.is_cached(instance):
+        project_id = instance.issue.project_id
+    else:
+        # Only the project is needed, not the whole issue
+        project_id = Issue.objects.filter(pk=instance.issue_id).values_list('project_id', flat=True).first()
+    if project_id is not None:
+        issues_changed(project_id)
+        bump_project_version(project_id)
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    # Wrappers outlive the connection they were added to, which is created again after every close. Inserted first,
+    # as the connection may be opened inside an execute_wrapper() block, which removes the last wrapper on exit
+    for wrapper in (log_slow_query, time_query):
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.insert(0, wrapper)
@@ -0,0 +1,114 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from issue_tracker.metrics import current_timer
+from issue_tracker.models import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+# Statements EXPLAIN accepts
+EXPLAINABLE = ('select', 'insert', 'update', 'delete', 'with')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_LISTS = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+_SPACE = re.compile(r'\s+')
+
+# Set while a slow query is being recorded, so that the queries doing it aren't timed themselves
+_recording = threading.local()
+
+
+def normalize_sql(sql: str) -> str:
+    """``sql`` without literal values, and with the same text for any number of ``IN`` values or inserted rows."""
+    sql = _NUMBER.sub('?', _STRING.sub('?', sql)).replace('%s', '?')
+    sql = _LISTS.sub('(...)', _LIST.sub('(...)', sql))
+    return _SPACE.sub(' ', sql).strip()
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()
+
+
+def current_view() -> tuple[str, str]:
+    """Route and view of the request running the current query, empty outside of requests."""
+    timer = current_timer.get()
+    match = timer.request.resolver_match if timer is not None and timer.request is not None else None
+    if match is None:
+        return '', ''
+    view = getattr(match.func, 'view_class', match.func)
+    return match.route, f'{view.__module__}.{view.__name__}'
+
+
+def explain(connection, sql: str, params) -> str:
+    """
+    Plan of a query, from ``EXPLAIN ANALYZE`` on PostgreSQL and ``EXPLAIN`` elsewhere.
+
+    ``EXPLAIN ANALYZE`` runs the query, so writes are only explained, not analyzed.
+    """
+    verb = sql.lstrip()[:6].lower()
+    if params is None or not verb.startswith(EXPLAINABLE):
+        return ''
+    options = {'analyze': True} if connection.vendor == 'postgresql' and verb == 'select' else {}
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix(**options)} {sql}', params)
+            return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+    except DatabaseError as e:
+        return f'EXPLAIN failed: {e}'
+
+
+def record_slow_query(connection, sql: str, params, duration_ms: float):
+    """
+    Logs a slow query and counts it in ``SlowQuery``, capturing its plan if its shape wasn't seen slow before.
+
+    Runs in the transaction of the query, a failure is only logged.
+    """
+    route, view = current_view()
+    logger.warning('Slow query (%.1f ms) in %s [%s]: %s', duration_ms, view or '-', route or '-', sql)
+    normalized = normalize_sql(sql)
+    key = fingerprint(normalized)
+    now = timezone.now()
+    _recording.active = True
+    try:
+        with transaction.atomic(using=connection.alias):
+            queryset = SlowQuery.objects.using(connection.alias).filter(fingerprint=key)
+
+            def count():
+                return queryset.update(count=F('count') + 1, total_ms=F('total_ms') + duration_ms,
+                                       max_ms=Greatest('max_ms', Value(duration_ms)), last_seen=now)
+
+            if not count():
+                # Inserted empty and counted by the same update, whether this insert or one of another process won
+                SlowQuery.objects.using(connection.alias).bulk_create([SlowQuery(
+                    fingerprint=key, sql=normalized, route=route, view=view, plan=explain(connection, sql, params),
+                    count=0, total_ms=0, max_ms=0, last_seen=now,
+                )], ignore_conflicts=True)
+                count()
+    except DatabaseError:
+        logger.exception('Could not record a slow query')
+    finally:
+        _recording.active = False
+
+
+def log_slow_query(execute, sql, params, many, context):
+    """Execute wrapper recording queries slower than ``ISSUE_TRACKER_SLOW_QUERY_MS``, installed on every connection."""
+    threshold = getattr(settings, 'ISSUE_TRACKER_SLOW_QUERY_MS', None)
+    if threshold is None or getattr(_recording, 'active', False):
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms >= threshold:
+        # Queries run with many parameter sets can't be explained as one
+        record_slow_query(context['connection'], sql, None if many else params, duration_ms)
+    return result
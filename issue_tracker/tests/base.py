@@ -3,6 +3,9 @@ from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
 
 from issue_tracker.models import Project, ProjectMembership, ProjectPermission
+from issue_tracker.services.permissions import permission_cache
+from issue_tracker.services.response_cache import get_cache, response_cache_stats
+from issue_tracker.throttling import token_buckets
 
 
 class BaseAPITestCase(APITestCase):
@@ -31,4 +34,9 @@ class BaseAPITestCase(APITestCase):
         )
 
     def setUp(self):
+        # Rolling back the previous test's changes doesn't send any signals, so cached roles and responses may be stale
+        permission_cache.clear()
+        get_cache().clear()
+        response_cache_stats.reset()
+        token_buckets.clear()
         self.client.force_authenticate(self.user)
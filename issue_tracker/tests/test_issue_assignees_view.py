@@ -0,0 +1,109 @@
+﻿from django.urls import reverse
+
+from issue_tracker.models import *
+from issue_tracker.tests.base import BaseAPITestCase
+
+
+class TestIssueAssigneesViewAPI(BaseAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.issue = Issue.objects.create(issue_id=1, title='it doesn`t work', project=cls.project, reporter=cls.user)
+        ProjectMembership.objects.create(user=cls.user1, project=cls.project, role=ProjectPermission.Read)
+
+        cls.url = reverse('issue assignees view', kwargs={'project_id': cls.project.name, 'issue_id': 1})
+
+    def testListAssignees(self):
+        Assignment.objects.create(issue=self.issue, user=self.user1)
+        Assignment.objects.create(issue=self.issue, user=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], ['Test user', 'Test user 1'])
+
+    def testAssign(self):
+        response = self.client.post(self.url, {'username': self.user1.username}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Assignment.objects.filter(issue=self.issue, user=self.user1).exists())
+
+    def testAssignTwice(self):
+        self.client.post(self.url, {'username': self.user1.username}, format='json')
+
+        response = self.client.post(self.url, {'username': self.user1.username}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Assignment.objects.filter(issue=self.issue).count(), 1)
+
+    def testAssignChangesETag(self):
+        issue_url = reverse('issue view', kwargs={'project_id': self.project.name, 'issue_id': 1})
+        etag = self.client.get(issue_url).headers['ETag']
+
+        self.client.post(self.url, {'username': self.user1.username}, format='json')
+
+        self.assertEqual(self.client.get(issue_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def testAssignNonMember(self):
+        outsider = User.objects.create_user(username='Outsider')
+
+        response = self.client.post(self.url, {'username': outsider.username}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Assignment.objects.exists())
+
+    def testAssignMemberWithoutRead(self):
+        ProjectMembership.objects.filter(user=self.user1).update(role=0)
+
+        response = self.client.post(self.url, {'username': self.user1.username}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+
+    def testAssignInvalidUsername(self):
+        for data in ({}, {'username': ''}, {'username': 1}, ['username'], 'username'):
+            with self.subTest(data=data):
+                response = self.client.post(self.url, data, format='json')
+
+                self.assertEqual(response.status_code, 400)
+
+    def testUnassign(self):
+        Assignment.objects.create(issue=self.issue, user=self.user1)
+
+        response = self.client.delete(self.url, {'username': self.user1.username}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Assignment.objects.exists())
+
+    def testUnassignNotAssigned(self):
+        response = self.client.delete(self.url, {'username': self.user1.username}, format='json')
+
+        self.assertEqual(response.status_code, 404)
+
+    def testUnassignInvalidUsername(self):
+        for data in ({}, [self.user1.username]):
+            with self.subTest(data=data):
+                response = self.client.delete(self.url, data, format='json')
+
+                self.assertEqual(response.status_code, 400)
+
+    def testNonexistentIssue(self):
+        url = reverse('issue assignees view', kwargs={'project_id': self.project.name, 'issue_id': 9999})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 404)
+
+    def testAssignReadOnly(self):
+        self.client.force_authenticate(self.user1)
+
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        response = self.client.post(self.url, {'username': self.user1.username}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+
+    def testAnonymous(self):
+        self.client.force_authenticate(None)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,41 @@
+import itertools
+import re
+
+from django.db import connection
+from django.test import TestCase
+
+from issue_tracker.models import Issue
+from issue_tracker.services.issue_filters import IssueFilter, ORDERINGS, RANK_ORDERING
+from issue_tracker.services.pagination import KeysetPaginator
+
+# Table accesses without an index, e.g. `SCAN issues` on SQLite or `Seq Scan on issues` on PostgreSQL
+FULL_SCANS = {
+    'sqlite': re.compile(r'\bSCAN (issues|assignments|auth_user)\b(?!.*\bINDEX\b)'),
+    'postgresql': re.compile(r'Seq Scan on (issues|assignments|auth_user)\b'),
+}
+
+
+class TestIssueFilterQueryPlans(TestCase):
+    def setUp(self):
+        if connection.vendor not in FULL_SCANS:
+            self.skipTest(f'No query plan checks for {connection.vendor}')
+        if connection.vendor == 'postgresql':
+            # The test tables are tiny, so the planner would happily scan them if it was allowed to
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def test_every_filter_combination_uses_an_index(self):
+        orderings = [*ORDERINGS.values(), RANK_ORDERING]
+        combinations = itertools.product((None, 0), (None, 1), (None, 'reporter'), (None, 'assignee'), orderings)
+        for status, priority, reporter, assignee, ordering in combinations:
+            search = 'crash' if ordering == RANK_ORDERING else None
+            issue_filter = IssueFilter(status, priority, reporter, assignee, search, ordering)
+            paginator = KeysetPaginator(issue_filter.ordering)
+            queryset = issue_filter.apply(Issue.objects.filter(project='project'))
+
+            for seek in (None, [1] * len(issue_filter.ordering)):
+                with self.subTest(filter=issue_filter, seek=seek):
+                    page_query = queryset if seek is None else queryset.filter(paginator._seek(seek, False))
+                    plan = page_query.order_by(*issue_filter.ordering)[:50].explain()
+
+                    self.assertIsNone(FULL_SCANS[connection.vendor].search(plan), plan)
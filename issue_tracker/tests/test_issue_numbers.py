@@ -0,0 +1,91 @@
+import threading
+
+from django.contrib.auth.models import User
+from django.db import connection, connections, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from issue_tracker.models import Issue, Project, ProjectMembership, ProjectPermission
+from issue_tracker.services.issue_numbers import reserve_issue_ids
+
+
+class TestReserveIssueIds(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = Project.objects.create(name='Test Project')
+
+    def test_reserves_consecutive_blocks(self):
+        with transaction.atomic():
+            self.assertEqual(reserve_issue_ids(self.project.name), range(1, 2))
+            self.assertEqual(reserve_issue_ids(self.project.name, 10), range(2, 12))
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.last_issue_id, 11)
+
+    def test_rolled_back_numbers_are_reused(self):
+        try:
+            with transaction.atomic():
+                reserve_issue_ids(self.project.name, 5)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        with transaction.atomic():
+            self.assertEqual(reserve_issue_ids(self.project.name), range(1, 2))
+
+    def test_nonexistent_project(self):
+        with transaction.atomic(), self.assertRaises(Project.DoesNotExist):
+            reserve_issue_ids('nonexistent-project')
+
+
+class TestReserveIssueIdsOutsideTransaction(SimpleTestCase):
+    def test_requires_transaction(self):
+        with self.assertRaises(transaction.TransactionManagementError):
+            reserve_issue_ids('Test Project')
+
+
+@override_settings(ISSUE_TRACKER_ISSUE_CREATION_RATES={})
+class TestConcurrentIssueCreation(TransactionTestCase):
+    THREADS = 8
+    ISSUES_PER_THREAD = 250
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            # Threads would share one in-memory connection and therefore one transaction
+            self.skipTest('Needs a test database that accepts concurrent connections')
+
+        self.project = Project.objects.create(name='Hot project')
+        self.users = [User.objects.create_user(username=f'user {n}') for n in range(self.THREADS)]
+        ProjectMembership.objects.bulk_create([
+            ProjectMembership(user=user, project=self.project, role=ProjectPermission.Read | ProjectPermission.Write)
+            for user in self.users
+        ])
+
+    def test_issue_numbers_are_dense_and_unique(self):
+        url = reverse('create issue', kwargs={'project_id': self.project.name})
+        barrier = threading.Barrier(self.THREADS)
+        statuses = []
+
+        def create_issues(user):
+            client = APIClient()
+            client.force_authenticate(user)
+            barrier.wait()
+            try:
+                for n in range(self.ISSUES_PER_THREAD):
+                    statuses.append(client.post(url, {'title': f'{user.username} #{n}'}, format='json').status_code)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=create_issues, args=(user,)) for user in self.users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = self.THREADS * self.ISSUES_PER_THREAD
+        self.assertEqual(statuses, [201] * total)
+        issue_ids = sorted(Issue.objects.filter(project=self.project).values_list('issue_id', flat=True))
+        self.assertEqual(issue_ids, list(range(1, total + 1)))
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.last_issue_id, total)
@@ -0,0 +1,120 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command, CommandError
+from django.db import transaction
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from issue_tracker.models import Issue, IssueCount, Project
+from issue_tracker.services.issue_stats import (
+    count_issues, find_issue_count_drift, live_issue_counts, rebuild_issue_counts, stored_issue_counts,
+)
+
+
+class TestIssueCounters(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='Test user')
+        cls.project = Project.objects.create(name='Test Project')
+
+    def create_issue(self, issue_id: int, status: int = 0, priority: int = 0) -> Issue:
+        return Issue.objects.create(issue_id=issue_id, title=f'Issue {issue_id}', project=self.project,
+                                    reporter=self.user, status=status, priority=priority)
+
+    def assertCountersConsistent(self):
+        self.assertEqual(find_issue_count_drift(), [])
+
+    def test_create_update_delete(self):
+        issue = self.create_issue(1)
+        self.create_issue(2, status=2)
+        self.assertEqual(stored_issue_counts(), {('Test Project', 0, 0): 1, ('Test Project', 2, 0): 1})
+
+        issue.status, issue.priority = 2, 1
+        issue.save()
+        self.assertEqual(stored_issue_counts(), {('Test Project', 2, 1): 1, ('Test Project', 2, 0): 1})
+
+        issue.delete()
+        self.assertEqual(stored_issue_counts(), {('Test Project', 2, 0): 1})
+        self.assertCountersConsistent()
+
+    def test_stale_instance_moves_the_counted_status(self):
+        issue = self.create_issue(1)
+        Issue.objects.filter(pk=issue.pk).update(status=1)
+        count_issues(self.project.name, {(0, 0): -1, (1, 0): 1})
+
+        issue.priority = 2
+        issue.save()
+
+        self.assertCountersConsistent()
+
+    def test_counters_are_locked_in_key_order(self):
+        self.create_issue(1, status=2)
+        self.create_issue(2)
+
+        with CaptureQueriesContext(connection) as queries:
+            count_issues(self.project.name, {(2, 0): -1, (0, 0): 1})
+
+        self.assertIn('"status" = 0', queries[0]['sql'])
+        self.assertIn('"status" = 2', queries[1]['sql'])
+
+    def test_update_fields(self):
+        issue = self.create_issue(1)
+        issue.status = 2
+
+        # The update and the project's issues version
+        with self.assertNumQueries(2):
+            issue.save(update_fields=['title'])
+        issue.save(update_fields=['status'])
+
+        self.assertCountersConsistent()
+        self.assertEqual(stored_issue_counts(), {('Test Project', 2, 0): 1})
+
+    def test_rolled_back_save_leaves_counters_alone(self):
+        try:
+            with transaction.atomic():
+                self.create_issue(1)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        self.assertEqual(stored_issue_counts(), {})
+
+    def test_project_deletion(self):
+        self.create_issue(1)
+
+        self.project.delete()
+
+        self.assertFalse(IssueCount.objects.exists())
+
+    def test_drift_and_rebuild(self):
+        self.create_issue(1)
+        self.create_issue(2)
+        IssueCount.objects.update(count=5)
+
+        self.assertEqual(find_issue_count_drift(), [(('Test Project', 0, 0), 5, 2)])
+
+        rebuild_issue_counts(self.project.name)
+        self.assertCountersConsistent()
+        self.assertEqual(live_issue_counts(), {('Test Project', 0, 0): 2})
+
+    def test_command_check(self):
+        self.create_issue(1)
+        out = io.StringIO()
+
+        call_command('rebuild_issue_counts', '--check', stdout=out)
+        self.assertIn('consistent', out.getvalue())
+
+        IssueCount.objects.all().delete()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_issue_counts', '--check', stdout=out)
+        self.assertIn('counted 0, actual 1', out.getvalue())
+
+    def test_command_rebuild(self):
+        self.create_issue(1)
+        IssueCount.objects.all().delete()
+
+        call_command('rebuild_issue_counts', stdout=io.StringIO())
+
+        self.assertCountersConsistent()
@@ -24,6 +24,18 @@ class TestIssueViewAPI(BaseAPITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertDictEqual(response.data, IssueSerializer(self.issue).data)
 
+    def testGetIssueSparseFields(self):
+        response = self.client.get(self.url, {'fields': ' status, issue_id ,,'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data.items()), [('issue_id', 1), ('status', 0)])
+
+    def testGetIssueInvalidFields(self):
+        response = self.client.get(self.url, {'fields': 'issue_id,pk'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Invalid fields: pk')
+
     def testGetNonexistentIssue(self):
         url = reverse('issue view', kwargs={'project_id': self.project.name, 'issue_id': 9999})
         response = self.client.get(url, {}, format='json')
@@ -44,3 +56,45 @@ class TestIssueViewAPI(BaseAPITestCase):
         response = self.client.get(self.url, {}, format='json')
 
         self.assertEqual(response.status_code, 403)
+
+    def testGetIssueValidators(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response.headers)
+
+    def testGetIssueNotModified(self):
+        etag = self.client.get(self.url).headers['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def testGetIssueNotModifiedSince(self):
+        last_modified = self.client.get(self.url).headers['Last-Modified']
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def testGetModifiedIssue(self):
+        etag = self.client.get(self.url).headers['ETag']
+
+        self.issue.title = 'it works now'
+        self.issue.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], 'it works now')
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def testGetNonexistentIssueConditionally(self):
+        url = reverse('issue view', kwargs={'project_id': self.project.name, 'issue_id': 9999})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response.headers)
@@ -0,0 +1,56 @@
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from issue_tracker.management.commands.loadtest import api_endpoints, endpoint_label, SCENARIOS
+from issue_tracker.models import Issue, Project
+
+
+class TestLoadTestScenarios(SimpleTestCase):
+    def test_every_route_has_a_scenario(self):
+        self.assertEqual(set(api_endpoints()), set(SCENARIOS))
+
+    def test_unknown_routes_are_refused(self):
+        with self.assertRaises(CommandError):
+            call_command('loadtest', 'no such route', stdout=io.StringIO())
+
+    def test_confirmation_is_required(self):
+        with self.assertRaisesMessage(CommandError, 'pass --yes'):
+            call_command('loadtest', stdout=io.StringIO())
+
+
+# Hashing on the request thread with a fast hasher keeps the logins cheap
+@override_settings(AUTH_API_HASHING_WORKERS=0, PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class TestLoadTest(TransactionTestCase):
+    def test_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'report.json')
+            out = io.StringIO()
+
+            # One client at a time, SQLite may refuse concurrent writes
+            call_command('loadtest', users=4, projects=2, members=2, issues=3, requests=2, concurrency=1,
+                         output=path, yes=True, stdout=out)
+            with open(path) as file:
+                report = json.load(file)
+
+            call_command('loadtest', 'ping', users=1, projects=1, members=1, issues=1, requests=1, output=path,
+                         baseline=path, yes=True, stdout=out)
+
+        self.assertEqual(list(report['routes']), [endpoint_label(endpoint) for endpoint in api_endpoints()])
+        for route, result in report['routes'].items():
+            self.assertEqual(result['failed'], 0, (route, result))
+            self.assertEqual(result['requests'], 2)
+        self.assertGreater(report['routes']['GET issue view']['queries_per_request'], 0)
+        self.assertEqual(report['environment']['database'], connection.vendor)
+        self.assertEqual(report['parameters']['issues'], 3)
+        self.assertIn('(was ', out.getvalue())
+
+        self.assertFalse(Project.objects.exists())
+        self.assertFalse(Issue.objects.exists())
+        self.assertFalse(User.objects.exists())
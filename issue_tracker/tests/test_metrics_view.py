@@ -0,0 +1,145 @@
+﻿from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from auth_api.authentication import user_cache
+from issue_tracker.metrics import RequestMetrics, RequestTimer, request_metrics, time_query
+from issue_tracker.models import *
+from issue_tracker.signals import install_query_timer
+from issue_tracker.slow_queries import log_slow_query
+from issue_tracker.tests.base import BaseAPITestCase
+from issue_tracker.urls import get_api_urlconf
+
+ISSUES_ROUTE = 'route="api/projects/<str:project_id>/issues/",method="GET"'
+
+
+@override_settings(ISSUE_TRACKER_SERVER_TIMING=True, ISSUE_TRACKER_METRICS_TOKEN='metrics-token')
+class TestMetricsViewAPI(BaseAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Issue.objects.create(issue_id=1, title='Slow page', project=cls.project, reporter=cls.user)
+        cls.url = reverse('project issues view', kwargs={'project_id': cls.project.name})
+
+    def setUp(self):
+        super().setUp()
+        request_metrics.clear()
+        user_cache.clear()
+        # Authenticate through the token, as real clients do, so that authentication is timed too
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def scrape(self, method='get'):
+        # A client of its own, the API client sends the JWT of the user instead of the metrics token
+        return getattr(Client(), method)(reverse('metrics'), headers={'Authorization': 'Bearer metrics-token'})
+
+    def testServerTiming(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        for phase in ('auth;dur=', 'permissions;dur=', 'serialize;dur=', 'total;dur='):
+            self.assertIn(phase, timing)
+        # The user, the role, the ETag and the page
+        self.assertIn('db;dur=', timing)
+        self.assertIn(';desc="4 queries"', timing)
+
+    @override_settings(ISSUE_TRACKER_SERVER_TIMING=False)
+    def testServerTimingDisabled(self):
+        response = self.client.get(self.url)
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertIn(f'issue_tracker_request_duration_seconds_count{{{ISSUES_ROUTE}}} 1',
+                      self.scrape().content.decode())
+
+    def testMetrics(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.client.get('/no/such/page/')
+
+        response = self.scrape()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        metrics = response.content.decode()
+        self.assertIn('# TYPE issue_tracker_request_duration_seconds histogram', metrics)
+        self.assertIn(f'issue_tracker_request_duration_seconds_bucket{{{ISSUES_ROUTE},le="+Inf"}} 2', metrics)
+        self.assertIn(f'issue_tracker_request_duration_seconds_count{{{ISSUES_ROUTE}}} 2', metrics)
+        self.assertIn(f'issue_tracker_request_phase_seconds_count{{{ISSUES_ROUTE},phase="auth"}} 2', metrics)
+        # The second request is answered from the response cache, after a single query
+        self.assertIn(f'issue_tracker_request_phase_seconds_count{{{ISSUES_ROUTE},phase="serialize"}} 1', metrics)
+        self.assertIn(f'issue_tracker_request_queries_bucket{{{ISSUES_ROUTE},le="1"}} 1', metrics)
+        self.assertIn(f'issue_tracker_request_queries_bucket{{{ISSUES_ROUTE},le="5"}} 2', metrics)
+        self.assertIn(f'issue_tracker_request_queries_sum{{{ISSUES_ROUTE}}} 5', metrics)
+        self.assertIn('issue_tracker_request_duration_seconds_count{route="unmatched",method="GET"} 1', metrics)
+
+    def testMetricsReadOnly(self):
+        response = self.scrape('post')
+
+        self.assertEqual(response.status_code, 405)
+
+    def testMetricsRequireTokenOrStaff(self):
+        self.assertEqual(Client().get(reverse('metrics')).status_code, 403)
+        self.assertEqual(Client().get(reverse('metrics'), headers={'Authorization': 'Bearer wrong'}).status_code, 403)
+        # The JWT of a user who is not staff
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        with override_settings(ISSUE_TRACKER_METRICS_TOKEN=None):
+            self.assertEqual(Client().get(reverse('metrics'), headers={'Authorization': 'Bearer '}).status_code, 403)
+
+    def testMetricsForStaff(self):
+        client = Client()
+        client.force_login(User.objects.create_user(username='Staff user', is_staff=True))
+
+        self.assertEqual(client.get(reverse('metrics')).status_code, 200)
+
+    @override_settings(ISSUE_TRACKER_SERVER_TIMING=None)
+    def testServerTimingDefaultsToDebug(self):
+        del settings.ISSUE_TRACKER_SERVER_TIMING
+        self.assertNotIn('Server-Timing', self.client.get(self.url))
+        with override_settings(DEBUG=True):
+            self.assertIn('Server-Timing', self.client.get(self.url))
+
+    @override_settings(ROOT_URLCONF=get_api_urlconf(True))
+    async def testAsyncViews(self):
+        token = await sync_to_async(AccessToken.for_user)(self.user)
+
+        response = await self.async_client.get(self.url, headers={'Authorization': f'Bearer {token}'})
+
+        self.assertEqual(response.status_code, 200)
+        # Queries run in threads of sync_to_async, which see the timer of the request
+        self.assertIn(';desc="4 queries"', response['Server-Timing'])
+        self.assertIn('auth;dur=', response['Server-Timing'])
+
+
+class TestRequestMetrics(SimpleTestCase):
+    def testRender(self):
+        metrics = RequestMetrics()
+        timer = RequestTimer()
+        timer.queries = 2
+        metrics.record('a "quoted"\\route', 'GET', timer, 0.003)
+        metrics.record('a "quoted"\\route', 'GET', timer, 20)
+
+        rendered = metrics.render()
+
+        labels = 'route="a \\"quoted\\"\\\\route",method="GET"'
+        self.assertIn(f'issue_tracker_request_duration_seconds_bucket{{{labels},le="0.0025"}} 0', rendered)
+        self.assertIn(f'issue_tracker_request_duration_seconds_bucket{{{labels},le="0.005"}} 1', rendered)
+        self.assertIn(f'issue_tracker_request_duration_seconds_bucket{{{labels},le="10"}} 1', rendered)
+        self.assertIn(f'issue_tracker_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', rendered)
+        self.assertIn(f'issue_tracker_request_duration_seconds_sum{{{labels}}} 20.003', rendered)
+        self.assertIn(f'issue_tracker_request_queries_bucket{{{labels},le="2"}} 2', rendered)
+
+    def testQueryTimerInstalledInsideExecuteWrapper(self):
+        wrappers = connection.execute_wrappers[:]
+        connection.execute_wrappers[:] = []
+        try:
+            # A connection opened inside the block gets the timer, the block must still remove its own wrapper
+            with connection.execute_wrapper(lambda execute, *args: execute(*args)):
+                install_query_timer(sender=None, connection=connection)
+            self.assertEqual(connection.execute_wrappers, [time_query, log_slow_query])
+        finally:
+            connection.execute_wrappers[:] = wrappers
@@ -0,0 +1,87 @@
+﻿from django.db import connection
+from django.urls import reverse
+
+from issue_tracker.models import *
+from issue_tracker.tests.base import BaseAPITestCase
+from issue_tracker.tests.test_issue_filters import FULL_SCANS
+
+
+class TestMyIssuesViewAPI(BaseAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_project = Project.objects.create(name='Other Project')
+        ProjectMembership.objects.create(user=cls.user, project=cls.other_project, role=ProjectPermission.Read)
+
+        for project in (cls.project, cls.other_project):
+            for n in range(1, 4):
+                issue = Issue.objects.create(issue_id=n, title=f'Issue {n}', project=project, reporter=cls.user1)
+                if n != 2:
+                    Assignment.objects.create(issue=issue, user=cls.user)
+                Assignment.objects.create(issue=issue, user=cls.user1)
+
+        cls.url = reverse('my issues')
+
+    def keys(self, response) -> list[tuple[str, int]]:
+        return [(issue['project'], issue['issue_id']) for issue in response.data['data']]
+
+    def testListAcrossProjects(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.keys(response), [('Other Project', 1), ('Other Project', 3),
+                                               ('Test Project', 1), ('Test Project', 3)])
+
+    def testSkipsUnreadableProjects(self):
+        ProjectMembership.objects.filter(user=self.user, project=self.other_project).update(role=0)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(self.keys(response), [('Test Project', 1), ('Test Project', 3)])
+
+    def testPagination(self):
+        first = self.client.get(self.url, {'limit': 3})
+        second = self.client.get(self.url, {'limit': 3, 'cursor': first.data['next']})
+
+        self.assertEqual(len(first.data['data']), 3)
+        self.assertEqual(self.keys(second), [('Test Project', 3)])
+        self.assertIsNone(second.data['next'])
+
+    def testSparseFields(self):
+        first = self.client.get(self.url, {'fields': 'title', 'limit': 3})
+        second = self.client.get(self.url, {'fields': 'title', 'limit': 3, 'cursor': first.data['next']})
+
+        self.assertEqual(first.data['data'], [{'title': 'Issue 1'}, {'title': 'Issue 3'}, {'title': 'Issue 1'}])
+        self.assertEqual(second.data['data'], [{'title': 'Issue 3'}])
+
+    def testInvalidFields(self):
+        response = self.client.get(self.url, {'fields': 'everything'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Invalid fields: everything')
+
+    def testInvalidCursor(self):
+        response = self.client.get(self.url, {'cursor': 'garbage'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def testAnonymous(self):
+        self.client.force_authenticate(None)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
+
+    def testQueryPlanUsesIndexes(self):
+        if connection.vendor not in FULL_SCANS:
+            self.skipTest(f'No query plan checks for {connection.vendor}')
+
+        queryset = Issue.objects.filter(
+            pk__in=Assignment.objects.filter(user=self.user).values('issue'),
+            project__in=ProjectMembership.objects.with_permission(ProjectPermission.Read)
+            .filter(user=self.user).values('project'),
+        ).order_by('project_id', 'issue_id')[:50]
+
+        plan = queryset.explain()
+        self.assertIsNone(FULL_SCANS[connection.vendor].search(plan), plan)
@@ -0,0 +1,95 @@
+from django.test import override_settings
+from django.urls import reverse
+
+from issue_tracker.models import Issue, Project, ProjectMembership, ProjectPermission
+from issue_tracker.services.permissions import PermissionCache, permission_cache, get_project_role
+from issue_tracker.tests.base import BaseAPITestCase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPermissionCache(BaseAPITestCase):
+    @override_settings(ISSUE_TRACKER_PERMISSION_CACHE_SIZE=2)
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = PermissionCache()
+        cache.set(1, 'a', 1)
+        cache.set(2, 'a', 2)
+        cache.get(1, 'a')
+        cache.set(3, 'a', 3)
+
+        self.assertEqual(cache.get(1, 'a'), 1)
+        self.assertIsNone(cache.get(2, 'a'))
+        self.assertEqual(cache.get(3, 'a'), 3)
+        self.assertEqual(cache.stats(), {'hits': 3, 'misses': 1, 'size': 2})
+
+    @override_settings(ISSUE_TRACKER_PERMISSION_CACHE_TTL=10)
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = PermissionCache(clock)
+        cache.set(1, 'a', 7)
+
+        clock.now = 9.9
+        self.assertEqual(cache.get(1, 'a'), 7)
+        clock.now = 10
+        self.assertIsNone(cache.get(1, 'a'))
+
+    def test_invalidate_project(self):
+        cache = PermissionCache()
+        cache.set(1, 'a', 1)
+        cache.set(2, 'a', 1)
+        cache.set(1, 'b', 1)
+
+        cache.invalidate_project('a')
+
+        self.assertEqual(cache.stats()['size'], 1)
+        self.assertEqual(cache.get(1, 'b'), 1)
+
+    def test_role_is_cached(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(get_project_role(self.user, self.project.name), ProjectPermission(7))
+            self.assertEqual(get_project_role(self.user, self.project.name), ProjectPermission(7))
+            self.assertEqual(get_project_role(self.user1, 'nonexistent'), ProjectPermission.Null)
+            self.assertEqual(get_project_role(self.user1, 'nonexistent'), ProjectPermission.Null)
+
+        self.assertEqual(permission_cache.stats(), {'hits': 2, 'misses': 2, 'size': 2})
+
+    def test_membership_changes_invalidate(self):
+        get_project_role(self.user, self.project.name)
+        self.membership.role = ProjectPermission.Read
+        self.membership.save()
+        self.assertEqual(get_project_role(self.user, self.project.name), ProjectPermission.Read)
+
+        self.membership.delete()
+        self.assertEqual(get_project_role(self.user, self.project.name), ProjectPermission.Null)
+
+        ProjectMembership.objects.create(user=self.user, project=self.project, role=ProjectPermission.Write)
+        self.assertEqual(get_project_role(self.user, self.project.name), ProjectPermission.Write)
+
+    def test_recreated_project_does_not_inherit_roles(self):
+        get_project_role(self.user, self.project.name)
+        get_project_role(self.user1, self.project.name)
+        self.project.delete()
+        self.assertEqual(get_project_role(self.user, self.project.name), ProjectPermission.Null)
+
+        project = Project.objects.create(name=self.project.name)
+        ProjectMembership.objects.create(user=self.user1, project=project, role=ProjectPermission.Read)
+
+        self.assertEqual(get_project_role(self.user, project.name), ProjectPermission.Null)
+        self.assertEqual(get_project_role(self.user1, project.name), ProjectPermission.Read)
+
+    def test_issue_read_skips_membership_query(self):
+        for issue_id in (1, 2):
+            Issue.objects.create(issue_id=issue_id, title='Cached', project=self.project, reporter=self.user)
+        self.client.get(reverse('issue view', kwargs={'project_id': self.project.name, 'issue_id': 1}))
+
+        # The ETag lookup and the issue itself
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('issue view', kwargs={'project_id': self.project.name, 'issue_id': 2}))
+
+        self.assertEqual(response.status_code, 200)
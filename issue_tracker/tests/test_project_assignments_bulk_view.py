@@ -0,0 +1,127 @@
+﻿from django.test import override_settings
+from django.urls import reverse
+
+from issue_tracker.models import *
+from issue_tracker.tests.base import BaseAPITestCase
+
+
+class TestBulkAssignViewAPI(BaseAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.issues = [
+            Issue.objects.create(issue_id=n, title=f'Issue {n}', project=cls.project, reporter=cls.user)
+            for n in range(1, 4)
+        ]
+        ProjectMembership.objects.create(user=cls.user1, project=cls.project, role=ProjectPermission.Read)
+
+        cls.url = reverse('bulk assign', kwargs={'project_id': cls.project.name})
+
+    def change(self, issue_id: int, username: str, action: str = 'assign') -> dict:
+        return {'issue_id': issue_id, 'username': username, 'action': action}
+
+    def testBulkAssign(self):
+        changes = [self.change(n, username) for n in range(1, 4) for username in ('Test user', 'Test user 1')]
+
+        # Permission, issues, users, the insert, issues' updated_at, the project's issues version, and a savepoint
+        with self.assertNumQueries(8):
+            response = self.client.post(self.url, changes, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], [{'status': 200}] * 6)
+        self.assertEqual(Assignment.objects.count(), 6)
+
+    def testBulkAssignExisting(self):
+        Assignment.objects.create(issue=self.issues[0], user=self.user1)
+
+        response = self.client.post(self.url, [self.change(1, 'Test user 1')], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Assignment.objects.count(), 1)
+
+    def testBulkUnassign(self):
+        Assignment.objects.create(issue=self.issues[0], user=self.user1)
+        Assignment.objects.create(issue=self.issues[1], user=self.user1)
+        Assignment.objects.create(issue=self.issues[0], user=self.user)
+
+        changes = [self.change(1, 'Test user 1', 'unassign'), self.change(2, 'Test user', 'unassign')]
+        # Permission, issues, users, the assignments, one delete, issues' updated_at, the project's issues version,
+        # and a savepoint
+        with self.assertNumQueries(9):
+            response = self.client.post(self.url, changes, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(Assignment.objects.values_list('issue__issue_id', 'user__username'),
+                              [(2, 'Test user 1'), (1, 'Test user')])
+
+    def testBulkUnassignFormerMembers(self):
+        Assignment.objects.create(issue=self.issues[0], user=self.user1)
+        ProjectMembership.objects.filter(user=self.user1).delete()
+        changes = [self.change(1, 'Test user 1', 'unassign'), self.change(2, 'Test user 1'),
+                   self.change(1, 'No such user', 'unassign'), self.change(1, None, 'unassign')]
+
+        response = self.client.post(self.url, changes, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['status'] for result in response.data['data']], [200, 400, 404, 404])
+        self.assertFalse(Assignment.objects.exists())
+
+    def testBulkAssignChangesETag(self):
+        list_url = reverse('project issues view', kwargs={'project_id': self.project.name})
+        etag = self.client.get(list_url).headers['ETag']
+
+        self.client.post(self.url, [self.change(1, 'Test user 1')], format='json')
+
+        self.assertEqual(self.client.get(list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def testBulkUnassignChangesETag(self):
+        Assignment.objects.create(issue=self.issues[0], user=self.user1)
+        list_url = reverse('project issues view', kwargs={'project_id': self.project.name})
+        etag = self.client.get(list_url).headers['ETag']
+        issue_url = reverse('issue view', kwargs={'project_id': self.project.name, 'issue_id': 1})
+        issue_etag = self.client.get(issue_url).headers['ETag']
+
+        self.client.post(self.url, [self.change(1, 'Test user 1', 'unassign')], format='json')
+
+        self.assertEqual(self.client.get(list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(self.client.get(issue_url, HTTP_IF_NONE_MATCH=issue_etag).status_code, 200)
+
+    def testPartialFailure(self):
+        outsider = User.objects.create_user(username='Outsider')
+        changes = [
+            self.change(1, 'Test user 1'),
+            'not an object',
+            self.change(1, 'Test user 1', 'reassign'),
+            self.change(9999, 'Test user 1'),
+            self.change('1', 'Test user 1'),
+            self.change(2, outsider.username),
+            self.change(2, None),
+        ]
+
+        response = self.client.post(self.url, changes, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['status'] for result in response.data['data']], [200, 400, 400, 404, 404, 400, 400])
+        self.assertEqual(list(Assignment.objects.values_list('issue__issue_id', 'user__username')),
+                         [(1, 'Test user 1')])
+
+    def testInvalidBody(self):
+        for data in ({}, []):
+            with self.subTest(data=data):
+                response = self.client.post(self.url, data, format='json')
+
+                self.assertEqual(response.status_code, 400)
+
+    @override_settings(ISSUE_TRACKER_BULK_ASSIGN_LIMIT=2)
+    def testTooManyChanges(self):
+        response = self.client.post(self.url, [self.change(1, 'Test user')] * 3, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Assignment.objects.exists())
+
+    def testReadOnly(self):
+        self.client.force_authenticate(self.user1)
+
+        response = self.client.post(self.url, [self.change(1, 'Test user 1')], format='json')
+
+        self.assertEqual(response.status_code, 403)
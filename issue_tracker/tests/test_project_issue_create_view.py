@@ -157,3 +157,9 @@ class TestProjectIssueCreateViewAPI(BaseAPITestCase):
         }
         response = self.client.post(self.url, data, format='json')
         self.assertEqual(response.status_code, 400)
+
+    def test_create_issue_not_an_object(self):
+        response = self.client.post(self.url, [{'title': 'My first issue'}], format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Issue must be an object')
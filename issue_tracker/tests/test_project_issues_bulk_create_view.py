@@ -0,0 +1,107 @@
+﻿from django.test import override_settings
+from django.urls import reverse
+from rest_framework.response import Response
+
+from issue_tracker.models import Issue, IssueStatus, IssuePriority
+from issue_tracker.tests.base import BaseAPITestCase
+
+
+class TestProjectIssuesBulkCreateViewAPI(BaseAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.url = reverse('bulk create issues', kwargs={'project_id': cls.project.name})
+
+    def test_bulk_create_success(self):
+        data = [
+            {'title': 'First Issue'},
+            {'title': 'Second Issue', 'description': 'Details', 'status': 'CLOSED', 'priority': IssuePriority.HIGH.value},
+        ]
+        response: Response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data'], [{'status': 201, 'issue_id': 1}, {'status': 201, 'issue_id': 2}])
+        second = Issue.objects.get(issue_id=2)
+        self.assertEqual(second.title, 'Second Issue')
+        self.assertEqual(second.description, 'Details')
+        self.assertEqual(second.status, IssueStatus.CLOSED.value)
+        self.assertEqual(second.priority, IssuePriority.HIGH.value)
+        self.assertEqual(second.reporter, self.user)
+        self.assertIsNotNone(second.created_at)
+
+    def test_bulk_create_continues_numbering(self):
+        self.client.post(reverse('create issue', kwargs={'project_id': self.project.name}), {'title': 'Single'},
+                         format='json')
+
+        response: Response = self.client.post(self.url, [{'title': 'Bulk'}], format='json')
+
+        self.assertEqual(response.data['data'], [{'status': 201, 'issue_id': 2}])
+
+    def test_bulk_create_partial_failure(self):
+        data = [
+            {'title': 'Valid'},
+            {'description': 'No title'},
+            {'title': 'Bad status', 'status': 'SOMEDAY'},
+            'not an issue',
+            {'title': 'Also valid'},
+        ]
+        response: Response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['data'], [
+            {'status': 201, 'issue_id': 1},
+            {'status': 400, 'error': 'Title is required'},
+            {'status': 400, 'error': 'Invalid issue status'},
+            {'status': 400, 'error': 'Issue must be an object'},
+            {'status': 201, 'issue_id': 2},
+        ])
+        self.assertEqual(Issue.objects.filter(project=self.project).count(), 2)
+
+    def test_bulk_create_invalid_values(self):
+        data = [
+            {'title': 'Unparsable status', 'status': [1]},
+            {'title': 'x' * 256},
+            {'title': 'Long description', 'description': 'x' * 1024},
+            {'title': 'Longest title and description', 'description': 'x' * 1023},
+        ]
+        response: Response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['data'], [
+            {'status': 400, 'error': 'Invalid issue status'},
+            {'status': 400, 'error': 'Title is too long'},
+            {'status': 400, 'error': 'Description is too long'},
+            {'status': 201, 'issue_id': 1},
+        ])
+
+    def test_bulk_create_all_invalid(self):
+        response: Response = self.client.post(self.url, [{}], format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertFalse(Issue.objects.exists())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.last_issue_id, 0)
+
+    def test_bulk_create_not_a_list(self):
+        for data in ({'title': 'Test Issue'}, []):
+            response: Response = self.client.post(self.url, data, format='json')
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data['error'], 'Provide a list of issues')
+
+    @override_settings(ISSUE_TRACKER_BULK_CREATE_LIMIT=2)
+    def test_bulk_create_too_many(self):
+        response: Response = self.client.post(self.url, [{'title': 'Test Issue'}] * 3, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Too many issues, the limit is 2')
+        self.assertFalse(Issue.objects.exists())
+
+    def test_bulk_create_insufficient_privileges(self):
+        self.client.force_authenticate(self.user1)
+
+        response: Response = self.client.post(self.url, [{'title': 'Test Issue'}], format='json')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Issue.objects.exists())
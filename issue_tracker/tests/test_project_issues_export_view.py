@@ -0,0 +1,78 @@
+﻿import csv
+import io
+import json
+
+from django.test import override_settings
+from django.urls import reverse
+
+from issue_tracker.models import Issue, IssueSerializer, IssueStatus
+from issue_tracker.tests.base import BaseAPITestCase
+
+
+class TestProjectIssuesExportViewAPI(BaseAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Issue.objects.bulk_create([
+            Issue(issue_id=n, title=f'Issue №{n}', description='Multi\nline, "quoted"', project=cls.project,
+                  reporter=cls.user, status=IssueStatus.CLOSED.value if n % 2 else IssueStatus.OPEN.value)
+            for n in range(1, 8)
+        ])
+
+        cls.url = reverse('export issues', kwargs={'project_id': cls.project.name})
+
+    def export(self, query=None) -> bytes:
+        response = self.client.get(self.url, query or {})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    @override_settings(ISSUE_TRACKER_EXPORT_CHUNK_SIZE=3)
+    def test_export_ndjson(self):
+        lines = self.export().decode().splitlines()
+
+        expected = IssueSerializer(Issue.objects.order_by('issue_id'), many=True).data
+        self.assertEqual([json.loads(line) for line in lines], expected)
+
+    def test_export_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export({'output': 'csv'}).decode())))
+
+        expected = IssueSerializer(Issue.objects.order_by('issue_id'), many=True).data
+        self.assertEqual(len(rows), len(expected))
+        for row, issue in zip(rows, expected):
+            self.assertEqual(row, {field: str(value) for field, value in issue.items()})
+
+    def test_export_filtered(self):
+        lines = self.export({'status': 'OPEN', 'ordering': '-issue_id'}).decode().splitlines()
+
+        self.assertEqual([json.loads(line)['issue_id'] for line in lines], [6, 4, 2])
+
+    def test_export_empty(self):
+        self.assertEqual(self.export({'status': 'NOT_PLANNED'}), b'')
+        self.assertEqual(self.export({'status': 'NOT_PLANNED', 'output': 'csv'}).decode().splitlines(),
+                         [','.join(IssueSerializer.Meta.fields)])
+
+    def test_export_is_lazy(self):
+        response = self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            b''.join(response.streaming_content)
+
+    def test_export_invalid_format(self):
+        response = self.client.get(self.url, {'output': 'xlsx'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Invalid export format')
+
+    def test_export_invalid_filter(self):
+        response = self.client.get(self.url, {'status': 'SOMEDAY'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_no_access(self):
+        self.client.force_authenticate(self.user1)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
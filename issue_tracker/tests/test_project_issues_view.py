@@ -1,6 +1,12 @@
-﻿from django.urls import reverse
+﻿from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
 from issue_tracker.models import *
+from issue_tracker.services.pagination import encode_cursor, FORWARD
 from issue_tracker.tests.base import BaseAPITestCase
 
 
@@ -36,3 +42,323 @@ class TestProjectIssuesViewAPI(BaseAPITestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, 403)
+
+    def test_get_project_issues_envelope(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['next'])
+        self.assertIsNone(response.data['prev'])
+
+    def test_get_project_issues_pages(self):
+        Issue.objects.bulk_create([
+            Issue(issue_id=n, title=f'issue {n}', project=self.project, reporter=self.user) for n in range(2, 6)
+        ])
+
+        first = self.client.get(self.url, {'limit': 2})
+        self.assertEqual([issue['issue_id'] for issue in first.data['data']], [1, 2])
+        self.assertIsNone(first.data['prev'])
+
+        second = self.client.get(self.url, {'limit': 2, 'cursor': first.data['next']})
+        self.assertEqual([issue['issue_id'] for issue in second.data['data']], [3, 4])
+
+        last = self.client.get(self.url, {'limit': 2, 'cursor': second.data['next']})
+        self.assertEqual([issue['issue_id'] for issue in last.data['data']], [5])
+        self.assertIsNone(last.data['next'])
+
+        back = self.client.get(self.url, {'limit': 2, 'cursor': last.data['prev']})
+        self.assertEqual([issue['issue_id'] for issue in back.data['data']], [3, 4])
+        self.assertIsNotNone(back.data['prev'])
+
+        start = self.client.get(self.url, {'limit': 2, 'cursor': back.data['prev']})
+        self.assertEqual([issue['issue_id'] for issue in start.data['data']], [1, 2])
+        self.assertIsNone(start.data['prev'])
+        self.assertEqual(start.data['next'], first.data['next'])
+
+    def test_get_project_issues_past_the_end(self):
+        response = self.client.get(self.url, {'cursor': encode_cursor(FORWARD, ('issue_id',), [1])})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], [])
+        self.assertIsNone(response.data['next'])
+
+    @override_settings(ISSUE_TRACKER_MAX_PAGE_SIZE=3)
+    def test_get_project_issues_page_size_is_capped(self):
+        Issue.objects.bulk_create([
+            Issue(issue_id=n, title=f'issue {n}', project=self.project, reporter=self.user) for n in range(2, 6)
+        ])
+
+        response = self.client.get(self.url, {'limit': 100})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']), 3)
+
+    def test_get_project_issues_invalid_page_size(self):
+        for limit in ('0', 'ten'):
+            response = self.client.get(self.url, {'limit': limit})
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data['error'], 'Invalid page size')
+
+    def test_get_project_issues_invalid_cursor(self):
+        cursors = (
+            'garbage',
+            encode_cursor(FORWARD, ('-issue_id',), [1]),
+            encode_cursor(FORWARD, ('issue_id',), [True]),
+            encode_cursor(FORWARD, ('issue_id',), ['abc']),
+            encode_cursor('x', ('issue_id',), [1]),
+        )
+        for cursor in cursors:
+            response = self.client.get(self.url, {'cursor': cursor})
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data['error'], 'Invalid cursor')
+
+    def test_get_project_issues_cursor_of_the_wrong_type(self):
+        queries = (
+            {'ordering': 'status', 'cursor': encode_cursor(FORWARD, ('status', 'issue_id'), ['OPEN', 1])},
+            {'ordering': 'status', 'cursor': encode_cursor(FORWARD, ('status', 'issue_id'), [0, '1.5'])},
+            {'q': 'first', 'cursor': encode_cursor(FORWARD, ('-search_rank', 'issue_id'), ['high', 1])},
+        )
+        for query in queries:
+            with self.subTest(query=query):
+                response = self.client.get(self.url, query)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data['error'], 'Invalid cursor')
+
+        response = self.client.get(self.url, {'ordering': 'status',
+                                              'cursor': encode_cursor(FORWARD, ('status', 'issue_id'), [0, '0'])})
+        self.assertEqual([issue['issue_id'] for issue in response.data['data']], [1])
+
+    def test_get_project_issues_filtered(self):
+        Issue.objects.bulk_create([
+            Issue(issue_id=2, title='closed', project=self.project, reporter=self.user1, status=IssueStatus.CLOSED.value),
+            Issue(issue_id=3, title='urgent', project=self.project, reporter=self.user, priority=IssuePriority.HIGH.value),
+        ])
+        Assignment.objects.create(user=self.user1, issue=Issue.objects.get(issue_id=3))
+
+        filters = (
+            ({'status': 'CLOSED'}, [2]),
+            ({'status': IssueStatus.OPEN.value}, [1, 3]),
+            ({'priority': 'HIGH'}, [3]),
+            ({'reporter': self.user1.username}, [2]),
+            ({'assignee': self.user1.username}, [3]),
+            ({'status': 'OPEN', 'priority': 'LOW'}, [1]),
+            ({'reporter': 'nobody'}, []),
+        )
+        for query, issue_ids in filters:
+            with self.subTest(query=query):
+                response = self.client.get(self.url, query)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([issue['issue_id'] for issue in response.data['data']], issue_ids)
+
+    def test_get_project_issues_ordered(self):
+        Issue.objects.bulk_create([
+            Issue(issue_id=2, title='low', project=self.project, reporter=self.user, priority=IssuePriority.LOW.value),
+            Issue(issue_id=3, title='high', project=self.project, reporter=self.user, priority=IssuePriority.HIGH.value),
+            Issue(issue_id=4, title='medium', project=self.project, reporter=self.user, priority=IssuePriority.MEDIUM.value),
+        ])
+
+        response = self.client.get(self.url, {'ordering': '-priority', 'limit': 2})
+        self.assertEqual([issue['issue_id'] for issue in response.data['data']], [3, 4])
+
+        response = self.client.get(self.url, {'ordering': '-priority', 'limit': 2, 'cursor': response.data['next']})
+        self.assertEqual([issue['issue_id'] for issue in response.data['data']], [2, 1])
+
+        response = self.client.get(self.url, {'ordering': '-issue_id'})
+        self.assertEqual([issue['issue_id'] for issue in response.data['data']], [4, 3, 2, 1])
+
+    def test_get_project_issues_cursor_of_another_ordering(self):
+        Issue.objects.create(issue_id=2, title='second', project=self.project, reporter=self.user)
+        cursor = self.client.get(self.url, {'limit': 1}).data['next']
+
+        response = self.client.get(self.url, {'ordering': 'status', 'cursor': cursor})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Invalid cursor')
+
+    def test_get_project_issues_invalid_filters(self):
+        queries = (
+            ({'status': 'SOMEDAY'}, 'Invalid issue status'),
+            ({'priority': '42'}, 'Invalid issue priority'),
+            ({'ordering': 'title'}, 'Invalid ordering'),
+            ({'fields': 'title,secret,assignees'}, 'Invalid fields: secret, assignees'),
+        )
+        for query, error in queries:
+            with self.subTest(query=query):
+                response = self.client.get(self.url, query)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data['error'], error)
+
+    def test_get_project_issues_sparse_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'title,issue_id,status'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], [{'issue_id': 1, 'title': 'it doesn`t work', 'status': 0}])
+        self.assertTrue(any('"title"' in query['sql'] for query in queries))
+        self.assertFalse(any('"description"' in query['sql'] for query in queries))
+
+    def test_get_project_issues_sparse_fields_pages(self):
+        Issue.objects.bulk_create([
+            Issue(issue_id=n, title=f'Issue {n}', project=self.project, reporter=self.user, priority=n % 3)
+            for n in range(2, 6)
+        ])
+
+        # The keys of the ordering are fetched for the cursors, but not serialized
+        query = {'fields': 'title', 'ordering': '-priority', 'limit': 3}
+        first = self.client.get(self.url, query)
+        second = self.client.get(self.url, {**query, 'cursor': first.data['next']})
+
+        self.assertEqual(first.data['data'], [{'title': 'Issue 5'}, {'title': 'Issue 2'}, {'title': 'Issue 4'}])
+        self.assertEqual(second.data['data'], [{'title': 'Issue 3'}, {'title': 'it doesn`t work'}])
+
+    def test_search_project_issues(self):
+        Issue.objects.bulk_create([
+            Issue(issue_id=2, title='Login crashes', description='Crash after submitting the login form',
+                  project=self.project, reporter=self.user),
+            Issue(issue_id=3, title='Typo on the login page', project=self.project, reporter=self.user),
+            Issue(issue_id=4, title='Logout crashes', project=self.project, reporter=self.user,
+                  status=IssueStatus.CLOSED.value),
+        ])
+
+        response = self.client.get(self.url, {'q': 'login crash'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([issue['issue_id'] for issue in response.data['data']], [2])
+
+        response = self.client.get(self.url, {'q': 'crash'})
+        self.assertEqual([issue['issue_id'] for issue in response.data['data']], [2, 4])
+
+        response = self.client.get(self.url, {'q': 'crash', 'status': 'OPEN'})
+        self.assertEqual([issue['issue_id'] for issue in response.data['data']], [2])
+
+        response = self.client.get(self.url, {'q': 'crash', 'ordering': '-issue_id'})
+        self.assertEqual([issue['issue_id'] for issue in response.data['data']], [4, 2])
+
+    def test_search_project_issues_pages(self):
+        Issue.objects.bulk_create([
+            Issue(issue_id=n, title='crash ' * (7 - n), project=self.project, reporter=self.user) for n in range(2, 7)
+        ])
+
+        seen = []
+        cursor = None
+        while True:
+            response = self.client.get(self.url, {'q': 'crash', 'limit': 2, **({'cursor': cursor} if cursor else {})})
+            seen += [issue['issue_id'] for issue in response.data['data']]
+            cursor = response.data['next']
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, [2, 3, 4, 5, 6])
+
+    def test_search_follows_issue_changes(self):
+        self.issue.title = 'Dark mode is unreadable'
+        self.issue.save()
+
+        response = self.client.get(self.url, {'q': 'unreadable'})
+        self.assertEqual([issue['issue_id'] for issue in response.data['data']], [1])
+
+        response = self.client.get(self.url, {'q': 'work'})
+        self.assertEqual(response.data['data'], [])
+
+        self.issue.delete()
+        response = self.client.get(self.url, {'q': 'unreadable'})
+        self.assertEqual(response.data['data'], [])
+
+    def test_search_project_issues_without_full_text_search(self):
+        Issue.objects.bulk_create([
+            Issue(issue_id=2, title='Login crashes', project=self.project, reporter=self.user),
+            Issue(issue_id=3, title='Typo', description='On the LOGIN page', project=self.project, reporter=self.user),
+        ])
+
+        with mock.patch.object(connection, 'vendor', 'oracle'):
+            response = self.client.get(self.url, {'q': 'login'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([issue['issue_id'] for issue in response.data['data']], [2, 3])
+
+            response = self.client.get(self.url, {'q': 'login crash'})
+            self.assertEqual([issue['issue_id'] for issue in response.data['data']], [2])
+
+    def test_search_project_issues_without_words(self):
+        response = self.client.get(self.url, {'q': '"*'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], [])
+
+    def test_get_project_issues_not_modified(self):
+        etag = self.client.get(self.url).headers['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], etag)
+        self.assertIn('Last-Modified', response.headers)
+
+    def test_get_project_issues_not_modified_since(self):
+        last_modified = self.client.get(self.url).headers['Last-Modified']
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_project_issues_etag_follows_changes(self):
+        etags = [self.client.get(self.url).headers['ETag']]
+
+        Issue.objects.create(issue_id=2, title='Second', project=self.project, reporter=self.user)
+        etags.append(self.client.get(self.url, HTTP_IF_NONE_MATCH=etags[-1]).headers['ETag'])
+
+        self.issue.status = IssueStatus.CLOSED.value
+        self.issue.save()
+        etags.append(self.client.get(self.url, HTTP_IF_NONE_MATCH=etags[-1]).headers['ETag'])
+
+        self.issue.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etags[-1])
+        etags.append(response.headers['ETag'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(set(etags)), 4)
+
+    def test_get_project_issues_etag_follows_assignments(self):
+        etag = self.client.get(self.url, {'assignee': self.user1.username}).headers['ETag']
+
+        Assignment.objects.create(user=self.user1, issue=self.issue)
+        response = self.client.get(self.url, {'assignee': self.user1.username}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']), 1)
+
+    def test_get_empty_project_issues_conditionally(self):
+        etag = self.client.get(self.url).headers['ETag']
+        Issue.objects.all().delete()
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        etag = self.client.get(self.url).headers['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_project_issues_validators_cost_one_query(self):
+        Issue.objects.bulk_create(Issue(issue_id=n, title=f'Issue {n}', project=self.project, reporter=self.user)
+                                  for n in range(2, 50))
+        etag = self.client.get(self.url).headers['ETag']
+
+        # The project's issues version, no aggregate over its issues. The permission is cached by the first request
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_new_project_issues_conditionally(self):
+        project = Project.objects.create(name='Empty project')
+        ProjectMembership.objects.create(user=self.user, project=project, role=ProjectPermission.Read)
+        url = reverse('project issues view', kwargs={'project_id': project.name})
+        etag = self.client.get(url).headers['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn('Last-Modified', response.headers)
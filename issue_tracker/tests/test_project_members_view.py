@@ -118,4 +118,15 @@ class TestProjectMembersViewAPI(BaseAPITestCase):
 
         self.assertEqual(response.status_code, 400)
 
+    def testListMembersQueryCount(self):
+        users = User.objects.bulk_create([User(username=f'member {n}') for n in range(20)])
+        ProjectMembership.objects.bulk_create([
+            ProjectMembership(user=user, project=self.project, role=1) for user in users
+        ])
 
+        with self.assertNumQueries(2):
+            response: Response = self.client.get(self.url, {})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']), 21)
+        self.assertIn({'username': 'member 0', 'roles': 'Read'}, response.data['data'])
@@ -0,0 +1,47 @@
+﻿from django.urls import reverse
+
+from issue_tracker.models import *
+from issue_tracker.services.issue_stats import find_issue_count_drift
+from issue_tracker.tests.base import BaseAPITestCase
+
+
+class TestProjectStatsViewAPI(BaseAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('project stats view', kwargs={'project_id': cls.project.name})
+        cls.create_url = reverse('create issue', kwargs={'project_id': cls.project.name})
+        cls.bulk_url = reverse('bulk create issues', kwargs={'project_id': cls.project.name})
+
+    def testEmptyProject(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 0)
+        self.assertEqual(response.data['status'], {'OPEN': 0, 'NOT_PLANNED': 0, 'CLOSED': 0})
+        self.assertEqual(response.data['priority'], {'LOW': 0, 'MEDIUM': 0, 'HIGH': 0})
+
+    def testCountsCreatedIssues(self):
+        self.client.post(self.create_url, {'title': 'Crash', 'status': 0, 'priority': 2}, format='json')
+        self.client.post(self.bulk_url, [
+            {'title': 'Typo', 'status': 2, 'priority': 0},
+            {'title': 'Slow', 'status': 0, 'priority': 2},
+            {'title': ''},
+        ], format='json')
+
+        # The role is cached by the requests above, only the counters are read
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['total'], 3)
+        self.assertEqual(response.data['status'], {'OPEN': 2, 'NOT_PLANNED': 0, 'CLOSED': 1})
+        self.assertEqual(response.data['priority'], {'LOW': 1, 'MEDIUM': 0, 'HIGH': 2})
+        self.assertEqual(response.data['status_priority']['OPEN']['HIGH'], 2)
+        self.assertEqual(find_issue_count_drift(), [])
+
+    def testReadPermission(self):
+        self.client.force_authenticate(self.user1)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
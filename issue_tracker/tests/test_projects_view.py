@@ -1,7 +1,13 @@
-﻿from django.urls import reverse
+﻿from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from rest_framework.response import Response
 
-from issue_tracker.models import Project, ProjectMembership, ProjectPermission, ProjectSerializer
+from issue_tracker.models import (Assignment, Issue, IssueCount, Project, ProjectMembership, ProjectPermission,
+                                  ProjectSerializer)
 from issue_tracker.tests.base import BaseAPITestCase
 
 
@@ -19,6 +25,18 @@ class TestProjectsViewAPI(BaseAPITestCase):
         self.assertEqual(response.status_code, 200, 'Server returned different status code.')
         self.assertDictEqual(response.data['data'][0], ProjectSerializer(self.project).data)
 
+    def testGetProjectsSparseFields(self):
+        response: Response = self.client.get(self.url, {'fields': 'name'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], [{'name': self.project.name}])
+
+    def testGetProjectsInvalidFields(self):
+        response: Response = self.client.get(self.url, {'fields': 'name,members'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Invalid fields: members')
+
     def testGetProjectsInsufficientPermissions(self):
         new_project = Project.objects.create( name='new project' )
         ProjectMembership.objects.create(user=self.user, project=new_project, role=0) # He doesn't have any permissions in this project
@@ -76,6 +94,45 @@ class TestProjectsViewAPI(BaseAPITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(Project.objects.all().count(), 0)
 
+    def testDeleteProjectQueryCount(self):
+        def delete_project(name: str, issues: int) -> int:
+            project = Project.objects.create(name=name)
+            ProjectMembership.objects.create(user=self.user, project=project, role=ProjectPermission.Manage)
+            for n in range(issues):
+                ProjectMembership.objects.create(user=User.objects.create(username=f'{name} member {n}'),
+                                                 project=project, role=ProjectPermission.Read)
+            for issue_id in range(1, issues + 1):
+                issue = Issue.objects.create(issue_id=issue_id, title='Issue', project=project, reporter=self.user,
+                                             status=issue_id % 3)
+                Assignment.objects.create(issue=issue, user=self.user)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.delete(self.url, {'name': name}, format='json')
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        self.assertEqual(delete_project('Small project', 10), delete_project('Large project', 200))
+        self.assertFalse(Issue.objects.filter(project__in=['Small project', 'Large project']).exists())
+        self.assertFalse(IssueCount.objects.filter(project__in=['Small project', 'Large project']).exists())
+        self.assertFalse(ProjectMembership.objects.filter(project__in=['Small project', 'Large project']).exists())
+
+    def testDeleteProjectDistrustsRoleClaims(self):
+        with mock.patch('issue_tracker.services.bulk_delete.mark_roles_changed') as mark_roles_changed:
+            self.client.delete(self.url, {'name': self.project.name}, format='json')
+
+        mark_roles_changed.assert_called_once_with(self.user.pk)
+
+    def testDeleteProjectsInBulk(self):
+        project = Project.objects.create(name='Other project')
+        for issue_id in (1, 2):
+            Issue.objects.create(issue_id=issue_id, title='Issue', project=project, reporter=self.user)
+
+        # The receivers of the issues deleted along with the projects have nothing to do
+        with self.assertNumQueries(8):
+            Project.objects.filter(name__in=[self.project.name, project.name]).delete()
+
+        self.assertFalse(Issue.objects.exists())
+        self.assertFalse(IssueCount.objects.exists())
+
     def testDeleteProjectAnonymous(self):
         self.client.force_authenticate(None)
         response: Response = self.client.delete(self.url, {'name': self.project.name}, format='json')
@@ -107,4 +164,13 @@ class TestProjectsViewAPI(BaseAPITestCase):
         self.assertEqual(response.status_code, 403)
         self.assertEqual(Project.objects.all().count(), 2)
 
+    def testGetProjectsQueryCount(self):
+        for n in range(20):
+            project = Project.objects.create(name=f'project {n}')
+            ProjectMembership.objects.create(user=self.user, project=project, role=n % 8)
 
+        with self.assertNumQueries(1):
+            response: Response = self.client.get(self.url, None, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']), 1 + sum(1 for n in range(20) if n % 8 & ProjectPermission.Read))
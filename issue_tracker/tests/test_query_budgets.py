@@ -0,0 +1,103 @@
+import json
+import os
+import random
+from unittest import mock
+
+from django.test import TransactionTestCase, override_settings
+
+from auth_api.authentication import user_cache
+from auth_api.revocation import revocation_store
+from auth_api.tests.base import run_now
+from issue_tracker.management.commands.loadtest import api_endpoints, drive, endpoint_label, HOST, SCENARIOS, seed
+from issue_tracker.services.permissions import permission_cache
+from issue_tracker.services.response_cache import get_cache
+from issue_tracker.throttling import token_buckets
+
+# Issues and members of each seeded project, and users
+SIZES = (10, 1000, 10000)
+REQUESTS_PER_ROUTE = 5
+
+# Most queries one request to each route and method may make, with every cache empty, on the Django release pinned in
+# requirements.txt. Lower them when a route gets cheaper
+QUERY_BUDGETS = {
+    ('projects view', 'GET'): 2,
+    ('projects view', 'POST'): 4,
+    # Whatever the number of issues and members of the project
+    ('projects view', 'DELETE'): 13,
+    ('project members view', 'GET'): 3,
+    ('project members view', 'POST'): 5,
+    ('project issues view', 'GET'): 4,
+    ('project issues view', 'POST'): 4,
+    ('issue view', 'GET'): 4,
+    # Two more when the counter of the new issue's status and priority doesn't exist yet
+    ('create issue', 'POST'): 9,
+    ('bulk create issues', 'POST'): 9,
+    ('export issues', 'GET'): 3,
+    ('project stats view', 'GET'): 3,
+    ('issue assignees view', 'GET'): 4,
+    ('issue assignees view', 'POST'): 10,
+    ('issue assignees view', 'DELETE'): 9,
+    ('bulk assign', 'POST'): 10,
+    ('my issues', 'GET'): 2,
+    ('register', 'POST'): 2,
+    ('ping', 'GET'): 1,
+    ('token_obtain_pair', 'POST'): 1,
+    # Includes building the revocation filter
+    ('token_refresh', 'POST'): 4,
+}
+
+
+def clear_caches():
+    permission_cache.clear()
+    get_cache().clear()
+    user_cache.clear()
+    revocation_store.reset()
+    token_buckets.clear()
+
+
+@override_settings(ALLOWED_HOSTS=[HOST], ISSUE_TRACKER_ISSUE_CREATION_RATES={}, AUTH_API_HASHING_WORKERS=0,
+                   PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+@mock.patch.object(revocation_store, 'run_in_background', run_now)
+class TestQueryBudgets(TransactionTestCase):
+    """
+    Sends the requests of the load test to every route against projects of each of ``SIZES``, and fails when a route
+    makes more queries than its budget or more queries on larger projects than on the smallest one.
+
+    Set ``QUERY_BUDGET_REPORT`` to a file name to get the query counts and SQL time as JSON.
+    """
+
+    def test_query_budgets(self):
+        samples = {endpoint: {} for endpoint in api_endpoints()}
+        for size in SIZES:
+            rng = random.Random(0)
+            data = seed(users=size, projects=2, members=size, issues=size, rng=rng)
+            try:
+                for endpoint in samples:
+                    samples[endpoint][size] = []
+                    for _ in range(REQUESTS_PER_ROUTE):
+                        call = SCENARIOS[endpoint](data, rng)
+                        # Every request takes the slowest path, or the counts would depend on the order of requests
+                        clear_caches()
+                        samples[endpoint][size].extend(drive([call], 1)[1])
+            finally:
+                data.cleanup()
+                clear_caches()
+
+        report = {
+            endpoint: {size: {'queries': max(sample.queries for sample in by_size[size]),
+                           'sql_ms': round(max(sample.sql_seconds for sample in by_size[size]) * 1000, 2)}
+                    for size in SIZES}
+            for endpoint, by_size in samples.items()
+        }
+        if os.environ.get('QUERY_BUDGET_REPORT'):
+            with open(os.environ['QUERY_BUDGET_REPORT'], 'w') as file:
+                json.dump({endpoint_label(endpoint): by_size for endpoint, by_size in report.items()}, file, indent=2)
+
+        for endpoint, by_size in report.items():
+            with self.subTest(endpoint=endpoint_label(endpoint)):
+                statuses = {sample.status for size in SIZES for sample in samples[endpoint][size]}
+                self.assertTrue(all(status < 400 for status in statuses), statuses)
+                queries = {size: by_size[size]['queries'] for size in SIZES}
+                self.assertLessEqual(max(queries.values()), QUERY_BUDGETS[endpoint], queries)
+                for size in SIZES[1:]:
+                    self.assertLessEqual(queries[size], queries[SIZES[0]], f'Grows with the data: {queries}')
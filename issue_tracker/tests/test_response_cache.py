@@ -0,0 +1,114 @@
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from issue_tracker.models import Assignment, Issue, Project
+from issue_tracker.services.response_cache import get_cache, get_project_version, response_cache_stats, \
+    bump_project_version
+from issue_tracker.tests.base import BaseAPITestCase
+
+
+class TestResponseCache(BaseAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.issue = Issue.objects.create(issue_id=1, title='Original', project=cls.project, reporter=cls.user)
+        Project.objects.filter(pk=cls.project.pk).update(last_issue_id=1)
+
+        cls.issue_url = reverse('issue view', kwargs={'project_id': cls.project.name, 'issue_id': 1})
+        cls.issues_url = reverse('project issues view', kwargs={'project_id': cls.project.name})
+
+    def test_repeated_reads_are_served_from_cache(self):
+        for url in (self.issue_url, self.issues_url):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                # Only the ETag lookup
+                with self.assertNumQueries(1):
+                    second = self.client.get(url)
+
+                self.assertEqual(second.status_code, 200)
+                self.assertEqual(second.data, first.data)
+
+        self.assertEqual(response_cache_stats.as_dict(), {'hits': 2, 'misses': 2, 'hit_ratio': 0.5})
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get(self.issues_url)
+
+        response = self.client.get(self.issues_url, {'status': 'CLOSED'})
+
+        self.assertEqual(response.data['data'], [])
+        self.assertEqual(response_cache_stats.as_dict()['hits'], 0)
+
+    def test_issue_changes_are_visible(self):
+        self.client.get(self.issue_url)
+        self.client.get(self.issues_url)
+
+        self.issue.title = 'Changed'
+        self.issue.save()
+
+        self.assertEqual(self.client.get(self.issue_url).data['title'], 'Changed')
+        self.assertEqual(self.client.get(self.issues_url).data['data'][0]['title'], 'Changed')
+
+    def test_new_issues_are_visible(self):
+        self.client.get(self.issues_url)
+
+        self.client.post(reverse('create issue', kwargs={'project_id': self.project.name}), {'title': 'Single'},
+                         format='json')
+        self.assertEqual(len(self.client.get(self.issues_url).data['data']), 2)
+
+        self.client.post(reverse('bulk create issues', kwargs={'project_id': self.project.name}), [{'title': 'Bulk'}],
+                         format='json')
+        self.assertEqual(len(self.client.get(self.issues_url).data['data']), 3)
+
+    def test_assignments_are_visible(self):
+        query = {'assignee': self.user1.username}
+        self.assertEqual(self.client.get(self.issues_url, query).data['data'], [])
+
+        Assignment.objects.create(user=self.user1, issue=self.issue)
+
+        self.assertEqual(len(self.client.get(self.issues_url, query).data['data']), 1)
+
+    def test_assignment_changes_dont_load_the_issue(self):
+        assignment = Assignment.objects.get(pk=Assignment.objects.create(user=self.user1, issue=self.issue).pk)
+        version = get_project_version(self.project.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            assignment.delete()
+
+        self.assertNotEqual(get_project_version(self.project.pk), version)
+        self.assertFalse(any('"title"' in query['sql'] for query in queries), queries.captured_queries)
+
+    def test_permissions_are_checked_before_the_cache(self):
+        self.client.get(self.issue_url)
+        self.client.force_authenticate(self.user1)
+
+        self.assertEqual(self.client.get(self.issue_url).status_code, 403)
+
+    def test_errors_are_not_cached(self):
+        url = reverse('issue view', kwargs={'project_id': self.project.name, 'issue_id': 2})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        Issue.objects.create(issue_id=2, title='Late', project=self.project, reporter=self.user)
+
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_version_is_bumped_again_on_commit(self):
+        version = get_project_version(self.project.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                bump_project_version(self.project.name)
+                self.assertEqual(get_project_version(self.project.name), version + 1)
+
+        self.assertEqual(get_project_version(self.project.name), version + 2)
+
+    def test_evicted_version_does_not_restart(self):
+        version = get_project_version(self.project.name)
+        get_cache().clear()
+
+        self.assertGreater(get_project_version(self.project.name), version)
+
+    def test_bumping_an_unknown_version(self):
+        bump_project_version('Unknown project')
+
+        self.assertIsNotNone(get_project_version('Unknown project'))
@@ -0,0 +1,69 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from issue_tracker.management.commands.bench_serializers import bench_serializers
+from issue_tracker.models import Issue, IssueSerializer, Project, ProjectMembership, ProjectSerializer
+from issue_tracker.services.row_serializers import issue_rows, project_rows
+
+
+class TestRowSerializers(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='Test user')
+        cls.project = Project.objects.create(name='Проект', description='Ünïcode "quoted" \\ description')
+        Project.objects.create(name='Other project')
+        ProjectMembership.objects.create(user=cls.user, project=cls.project, role=7)
+        ProjectMembership.objects.create(user=cls.user, project_id='Other project', role=1)
+        for issue_id in range(1, 4):
+            Issue.objects.create(issue_id=issue_id, title=f'Issue {issue_id} ✓', project=cls.project,
+                                 reporter=cls.user, status=issue_id % 3, priority=2)
+        # Without microseconds, which isoformat() leaves out
+        Issue.objects.filter(issue_id=3).update(created_at=datetime.datetime(2024, 2, 29, 12, tzinfo=datetime.UTC))
+
+    def assertSameJSON(self, expected, actual):
+        self.assertEqual(JSONRenderer().render(expected), JSONRenderer().render(actual))
+
+    def test_issues(self):
+        queryset = Issue.objects.filter(project=self.project).order_by('issue_id')
+        expected = IssueSerializer(list(queryset), many=True).data
+
+        self.assertSameJSON(expected, issue_rows.data(issue_rows.values_list(queryset)))
+
+    def test_issues_in_another_time_zone(self):
+        queryset = Issue.objects.filter(project=self.project).order_by('issue_id')
+        with timezone.override('America/New_York'):
+            expected = IssueSerializer(list(queryset), many=True).data
+            actual = issue_rows.data(issue_rows.values_list(queryset))
+
+        self.assertTrue(expected[0]['created_at'].endswith(('-04:00', '-05:00')))
+        self.assertSameJSON(expected, actual)
+
+    @override_settings(USE_TZ=False)
+    def test_issues_without_time_zones(self):
+        queryset = Issue.objects.filter(project=self.project).order_by('issue_id')
+        expected = IssueSerializer(list(queryset), many=True).data
+
+        self.assertSameJSON(expected, issue_rows.data(issue_rows.values_list(queryset)))
+
+    def test_keys_are_not_serialized(self):
+        queryset = Issue.objects.filter(project=self.project).order_by('issue_id')
+        rows = list(issue_rows.values_list(queryset, keys=['issue_id', 'pk']))
+
+        self.assertEqual(rows[0].pk, Issue.objects.get(project=self.project, issue_id=1).pk)
+        self.assertEqual(list(issue_rows.data(rows)[0]), IssueSerializer.Meta.fields)
+
+    def test_projects_through_memberships(self):
+        memberships = ProjectMembership.objects.filter(user=self.user).order_by('pk')
+        expected = ProjectSerializer([membership.project for membership in memberships], many=True).data
+
+        self.assertSameJSON(expected, project_rows.data(project_rows.values_list(memberships, prefix='project__')))
+
+    def test_bench_serializers(self):
+        timings = bench_serializers(rows=20, repeat=2)
+
+        self.assertEqual(list(timings), ['model serializer', 'row serializer'])
+        self.assertFalse(Issue.objects.filter(title='Issue 20').exists())
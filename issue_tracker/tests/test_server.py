@@ -0,0 +1,57 @@
+import unittest
+from unittest import mock
+
+from django.db import connections
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+try:
+    from myapp import server
+except ImportError:  # gunicorn isn't installed
+    server = None
+
+
+@unittest.skipIf(server is None, 'Needs gunicorn')
+class TestServerOptions(SimpleTestCase):
+    def test_defaults_follow_the_cpus(self):
+        with mock.patch.object(server, 'available_cpus', return_value=4), mock.patch.dict('os.environ', clear=True):
+            options = server.get_options([])
+
+        self.assertEqual(options['workers'], 9)
+        self.assertEqual(options['threads'], server.DEFAULT_THREADS)
+        self.assertEqual(options['bind'], server.DEFAULT_BIND)
+        self.assertTrue(options['preload_app'])
+        self.assertEqual(options['max_requests_jitter'], server.DEFAULT_MAX_REQUESTS // 10)
+
+    def test_environment_and_arguments(self):
+        with mock.patch.dict('os.environ', {'SERVER_WORKERS': '2', 'SERVER_MAX_REQUESTS': '0'}):
+            options = server.get_options(['--threads', '8'])
+
+        self.assertEqual((options['workers'], options['threads'], options['max_requests']), (2, 8, 0))
+
+    def test_several_workers_need_shared_caches(self):
+        with mock.patch.object(server.Server, 'run') as run:
+            with self.assertRaises(SystemExit) as raised:
+                server.main(['--workers', '2'])
+            run.assert_not_called()
+            self.assertIn('default', str(raised.exception))
+
+            server.main(['--workers', '1'])
+            run.assert_called_once()
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+                               'local': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                       ISSUE_TRACKER_THROTTLE_CACHE='local', AUTH_API_ROLE_CLAIMS=True,
+                       AUTH_API_ROLE_CLAIMS_CACHE='local')
+    def test_local_caches(self):
+        self.assertEqual(server.local_caches(), ['local'])
+
+
+
+@unittest.skipIf(server is None, 'Needs gunicorn')
+class TestServerWarmUp(TransactionTestCase):
+    def test_connections_are_closed_before_forking(self):
+        with mock.patch.object(connections, 'close_all') as close_all:
+            application = server.warm_up()
+
+        self.assertTrue(callable(application))
+        close_all.assert_called_once()
@@ -0,0 +1,102 @@
+import io
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from issue_tracker.models import ProjectMembership, SlowQuery
+from issue_tracker.slow_queries import fingerprint, normalize_sql, record_slow_query
+from issue_tracker.tests.base import BaseAPITestCase
+
+
+class TestNormalizeSql(SimpleTestCase):
+    def testLiterals(self):
+        self.assertEqual(normalize_sql("SELECT t1.a FROM t1 WHERE b = 'it''s'  AND c > 2.5\n LIMIT 21"),
+                         'SELECT t1.a FROM t1 WHERE b = ? AND c > ? LIMIT ?')
+
+    def testValueLists(self):
+        self.assertEqual(normalize_sql('SELECT a FROM t WHERE b IN (%s, %s,%s)'),
+                         normalize_sql('SELECT a FROM t WHERE b IN (%s)'))
+        self.assertEqual(normalize_sql('INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)'),
+                         'INSERT INTO t (a, b) VALUES (...)')
+
+
+class TestSlowQueryLog(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('project members view', kwargs={'project_id': self.project.name})
+
+    def getMembers(self):
+        # Every query is slow
+        with self.settings(ISSUE_TRACKER_SLOW_QUERY_MS=0), self.assertLogs('issue_tracker.slow_queries', 'WARNING'):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        return SlowQuery.objects.get(sql__contains='FROM "memberships" INNER JOIN "auth_user"')
+
+    def testRecordsRouteViewAndPlan(self):
+        query = self.getMembers()
+
+        self.assertEqual(query.count, 1)
+        self.assertEqual(query.route, 'api/projects/<str:project_id>/members/')
+        self.assertEqual(query.view, 'issue_tracker.views.project_members_view.project_members_view')
+        self.assertNotIn(self.project.name, query.sql)
+        self.assertIn('memberships', query.plan)
+        self.assertEqual(query.max_ms, query.total_ms)
+
+    def testGroupsByShape(self):
+        first = self.getMembers()
+        SlowQuery.objects.filter(pk=first.pk).update(plan='first plan')
+
+        second = self.getMembers()
+
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(second.count, 2)
+        self.assertGreater(second.total_ms, first.total_ms)
+        self.assertGreaterEqual(second.max_ms, first.max_ms)
+        # Only the first occurrence is explained
+        self.assertEqual(second.plan, 'first plan')
+
+    def testConcurrentFirstOccurrences(self):
+        def explain_while_another_process_inserts(connection, sql, params):
+            SlowQuery.objects.create(fingerprint=fingerprint(normalize_sql(sql)), sql=sql, plan='other plan',
+                                     total_ms=10, max_ms=10, last_seen=timezone.now())
+            return 'plan'
+
+        with mock.patch('issue_tracker.slow_queries.explain', explain_while_another_process_inserts), \
+                self.assertLogs('issue_tracker.slow_queries', 'WARNING'):
+            record_slow_query(connection, 'SELECT 1', (), 30)
+
+        query = SlowQuery.objects.get()
+        self.assertEqual((query.count, query.total_ms, query.max_ms), (2, 40, 30))
+        self.assertEqual(query.plan, 'other plan')
+
+    def testOffByDefault(self):
+        with self.settings(ISSUE_TRACKER_SLOW_QUERY_MS=None):
+            self.client.get(self.url)
+
+        self.assertFalse(SlowQuery.objects.exists())
+
+    def testOutsideRequests(self):
+        with self.settings(ISSUE_TRACKER_SLOW_QUERY_MS=0), self.assertLogs('issue_tracker.slow_queries', 'WARNING'):
+            list(ProjectMembership.objects.filter(role=7))
+
+        query = SlowQuery.objects.get(sql__contains='"memberships"."role" = ?')
+        self.assertEqual((query.route, query.view), ('', ''))
+
+    def testCommand(self):
+        query = self.getMembers()
+        out = io.StringIO()
+
+        call_command('slow_queries', order='count', limit=100, plans=True, stdout=out)
+
+        self.assertIn(query.sql, out.getvalue())
+        self.assertIn('[api/projects/<str:project_id>/members/]', out.getvalue())
+        self.assertIn(f'    {query.plan.splitlines()[0]}', out.getvalue())
+
+        call_command('slow_queries', clear=True, stdout=out)
+        self.assertFalse(SlowQuery.objects.exists())
+        out = io.StringIO()
+        call_command('slow_queries', stdout=out)
+        self.assertIn('No slow queries were logged', out.getvalue())
@@ -0,0 +1,211 @@
+﻿from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from issue_tracker.management.commands.bench_throttle import bench_throttle
+from issue_tracker.models import Issue, ProjectMembership, ProjectPermission
+from issue_tracker.services.rate_limit import Rate, SlidingWindowCounters, TokenBuckets
+from issue_tracker.tests.base import BaseAPITestCase
+from issue_tracker.throttling import token_buckets
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRate(SimpleTestCase):
+    def test_parse(self):
+        self.assertEqual(Rate.parse('5/min'), Rate(5, 60))
+        self.assertEqual(Rate.parse('100/hour'), Rate(100, 3600))
+
+    def test_parse_unknown_period(self):
+        with self.assertRaises(KeyError):
+            Rate.parse('5/fortnight')
+
+
+class TestTokenBuckets(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.buckets = TokenBuckets(clock=self.clock, max_size=2)
+        self.limits = [('user', Rate(5, 60))]
+
+    def test_burst_then_refill(self):
+        for _ in range(5):
+            self.assertEqual(self.buckets.acquire(self.limits), 0)
+        self.assertAlmostEqual(self.buckets.acquire(self.limits), 12)
+
+        self.clock.now += 12
+        self.assertEqual(self.buckets.acquire(self.limits), 0)
+        self.assertGreater(self.buckets.acquire(self.limits), 0)
+
+    def test_empty_bucket_keeps_the_others_full(self):
+        limits = [('user', Rate(5, 60)), ('project', Rate(1, 60))]
+        self.assertEqual(self.buckets.acquire(limits), 0)
+
+        self.assertAlmostEqual(self.buckets.acquire(limits), 60)
+        for _ in range(4):
+            self.assertEqual(self.buckets.acquire(self.limits), 0)
+
+    def test_least_recently_used_buckets_are_dropped(self):
+        for key in ('a', 'b', 'c'):
+            self.buckets.acquire([(key, Rate(1, 60))])
+
+        self.assertEqual(list(self.buckets.buckets), ['b', 'c'])
+        self.assertEqual(self.buckets.acquire([('a', Rate(1, 60))]), 0)
+
+    def test_cost(self):
+        self.assertEqual(self.buckets.acquire(self.limits, cost=4), 0)
+
+        # Nothing is taken when there aren't enough tokens
+        self.assertAlmostEqual(self.buckets.acquire(self.limits, cost=2), 12)
+        self.assertEqual(self.buckets.acquire(self.limits), 0)
+
+    def test_cost_above_the_rate(self):
+        self.assertIsNone(self.buckets.acquire(self.limits, cost=6))
+        self.assertEqual(self.buckets.acquire(self.limits, cost=5), 0)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestSlidingWindowCounters(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.clock = FakeClock(600)
+        self.counters = SlidingWindowCounters(caches['default'], clock=self.clock)
+        self.limits = [('Some project', Rate(2, 60))]
+
+    def test_limit_within_window(self):
+        self.assertEqual(self.counters.acquire(self.limits), 0)
+        self.assertEqual(self.counters.acquire(self.limits), 0)
+
+        self.clock.now += 15
+        self.assertEqual(self.counters.acquire(self.limits), 45)
+
+    def test_previous_window_is_weighted(self):
+        for _ in range(2):
+            self.counters.acquire(self.limits)
+
+        # Half of the previous window still counts, one request left
+        self.clock.now += 90
+        self.assertEqual(self.counters.acquire(self.limits), 0)
+        self.assertEqual(self.counters.acquire(self.limits), 30)
+
+    def test_cost(self):
+        self.assertEqual(self.counters.acquire(self.limits, cost=2), 0)
+
+        self.assertEqual(self.counters.acquire(self.limits), 60)
+
+    def test_expired_counter(self):
+        class ExpiringCache:
+            def add(self, *args, **kwargs):
+                pass
+
+            def incr(self, key, delta=1):
+                raise ValueError(key)
+
+            def set(self, *args, **kwargs):
+                pass
+
+            def get(self, key, default=None):
+                return default
+
+        self.assertEqual(SlidingWindowCounters(ExpiringCache()).acquire(self.limits), 0)
+
+
+class TestIssueCreationThrottle(BaseAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('create issue', kwargs={'project_id': cls.project.name})
+        cls.bulk_url = reverse('bulk create issues', kwargs={'project_id': cls.project.name})
+
+    def create_issue(self, url=None):
+        return self.client.post(url or self.url, {'title': 'Spam'}, format='json')
+
+    def test_user_limit(self):
+        for _ in range(5):
+            self.assertEqual(self.create_issue().status_code, 201)
+
+        response = self.create_issue()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '12')
+
+    def test_bulk_requests_are_counted_apart(self):
+        # Under the default settings, a batch larger than the limit on issues created one at a time
+        response = self.client.post(self.bulk_url, [{'title': 'Spam'}] * 6, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Issue.objects.count(), 6)
+        for _ in range(5):
+            self.assertEqual(self.create_issue().status_code, 201)
+
+    @override_settings(ISSUE_TRACKER_BULK_ISSUE_CREATION_RATES={'user': '5/min'})
+    def test_bulk_requests_count_every_issue(self):
+        self.assertEqual(self.client.post(self.bulk_url, [{'title': 'Spam'}] * 4, format='json').status_code, 201)
+
+        response = self.client.post(self.bulk_url, [{'title': 'Spam'}] * 2, format='json')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '12')
+        self.assertEqual(self.create_issue().status_code, 201)
+
+    @override_settings(ISSUE_TRACKER_BULK_ISSUE_CREATION_RATES={'user': '5/min', 'project': '3/min'})
+    def test_bulk_requests_above_the_rate_are_refused(self):
+        response = self.client.post(self.bulk_url, [{'title': 'Spam'}] * 4, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': 'Too many issues, the limit is 3'})
+        self.assertFalse(Issue.objects.exists())
+        # Not counted
+        self.assertEqual(self.client.post(self.bulk_url, [{'title': 'Spam'}] * 3, format='json').status_code, 201)
+
+    @override_settings(ISSUE_TRACKER_ISSUE_CREATION_RATES={'user': '5/min', 'project': '1/min'})
+    def test_project_limit(self):
+        ProjectMembership.objects.create(user=self.user1, project=self.project, role=ProjectPermission.Write)
+        self.assertEqual(self.create_issue().status_code, 201)
+        self.client.force_authenticate(self.user1)
+
+        self.assertEqual(self.create_issue().status_code, 429)
+
+    @override_settings(ISSUE_TRACKER_ISSUE_CREATION_RATES={'user': '5/min', 'project': '3/min'})
+    def test_outsiders_dont_use_up_the_project_limit(self):
+        self.client.force_authenticate(self.user1)
+        for _ in range(5):
+            self.assertEqual(self.create_issue().status_code, 403)
+        self.assertEqual(self.create_issue().status_code, 429)
+
+        self.client.force_authenticate(self.user)
+        for _ in range(3):
+            self.assertEqual(self.create_issue().status_code, 201)
+
+    @override_settings(ISSUE_TRACKER_ISSUE_CREATION_RATES={'user': None})
+    def test_disabled_limit(self):
+        for _ in range(10):
+            self.assertEqual(self.create_issue().status_code, 201)
+
+    @override_settings(ISSUE_TRACKER_THROTTLE_CACHE='default')
+    def test_shared_limit(self):
+        for _ in range(5):
+            self.assertEqual(self.create_issue().status_code, 201)
+        # Another worker process, with buckets of its own
+        token_buckets.clear()
+
+        response = self.create_issue()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response.headers)
+
+    def test_anonymous_users_are_refused_by_the_view(self):
+        self.client.force_authenticate(None)
+
+        for _ in range(10):
+            self.assertEqual(self.create_issue().status_code, 403)
+
+    def test_overhead(self):
+        timings = bench_throttle(requests=2000, users=100, projects=10)
+
+        self.assertLess(sum(timings) / len(timings), 0.001)
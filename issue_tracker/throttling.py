@@ -0,0 +1,106 @@
+import math
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from rest_framework.request import Request
+from rest_framework.throttling import BaseThrottle
+
+from issue_tracker.models import ProjectPermission
+from issue_tracker.services.permissions import has_project_permission
+from issue_tracker.services.rate_limit import Rate, SlidingWindowCounters, TokenBuckets
+
+DEFAULT_ISSUE_CREATION_RATES = {
+    'user': '5/min',
+    'project': '60/min',
+}
+# Issues created through the bulk endpoint, counted apart from the ones created one at a time
+DEFAULT_BULK_ISSUE_CREATION_RATES = {
+    'user': '600000/min',
+    'project': '600000/min',
+}
+
+# Shared by every request handled by this process
+token_buckets = TokenBuckets()
+
+
+class IssueCreationThrottle(BaseThrottle):
+    """
+    Limits how many issues a user may create, and how many may be created in a project, per period of time.
+
+    Rates come from ``ISSUE_TRACKER_ISSUE_CREATION_RATES``, a scope set to ``None`` isn't limited. The project scope
+    only counts requests of users who may write to the project, so that outsiders, who get a 403 anyway, can't use up
+    its budget. Every request is checked against token buckets of this process first, which is enough with a single
+    worker. If ``ISSUE_TRACKER_THROTTLE_CACHE`` names a cache, requests let through are also counted there, so that
+    the limits hold across workers. Requests refused by this process never reach the shared cache.
+    """
+    rates_setting = 'ISSUE_TRACKER_ISSUE_CREATION_RATES'
+    default_rates = DEFAULT_ISSUE_CREATION_RATES
+    scope = 'issue-creation'
+
+    def __init__(self):
+        self.wait_time: float | None = 0.0
+
+    def allow_request(self, request: Request, view) -> bool:
+        if type(request.user) != User:
+            # The view refuses anonymous users anyway
+            return True
+
+        project_id = view.kwargs.get('project_id')
+        if project_id is not None and not has_project_permission(request.user, project_id, ProjectPermission.Write,
+                                                                 request.auth):
+            project_id = None
+        limits = self.get_limits(request.user, project_id)
+        cost = self.get_cost(request)
+        if self.refused_by_view(cost, limits):
+            return True
+        self.wait_time = token_buckets.acquire(limits, cost)
+        if self.wait_time == 0:
+            alias = getattr(settings, 'ISSUE_TRACKER_THROTTLE_CACHE', None)
+            if alias is not None:
+                self.wait_time = SlidingWindowCounters(caches[alias]).acquire(limits, cost)
+        return self.wait_time == 0
+
+    def wait(self) -> float | None:
+        # None when the request costs more than a limit allows per period, it will never be let through
+        return self.wait_time
+
+    def get_cost(self, request: Request) -> int:
+        """Number of issues the request creates."""
+        return 1
+
+    def refused_by_view(self, cost: int, limits: list[tuple[str, Rate]]) -> bool:
+        """Whether the view refuses the request anyway, before it would be counted."""
+        return False
+
+    @classmethod
+    def get_limits(cls, user: User, project_id: str | None) -> list[tuple[str, Rate]]:
+        rates = getattr(settings, cls.rates_setting, cls.default_rates)
+        keys = {'user': f'{cls.scope}:user:{user.pk}', 'project': f'{cls.scope}:project:{project_id}'}
+        return [(keys[scope], Rate.parse(rate)) for scope, rate in rates.items()
+                if rate is not None and (scope != 'project' or project_id is not None)]
+
+
+class BulkIssueCreationThrottle(IssueCreationThrottle):
+    """
+    ``IssueCreationThrottle`` counting every submitted issue of a bulk request, against the rates of
+    ``ISSUE_TRACKER_BULK_ISSUE_CREATION_RATES`` rather than those of issues created one at a time.
+
+    A batch larger than a limit could never be let through, it is left to the view, which refuses it with a 400 that
+    states ``batch_limit()``.
+    """
+    rates_setting = 'ISSUE_TRACKER_BULK_ISSUE_CREATION_RATES'
+    default_rates = DEFAULT_BULK_ISSUE_CREATION_RATES
+    scope = 'bulk-issue-creation'
+
+    @classmethod
+    def batch_limit(cls, user: User, project_id: str | None) -> float:
+        """Most issues a single request may submit under the rates of ``user`` and ``project_id``."""
+        return min((rate.count for key, rate in cls.get_limits(user, project_id)), default=math.inf)
+
+    def get_cost(self, request: Request) -> int:
+        # Invalid bodies are refused by the view, they count as one request
+        return len(request.data) if isinstance(request.data, list) and request.data else 1
+
+    def refused_by_view(self, cost: int, limits: list[tuple[str, Rate]]) -> bool:
+        return any(cost > rate.count for key, rate in limits)
@@ -1,15 +1,56 @@
-﻿from django.urls import path
+﻿import functools
+from types import ModuleType
 
-from issue_tracker.views.issue_view import issue_view
+from django.conf import settings
+from django.urls import include, path, URLPattern
+
+from issue_tracker.views.issue_assignees_view import issue_assignees_view
+from issue_tracker.views.issue_view import async_issue_view, issue_view
+from issue_tracker.views.my_issues_view import my_issues_view
+from issue_tracker.views.project_assignments_bulk_view import bulk_assign_view
 from issue_tracker.views.project_issue_create_view import create_issue_view
-from issue_tracker.views.project_issues_view import project_issues_view
-from issue_tracker.views.project_members_view import project_members_view
-from issue_tracker.views.projects_view import projects_view
-
-urlpatterns = [
-    path('projects/', projects_view, name='projects view'),
-    path('projects/<str:project_id>/members/', project_members_view, name='project members view'),
-    path('projects/<str:project_id>/issues/', project_issues_view, name='project issues view'),
-    path('projects/<str:project_id>/issue/<int:issue_id>/', issue_view, name='issue view'),
-    path('projects/<str:project_id>/issues/new/', create_issue_view, name='create issue'),
-]
+from issue_tracker.views.project_issues_bulk_create_view import bulk_create_issues_view
+from issue_tracker.views.project_issues_export_view import export_project_issues_view
+from issue_tracker.views.project_issues_view import async_project_issues_view, project_issues_view
+from issue_tracker.views.project_members_view import async_project_members_view, project_members_view
+from issue_tracker.views.project_stats_view import project_stats_view
+from issue_tracker.views.projects_view import async_projects_view, projects_view
+
+
+
+def get_urlpatterns(async_reads: bool) -> list[URLPattern]:
+    """The API's routes. With ``async_reads``, GET requests to the busiest endpoints are served by async views."""
+    def read_view(sync_view, async_view):
+        return async_view if async_reads else sync_view
+
+    return [
+        path('projects/', read_view(projects_view, async_projects_view), name='projects view'),
+        path('projects/<str:project_id>/members/', read_view(project_members_view, async_project_members_view),
+             name='project members view'),
+        path('projects/<str:project_id>/issues/', read_view(project_issues_view, async_project_issues_view),
+             name='project issues view'),
+        path('projects/<str:project_id>/issue/<int:issue_id>/', read_view(issue_view, async_issue_view),
+             name='issue view'),
+        path('projects/<str:project_id>/issues/new/', create_issue_view, name='create issue'),
+        path('projects/<str:project_id>/issues/bulk/', bulk_create_issues_view, name='bulk create issues'),
+        path('projects/<str:project_id>/issues/export/', export_project_issues_view, name='export issues'),
+        path('projects/<str:project_id>/stats/', project_stats_view, name='project stats view'),
+        path('projects/<str:project_id>/issue/<int:issue_id>/assignees/', issue_assignees_view,
+             name='issue assignees view'),
+        path('projects/<str:project_id>/assignments/bulk/', bulk_assign_view, name='bulk assign'),
+        path('me/issues/', my_issues_view, name='my issues'),
+    ]
+
+
+@functools.cache
+def get_api_urlconf(async_reads: bool) -> ModuleType:
+    """
+    URLconf of the API alone under ``api/``, for ``ROOT_URLCONF``, serving reads with sync or async views whatever
+    ``ISSUE_TRACKER_ASYNC_READS`` says. Lets tests and ``bench_async_reads`` exercise both paths in one process.
+    """
+    urlconf = ModuleType(f'{__name__}.{"async" if async_reads else "sync"}_reads')
+    urlconf.urlpatterns = [path('api/', include(get_urlpatterns(async_reads)))]
+    return urlconf
+
+
+urlpatterns = get_urlpatterns(getattr(settings, 'ISSUE_TRACKER_ASYNC_READS', False))
@@ -0,0 +1,72 @@
+﻿from collections.abc import Mapping
+
+from rest_framework.decorators import api_view
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import *
+
+from issue_tracker.models import Assignment, Issue, ProjectMembership, ProjectPermission
+from issue_tracker.services.validate_request import RequestValidator
+
+
+@api_view(['GET', 'POST', 'DELETE'])
+def issue_assignees_view(request: Request, project_id: str, issue_id: int) -> Response:
+    """
+    Lists (``GET``), adds (``POST``) or removes (``DELETE``) the assignees of an issue.
+
+    ``POST`` and ``DELETE`` take ``{"username": ...}`` and need the Write permission. Only project members who can
+    read the project may be assigned.
+    """
+    permission = ProjectPermission.Read if request.method == 'GET' else ProjectPermission.Write
+    err = RequestValidator.validate_request_permissions(request, project_id, permission)
+    if err is not None:
+        return err
+
+    issue_pk = Issue.objects.filter(project=project_id, issue_id=issue_id).values_list('pk', flat=True).first()
+    if issue_pk is None:
+        return Response(status=HTTP_404_NOT_FOUND)
+
+    if request.method == 'GET':
+        return get_issue_assignees_view(issue_pk)
+    elif request.method == 'POST':
+        return assign_issue_view(request, project_id, issue_pk)
+    else:  # 'DELETE'
+        return unassign_issue_view(request, issue_pk)
+
+
+def parse_username(request: Request) -> tuple[str | None, Response | None]:
+    username = request.data.get('username') if isinstance(request.data, Mapping) else None
+    if not username or not isinstance(username, str):
+        return None, Response({'error': 'Please provide a valid username'}, status=HTTP_400_BAD_REQUEST)
+    return username, None
+
+
+def get_issue_assignees_view(issue_pk: int) -> Response:
+    usernames = Assignment.objects.filter(issue=issue_pk).order_by('user__username') \
+        .values_list('user__username', flat=True)
+    return Response({'data': list(usernames)}, status=HTTP_200_OK)
+
+
+def assign_issue_view(request: Request, project_id: str, issue_pk: int) -> Response:
+    username, err = parse_username(request)
+    if err is not None:
+        return err
+
+    user_id = ProjectMembership.objects.with_permission(ProjectPermission.Read) \
+        .filter(project=project_id, user__username=username).values_list('user', flat=True).first()
+    if user_id is None:
+        return Response({'error': 'Only project members can be assigned'}, status=HTTP_400_BAD_REQUEST)
+
+    _, created = Assignment.objects.get_or_create(issue_id=issue_pk, user_id=user_id)
+    return Response({'message': 'ok'}, status=HTTP_201_CREATED if created else HTTP_200_OK)
+
+
+def unassign_issue_view(request: Request, issue_pk: int) -> Response:
+    username, err = parse_username(request)
+    if err is not None:
+        return err
+
+    deleted, _ = Assignment.objects.filter(issue=issue_pk, user__username=username).delete()
+    if not deleted:
+        return Response({'error': 'This user is not assigned to the issue'}, status=HTTP_404_NOT_FOUND)
+    return Response({'message': 'ok'}, status=HTTP_200_OK)
@@ -1,9 +1,16 @@
-﻿from rest_framework.decorators import api_view
+﻿from django.db.models import QuerySet
+from rest_framework.decorators import api_view
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.status import *
 
-from issue_tracker.models import Issue, ProjectPermission, IssueSerializer
+from issue_tracker.async_api import async_api_view
+from issue_tracker.models import Issue, ProjectPermission
+from issue_tracker.services.conditional_requests import (
+    aconditional_response, aissue_validators, conditional_response, issue_validators,
+)
+from issue_tracker.services.response_cache import acached_response, cached_response
+from issue_tracker.services.row_serializers import issue_rows
 from issue_tracker.services.validate_request import RequestValidator
 
 
@@ -13,8 +20,47 @@ def issue_view(request: Request, project_id: str, issue_id: int) -> Response:
     if err is not None:
         return err
 
-    issue = Issue.objects.filter(issue_id=issue_id, project=project_id).first()
-    if issue is None:
-        return Response(status=HTTP_404_NOT_FOUND)
+    return conditional_response(
+        request,
+        issue_validators(project_id, issue_id),
+        lambda: cached_response(request, project_id, lambda: get_issue_view(request, project_id, issue_id)),
+    )
+
+
+def get_issue_view(request: Request, project_id: str, issue_id: int) -> Response:
+    fields, err = issue_rows.parse_fields(request)
+    if err:
+        return err
+
+    return issue_response(issue_query(project_id, issue_id, fields).first(), fields)
+
+
+@async_api_view(issue_view)
+async def async_issue_view(request: Request, project_id: str, issue_id: int) -> Response:
+    err = await RequestValidator.avalidate_request_permissions(request, project_id, ProjectPermission.Read)
+    if err is not None:
+        return err
 
-    return Response(IssueSerializer(issue).data, status=HTTP_200_OK)
+    return await aconditional_response(
+        request,
+        await aissue_validators(project_id, issue_id),
+        lambda: acached_response(request, project_id, lambda: aget_issue_view(request, project_id, issue_id)),
+    )
+
+
+async def aget_issue_view(request: Request, project_id: str, issue_id: int) -> Response:
+    fields, err = issue_rows.parse_fields(request)
+    if err:
+        return err
+
+    return issue_response(await issue_query(project_id, issue_id, fields).afirst(), fields)
+
+
+def issue_query(project_id: str, issue_id: int, fields: tuple[str, ...] | None) -> QuerySet:
+    return issue_rows.values_list(Issue.objects.filter(issue_id=issue_id, project=project_id), fields=fields)
+
+
+def issue_response(row: tuple | None, fields: tuple[str, ...] | None) -> Response:
+    if row is None:
+        return Response(status=HTTP_404_NOT_FOUND)
+    return Response(issue_rows.data([row], fields)[0], status=HTTP_200_OK)
@@ -0,0 +1,27 @@
+﻿from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from issue_tracker.metrics import request_metrics
+
+
+@require_GET
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Request histograms of this process in the Prometheus text format, see ``issue_tracker.metrics``.
+
+    Each worker process keeps its own histograms, a scrape only covers the requests of the worker that answers it.
+    Only served to staff users and to scrapers sending ``Authorization: Bearer <ISSUE_TRACKER_METRICS_TOKEN>``.
+    """
+    if not can_read_metrics(request):
+        return HttpResponseForbidden()
+    return HttpResponse(request_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def can_read_metrics(request: HttpRequest) -> bool:
+    token = getattr(settings, 'ISSUE_TRACKER_METRICS_TOKEN', None)
+    if token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_staff
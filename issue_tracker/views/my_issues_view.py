@@ -0,0 +1,36 @@
+﻿from django.contrib.auth.models import User
+from rest_framework.decorators import api_view
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import *
+
+from issue_tracker.models import Assignment, Issue, ProjectMembership, ProjectPermission
+from issue_tracker.services.pagination import KeysetPaginator
+from issue_tracker.services.row_serializers import issue_rows
+
+
+@api_view(['GET'])
+def my_issues_view(request: Request) -> Response:
+    """
+    Lists the issues assigned to the user, across every project they can still read, ordered by project and number.
+
+    Permissions are checked by the query itself, so a page costs one query however many projects the user is in.
+    """
+    if type(request.user) != User:
+        return Response({'message': 'You can\'t access this resource as an anonymous user'}, status=HTTP_403_FORBIDDEN)
+    fields, err = issue_rows.parse_fields(request)
+    if err:
+        return err
+
+    paginator = KeysetPaginator(('project_id', 'issue_id'))
+    queryset = Issue.objects.filter(
+        pk__in=Assignment.objects.filter(user=request.user).values('issue'),
+        project__in=ProjectMembership.objects.with_permission(ProjectPermission.Read)
+        .filter(user=request.user).values('project'),
+    )
+    queryset = issue_rows.values_list(queryset, keys=[name for name, _ in paginator.fields], fields=fields)
+    page, err = paginator.paginate(queryset, request)
+    if err:
+        return err
+
+    return Response(page.envelope(issue_rows.data(page.rows, fields)), status=HTTP_200_OK)
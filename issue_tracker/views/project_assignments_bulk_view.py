@@ -0,0 +1,96 @@
+﻿from collections.abc import Mapping
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from rest_framework.decorators import api_view
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import *
+
+from issue_tracker.models import Assignment, Issue, ProjectMembership, ProjectPermission
+from issue_tracker.services.bulk_delete import delete_rows
+from issue_tracker.services.conditional_requests import issues_changed
+from issue_tracker.services.response_cache import bump_project_version
+from issue_tracker.services.validate_request import RequestValidator
+
+DEFAULT_BULK_ASSIGN_LIMIT = 1000
+ACTIONS = ('assign', 'unassign')
+
+
+@api_view(['POST'])
+def bulk_assign_view(request: Request, project_id: str) -> Response:
+    """
+    Assigns or unassigns users to issues of a project, from a JSON array of
+    ``{"issue_id": ..., "username": ..., "action": "assign" | "unassign"}``.
+
+    Only members who can read the project may be assigned, anyone may be unassigned, like members who left the
+    project. Issues and users are looked up with one query each, whatever the number of changes. The response lists one
+    result per change, in the same order. Invalid changes don't prevent the valid ones from being applied.
+    """
+    err = RequestValidator.validate_request_permissions(request, project_id, ProjectPermission.Write)
+    if err is not None:
+        return err
+
+    if not isinstance(request.data, list) or not request.data:
+        return Response(data={'error': 'Provide a list of changes'}, status=HTTP_400_BAD_REQUEST)
+    limit = getattr(settings, 'ISSUE_TRACKER_BULK_ASSIGN_LIMIT', DEFAULT_BULK_ASSIGN_LIMIT)
+    if len(request.data) > limit:
+        return Response(data={'error': f'Too many changes, the limit is {limit}'}, status=HTTP_400_BAD_REQUEST)
+
+    changes = [data if isinstance(data, Mapping) else {} for data in request.data]
+    issue_pks = dict(Issue.objects.filter(
+        project=project_id,
+        issue_id__in=[change.get('issue_id') for change in changes if isinstance(change.get('issue_id'), int)],
+    ).values_list('issue_id', 'pk'))
+    # Username -> pk and whether the user may be assigned
+    users = {username: (pk, readers) for username, pk, readers in User.objects.filter(
+        username__in=[change.get('username') for change in changes if isinstance(change.get('username'), str)],
+    ).annotate(readers=Exists(ProjectMembership.objects.with_permission(ProjectPermission.Read).filter(
+        project=project_id, user=OuterRef('pk'),
+    ))).values_list('username', 'pk', 'readers')}
+
+    results, assign, unassign = [], set(), set()
+    for data, change in zip(request.data, changes):
+        if not isinstance(data, Mapping):
+            results.append({'status': HTTP_400_BAD_REQUEST, 'error': 'Change must be an object'})
+        elif change.get('action') not in ACTIONS:
+            results.append({'status': HTTP_400_BAD_REQUEST, 'error': 'Action must be "assign" or "unassign"'})
+        elif change.get('issue_id') not in issue_pks:
+            results.append({'status': HTTP_404_NOT_FOUND, 'error': 'Issue not found'})
+        elif change['action'] == 'assign' and not users.get(change.get('username'), (None, False))[1]:
+            results.append({'status': HTTP_400_BAD_REQUEST, 'error': 'Only project members can be assigned'})
+        elif change.get('username') not in users:
+            results.append({'status': HTTP_404_NOT_FOUND, 'error': 'User not found'})
+        else:
+            pair = (issue_pks[change['issue_id']], users[change['username']][0])
+            (assign if change['action'] == 'assign' else unassign).add(pair)
+            results.append({'status': HTTP_200_OK})
+
+    with transaction.atomic():
+        changed = set()
+        if unassign:
+            candidates = Assignment.objects.filter(issue__in={issue for issue, _ in unassign},
+                                                   user__in={user for _, user in unassign})
+            pks = []
+            for pk, issue, user in candidates.values_list('pk', 'issue', 'user'):
+                if (issue, user) in unassign:
+                    pks.append(pk)
+                    changed.add(issue)
+            # One DELETE, without the post_delete of every assignment, whose work is done once below
+            if pks:
+                delete_rows(Assignment.objects.filter(pk__in=pks))
+        if assign:
+            Assignment.objects.bulk_create([Assignment(issue_id=issue, user_id=user) for issue, user in assign],
+                                           ignore_conflicts=True)
+            changed.update(issue for issue, _ in assign)
+        if changed:
+            # Neither bulk_create nor delete_rows send signals
+            Issue.objects.filter(pk__in=changed).update(updated_at=timezone.now())
+            issues_changed(project_id)
+            bump_project_version(project_id)
+
+    status = HTTP_200_OK if all(result['status'] == HTTP_200_OK for result in results) else HTTP_207_MULTI_STATUS
+    return Response({'data': results}, status=status)
@@ -1,13 +1,17 @@
-﻿from rest_framework.decorators import api_view
+﻿from django.db import transaction
+from rest_framework.decorators import api_view, throttle_classes
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.status import *
 
-from issue_tracker.models import ProjectPermission, Project, Issue, IssueSerializer
+from issue_tracker.models import ProjectPermission, Issue, IssueSerializer
+from issue_tracker.services.issue_numbers import reserve_issue_ids
 from issue_tracker.services.validate_request import RequestValidator, IssueInfo
+from issue_tracker.throttling import IssueCreationThrottle
 
 
 @api_view(['POST'])
+@throttle_classes([IssueCreationThrottle])
 def create_issue_view(request: Request, project_id: str) -> Response:
     err = RequestValidator.validate_request_permissions(request, project_id, ProjectPermission.Write)
     if err is not None:
@@ -17,21 +21,15 @@ def create_issue_view(request: Request, project_id: str) -> Response:
     if err is not None:
         return err
 
-    # RequestValidator already checked that this project exists, but due to the intentional design, we need to
-    # query for it twice (look inside that function to see why it's simpler)
-    project = Project.objects.get(name=project_id)
-
-    # Get the next issue_id for this project
-    latest_issue = Issue.objects.filter(project=project).order_by('-issue_id').first()
-    next_issue_id = (latest_issue.issue_id + 1) if latest_issue else 1
-
-    issue = Issue.objects.create(
-        issue_id=next_issue_id,
-        title=info.title,
-        description=info.description,
-        project=project,
-        reporter=request.user,
-        status=info.status,
-        priority=info.priority,
-    )
+    # RequestValidator already checked that this project exists, so there is no need to fetch it again
+    with transaction.atomic():
+        issue = Issue.objects.create(
+            issue_id=reserve_issue_ids(project_id).start,
+            title=info.title,
+            description=info.description,
+            project_id=project_id,
+            reporter=request.user,
+            status=info.status,
+            priority=info.priority,
+        )
     return Response(data=IssueSerializer(issue).data, status=HTTP_201_CREATED)
@@ -0,0 +1,72 @@
+﻿from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.decorators import api_view, throttle_classes
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import *
+
+from issue_tracker.models import ProjectPermission, Issue
+from issue_tracker.services.issue_numbers import reserve_issue_ids
+from issue_tracker.services.issue_stats import count_issues
+from issue_tracker.services.conditional_requests import issues_changed
+from issue_tracker.services.response_cache import bump_project_version
+from issue_tracker.services.validate_request import RequestValidator, IssueInfo
+from issue_tracker.throttling import BulkIssueCreationThrottle
+
+DEFAULT_BULK_CREATE_LIMIT = 1000
+
+
+@api_view(['POST'])
+@throttle_classes([BulkIssueCreationThrottle])
+def bulk_create_issues_view(request: Request, project_id: str) -> Response:
+    """
+    Creates every valid issue of a JSON array in one transaction.
+
+    The response lists one result per submitted issue, in the same order: either the assigned ``issue_id`` or the
+    validation error. Invalid issues don't prevent the valid ones from being created.
+    """
+    err = RequestValidator.validate_request_permissions(request, project_id, ProjectPermission.Write)
+    if err is not None:
+        return err
+
+    if not isinstance(request.data, list) or not request.data:
+        return Response(data={'error': 'Provide a list of issues'}, status=HTTP_400_BAD_REQUEST)
+    # A batch larger than a rate limit would never be let through by the throttle
+    limit = min(getattr(settings, 'ISSUE_TRACKER_BULK_CREATE_LIMIT', DEFAULT_BULK_CREATE_LIMIT),
+                BulkIssueCreationThrottle.batch_limit(request.user, project_id))
+    if len(request.data) > limit:
+        return Response(data={'error': f'Too many issues, the limit is {limit}'}, status=HTTP_400_BAD_REQUEST)
+
+    # One unsaved Issue or validation error per submitted issue
+    results = []
+    for data in request.data:
+        info, err = IssueInfo.parse(data)
+        results.append(err if err is not None else Issue(
+            title=info.title,
+            description=info.description,
+            project_id=project_id,
+            reporter=request.user,
+            status=info.status,
+            priority=info.priority,
+        ))
+
+    issues = [result for result in results if isinstance(result, Issue)]
+    if issues:
+        with transaction.atomic():
+            for issue, issue_id in zip(issues, reserve_issue_ids(project_id, len(issues))):
+                issue.issue_id = issue_id
+            Issue.objects.bulk_create(issues)
+            # bulk_create doesn't send post_save
+            count_issues(project_id, Counter((issue.status, issue.priority) for issue in issues))
+            issues_changed(project_id)
+            bump_project_version(project_id)
+
+    data = [
+        {'status': HTTP_201_CREATED, 'issue_id': result.issue_id} if isinstance(result, Issue)
+        else {'status': result.status_code, **result.data}
+        for result in results
+    ]
+    status = HTTP_201_CREATED if len(issues) == len(results) else HTTP_207_MULTI_STATUS
+    return Response({'data': data}, status=status)
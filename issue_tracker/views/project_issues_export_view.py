@@ -0,0 +1,42 @@
+﻿from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import *
+
+from issue_tracker.models import ProjectPermission, Issue
+from issue_tracker.services.issue_export import iter_issue_rows, to_ndjson, to_csv
+from issue_tracker.services.issue_filters import IssueFilter
+from issue_tracker.services.validate_request import RequestValidator
+
+EXPORT_FORMATS = {
+    'ndjson': (to_ndjson, 'application/x-ndjson'),
+    'csv': (to_csv, 'text/csv; charset=utf-8'),
+}
+
+
+@api_view(['GET'])
+def export_project_issues_view(request: Request, project_id: str) -> Response | StreamingHttpResponse:
+    """
+    Streams every issue of a project matching the list filters as NDJSON (default) or CSV, see ``?output=``.
+
+    The rows are written while they are read from the database, so the export starts right away and its memory
+    use doesn't grow with the project.
+    """
+    err = RequestValidator.validate_request_permissions(request, project_id, ProjectPermission.Read)
+    if err is not None:
+        return err
+
+    output = request.query_params.get('output', 'ndjson')
+    if output not in EXPORT_FORMATS:
+        return Response(data={'error': 'Invalid export format'}, status=HTTP_400_BAD_REQUEST)
+
+    issue_filter, err = IssueFilter.parse_from_request(request)
+    if err is not None:
+        return err
+
+    writer, content_type = EXPORT_FORMATS[output]
+    rows = iter_issue_rows(issue_filter.apply(Issue.objects.filter(project=project_id)), issue_filter.ordering)
+    response = StreamingHttpResponse(writer(rows), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="issues.{output}"'
+    return response
@@ -4,7 +4,15 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.status import *
 
-from issue_tracker.models import ProjectPermission, Issue, IssueSerializer
+from issue_tracker.async_api import async_api_view
+from issue_tracker.models import ProjectPermission, Issue
+from issue_tracker.services.conditional_requests import (
+    aconditional_response, aproject_issues_validators, conditional_response, project_issues_validators,
+)
+from issue_tracker.services.issue_filters import IssueFilter
+from issue_tracker.services.pagination import KeysetPaginator
+from issue_tracker.services.response_cache import acached_response, cached_response
+from issue_tracker.services.row_serializers import issue_rows
 from issue_tracker.services.validate_request import RequestValidator
 
 
@@ -19,5 +27,63 @@ def get_project_issues_view(request: Request, project_id: str) -> Response:
     if err:
         return err
 
-    queryset = Issue.objects.filter(project__name=project_id)
-    return Response({'data': IssueSerializer(queryset, many=True).data}, status=HTTP_200_OK)
+    return conditional_response(
+        request,
+        project_issues_validators(project_id),
+        lambda: cached_response(request, project_id, lambda: list_project_issues(request, project_id)),
+    )
+
+
+def list_project_issues(request: Request, project_id: str) -> Response:
+    query, err = project_issues_query(request, project_id)
+    if err:
+        return err
+    paginator, queryset, fields = query
+
+    page, err = paginator.paginate(queryset, request)
+    if err:
+        return err
+    return Response(page.envelope(issue_rows.data(page.rows, fields)), status=HTTP_200_OK)
+
+
+def project_issues_query(request: Request, project_id: str) -> tuple[tuple | None, Response | None]:
+    """The paginator, rows and fields of the listing asked for by the query string."""
+    issue_filter, err = IssueFilter.parse_from_request(request)
+    if err:
+        return None, err
+    fields, err = issue_rows.parse_fields(request)
+    if err:
+        return None, err
+
+    paginator = KeysetPaginator(issue_filter.ordering)
+    queryset = issue_filter.apply(Issue.objects.filter(project=project_id))
+    queryset = issue_rows.values_list(queryset, keys=[name for name, _ in paginator.fields], fields=fields)
+    return (paginator, queryset, fields), None
+
+
+@async_api_view(project_issues_view)
+async def async_project_issues_view(request: Request, project_id: str) -> Response:
+    if type(request.user) != User:
+        return Response({'message': 'You can\'t access this resource as an anonymous user'}, status=HTTP_403_FORBIDDEN)
+
+    err = await RequestValidator.avalidate_request_permissions(request, project_id, ProjectPermission.Read)
+    if err:
+        return err
+
+    return await aconditional_response(
+        request,
+        await aproject_issues_validators(project_id),
+        lambda: acached_response(request, project_id, lambda: alist_project_issues(request, project_id)),
+    )
+
+
+async def alist_project_issues(request: Request, project_id: str) -> Response:
+    query, err = project_issues_query(request, project_id)
+    if err:
+        return err
+    paginator, queryset, fields = query
+
+    page, err = await paginator.apaginate(queryset, request)
+    if err:
+        return err
+    return Response(page.envelope(issue_rows.data(page.rows, fields)), status=HTTP_200_OK)
@@ -1,10 +1,13 @@
 ﻿from django.contrib.auth.models import User
+from django.db.models import QuerySet
 from rest_framework.decorators import api_view
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.status import *
 
+from issue_tracker.async_api import async_api_view
 from issue_tracker.models import Project, ProjectMembership, ProjectPermission
+from issue_tracker.services.permissions import aget_project_role, get_project_role
 
 
 @api_view(['GET', 'POST'])
@@ -22,31 +25,34 @@ def project_members_view(request: Request, project_id: str) -> Response:
     if type(request.user) != User:
         return Response({'message': 'You can\'t access this resource as an anonymous user'}, status=HTTP_403_FORBIDDEN)
 
-    project = Project.objects.filter(name=project_id).first()
-    if project is None:
+    # Members of a project know it exists, only look it up for everyone else
+    role = get_project_role(request.user, project_id, request.auth)
+    if not role and not Project.objects.filter(name=project_id).exists():
         return Response({'message': 'This project does not exist'}, status=HTTP_400_BAD_REQUEST)
-    membership = ProjectMembership.objects.filter(
-        user=request.user,
-        project=project,
-    ).first()
 
     if request.method == 'GET':
-        return get_project_members_view(project, membership)
+        return get_project_members_view(project_id, role)
     else:  # 'POST'
-        return edit_project_members_view(request, project, membership)
+        return edit_project_members_view(request, project_id, role)
 
 
-def get_project_members_view(project: Project, membership: ProjectMembership) -> Response:
-    if not membership or not membership.role & ProjectPermission.Read:
+def get_project_members_view(project_id: str, role: ProjectPermission) -> Response:
+    if not role & ProjectPermission.Read:
         return Response({'Not enough permissions to view this resource'}, status=HTTP_403_FORBIDDEN)
 
-    members = [{'username': membership.user.username, 'roles': ProjectPermission(membership.role).name} for membership
-               in ProjectMembership.objects.filter(project=project)]
+    return project_members_response(list(project_members(project_id)))
+
+
+def project_members(project_id: str) -> QuerySet:
+    return ProjectMembership.objects.filter(project=project_id).values_list('user__username', 'role')
 
-    return Response({'data': members}, status=HTTP_200_OK)
 
+def project_members_response(members: list[tuple[str, int]]) -> Response:
+    data = [{'username': username, 'roles': ProjectPermission(role).name} for username, role in members]
+    return Response({'data': data}, status=HTTP_200_OK)
 
-def edit_project_members_view(request: Request, project: Project, membership: ProjectMembership) -> Response:
+
+def edit_project_members_view(request: Request, project_id: str, role: ProjectPermission) -> Response:
     """
     Handles editing project membership details based on user permissions and request input.
     This view provides functionality to add a new member to a project or update the role
@@ -56,16 +62,16 @@ def edit_project_members_view(request: Request, project: Project, membership: Pr
     :param request: The HTTP request object, containing user details, POST data, and other
                     metadata required for processing the membership changes
     :type request: Request
-    :param project: The project instance for which the membership changes are being made
-    :type project: Project
-    :param membership: The current user's membership in the project, used to verify if
-                       the user holds sufficient permissions to edit memberships
-    :type membership: ProjectMembership
+    :param project_id: The name of the project for which the membership changes are being made
+    :type project_id: str
+    :param role: The current user's role in the project, used to verify if the user holds
+                 sufficient permissions to edit memberships
+    :type role: ProjectPermission
     :return: A Response object indicating the success or failure of the membership edit
              operation, with an appropriate HTTP status code and a descriptive message
     :rtype: Response
     """
-    if not membership or not membership.role & ProjectPermission.Manage:
+    if not role & ProjectPermission.Manage:
         return Response({'Not enough permissions to edit this resource'}, status=HTTP_403_FORBIDDEN)
 
     username = request.POST.get('username')
@@ -77,24 +83,39 @@ def edit_project_members_view(request: Request, project: Project, membership: Pr
     if target_user is None:
         return Response({'message': 'Specified user does not exist'}, status=HTTP_400_BAD_REQUEST)
 
-    role = request.POST.get('role')
-    if role is None:
+    target_role = request.POST.get('role')
+    if target_role is None:
         return Response({'message': 'Please provide desired role'}, status=HTTP_400_BAD_REQUEST)
 
     target_membership = ProjectMembership.objects.filter(
         user__username=username,
-        project=project,
+        project=project_id,
     ).first()
     if target_membership is None:
         # Create a new membership
         ProjectMembership.objects.create(
             user=target_user,
-            project=project,
-            role=role,
+            project_id=project_id,
+            role=target_role,
         )
     else:
         # Edit current
-        target_membership.role = role
+        target_membership.role = target_role
         target_membership.save()
 
     return Response({'message': 'ok'}, status=HTTP_200_OK)
+
+
+@async_api_view(project_members_view)
+async def async_project_members_view(request: Request, project_id: str) -> Response:
+    """GET of ``project_members_view``, the other methods are handled by it."""
+    if type(request.user) != User:
+        return Response({'message': 'You can\'t access this resource as an anonymous user'}, status=HTTP_403_FORBIDDEN)
+
+    role = await aget_project_role(request.user, project_id, request.auth)
+    if not role and not await Project.objects.filter(name=project_id).aexists():
+        return Response({'message': 'This project does not exist'}, status=HTTP_400_BAD_REQUEST)
+    if not role & ProjectPermission.Read:
+        return Response({'Not enough permissions to view this resource'}, status=HTTP_403_FORBIDDEN)
+
+    return project_members_response([member async for member in project_members(project_id)])
@@ -0,0 +1,22 @@
+﻿from rest_framework.decorators import api_view
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import *
+
+from issue_tracker.models import ProjectPermission
+from issue_tracker.services.issue_stats import get_issue_stats
+from issue_tracker.services.validate_request import RequestValidator
+
+
+@api_view(['GET'])
+def project_stats_view(request: Request, project_id: str) -> Response:
+    """
+    Number of issues of a project per status, per priority and per both.
+
+    Served from counters kept up to date by every issue write, so it costs the same whatever the size of the project.
+    """
+    err = RequestValidator.validate_request_permissions(request, project_id, ProjectPermission.Read)
+    if err is not None:
+        return err
+
+    return Response(get_issue_stats(project_id), status=HTTP_200_OK)
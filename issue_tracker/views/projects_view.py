@@ -1,10 +1,15 @@
 ﻿from django.contrib.auth.models import User
+from django.db.models import QuerySet
 from rest_framework.decorators import api_view
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.status import *
 
-from issue_tracker.models import Project, ProjectMembership, ProjectPermission, ProjectSerializer
+from issue_tracker.async_api import async_api_view
+from issue_tracker.models import Project, ProjectMembership, ProjectPermission
+from issue_tracker.services.bulk_delete import delete_project
+from issue_tracker.services.permissions import has_project_permission
+from issue_tracker.services.row_serializers import project_rows
 
 
 @api_view(['GET', 'POST', 'DELETE'])
@@ -30,12 +35,17 @@ def projects_view(request: Request) -> Response:
 
 
 def handle_get_projects_view(request: Request) -> Response:
-    memberships = ProjectMembership.objects.filter(user=request.user)
-    projects_list = []
-    for membership in memberships:
-        if membership.role & ProjectPermission.Read:
-            projects_list.append(ProjectSerializer(membership.project).data)
-    return Response({'data': projects_list}, status=HTTP_200_OK)
+    fields, err = project_rows.parse_fields(request)
+    if err:
+        return err
+
+    rows = readable_projects(request.user, fields)
+    return Response({'data': project_rows.data(rows, fields)}, status=HTTP_200_OK)
+
+
+def readable_projects(user: User, fields: tuple[str, ...] | None) -> QuerySet:
+    memberships = ProjectMembership.objects.filter(user=user).with_permission(ProjectPermission.Read)
+    return project_rows.values_list(memberships, prefix='project__', fields=fields)
 
 
 def handle_create_projects_view(request: Request) -> Response:
@@ -69,15 +79,24 @@ def handle_delete_projects_view(request: Request) -> Response:
     project = Project.objects.filter(name=project_name).first()
     if project is None:
         return Response({'message': 'This project does not exist'}, status=HTTP_400_BAD_REQUEST)
-    membership = ProjectMembership.objects.filter(
-        user=request.user,
-        project=project,
-    ).first()
-    if membership is None or not membership.role & ProjectPermission.Manage:
+    if not has_project_permission(request.user, project.name, ProjectPermission.Manage, request.auth):
         return Response({'message': 'User doesn\'t have proper access rights'}, status=HTTP_403_FORBIDDEN)
 
-    project.delete()
+    delete_project(project)
 
     return Response({'message': 'deleted'}, status=HTTP_200_OK)
 
 
+@async_api_view(projects_view)
+async def async_projects_view(request: Request) -> Response:
+    """GET of ``projects_view``, the other methods are handled by it."""
+    if type(request.user) != User:
+        return Response({'message': 'You can\'t access this resource as an anonimous user'}, status=HTTP_403_FORBIDDEN)
+    fields, err = project_rows.parse_fields(request)
+    if err:
+        return err
+
+    rows = [row async for row in readable_projects(request.user, fields)]
+    return Response({'data': project_rows.data(rows, fields)}, status=HTTP_200_OK)
+
+
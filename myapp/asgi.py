@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myapp.settings')
+# Read endpoints have async views, see ISSUE_TRACKER_ASYNC_READS
+os.environ.setdefault('ASYNC_READS', 'true')
 
 application = get_asgi_application()
@@ -0,0 +1,149 @@
+"""
+Production entry point of myapp: ``python -m myapp.server``.
+
+Serves ``myapp.wsgi`` with gunicorn. The master process imports and warms the application once (settings, apps,
+middleware, URL resolver, serializers, database backends), then forks workers that share those pages instead of
+loading everything again. Workers run a few threads each, are replaced after a number of requests to cap memory
+growth, and finish their in-flight requests on ``SIGTERM``.
+
+Every option can be given on the command line or through a ``SERVER_*`` environment variable, see ``--help``. More
+than one worker needs the caches shared between them, see ``local_caches()``.
+"""
+
+import argparse
+import os
+
+from gunicorn.app.base import BaseApplication
+
+DEFAULT_BIND = '0.0.0.0:8000'
+DEFAULT_THREADS = 4
+DEFAULT_MAX_REQUESTS = 1000
+DEFAULT_GRACEFUL_TIMEOUT = 30
+
+
+def available_cpus() -> int:
+    # Honours CPU affinity and cpusets, so a container limited to 2 cores doesn't start a worker per host core
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def default_workers() -> int:
+    # Threads wait on the database and the network, workers spread the Python work over the cores
+    return available_cpus() * 2 + 1
+
+
+def local_caches() -> list[str]:
+    """
+    Aliases of the caches every worker has to see the writes of the others in, but that are kept by each process.
+
+    A write handled by one worker only bumps the response cache version of its own process, so the others would keep
+    serving stale responses, and role changes would only untrust the role claims seen by that worker.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myapp.settings')
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.core.cache.backends.locmem import LocMemCache
+
+    aliases = [getattr(settings, 'ISSUE_TRACKER_RESPONSE_CACHE', 'default'),
+               getattr(settings, 'ISSUE_TRACKER_THROTTLE_CACHE', None)]
+    if getattr(settings, 'AUTH_API_ROLE_CLAIMS', False):
+        aliases.append(getattr(settings, 'AUTH_API_ROLE_CLAIMS_CACHE', 'roles'))
+    return sorted({alias for alias in aliases if alias is not None and isinstance(caches[alias], LocMemCache)})
+
+
+def warm_up():
+    """Loads everything the first requests of every worker would otherwise load, returns the WSGI application."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myapp.settings')
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connections
+    from django.urls import get_resolver
+
+    application = get_wsgi_application()
+
+    # Imports every view, and with them the serializers and services, and compiles the URL patterns
+    resolver = get_resolver()
+    resolver.reverse_dict
+
+    from issue_tracker.models import IssueSerializer, ProjectSerializer
+    for serializer_class in (IssueSerializer, ProjectSerializer):
+        serializer_class().fields
+    from issue_tracker.services.row_serializers import issue_rows, project_rows
+    for row_serializer in (issue_rows, project_rows):
+        row_serializer.columns
+
+    # Loads the database drivers and fails fast if a database is unreachable. Connections can't be shared between
+    # processes, so they are closed before forking and every worker opens its own
+    for connection in connections.all():
+        connection.ensure_connection()
+    connections.close_all()
+    return application
+
+
+def worker_exit(server, worker):
+    from django.db import connections
+    from auth_api.hashing import hashing_pool
+
+    hashing_pool.shutdown()
+    connections.close_all()
+
+
+class Server(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return warm_up()
+
+
+def get_options(argv: list[str] | None = None) -> dict:
+    env = os.environ
+    parser = argparse.ArgumentParser(prog='python -m myapp.server', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bind', default=env.get('SERVER_BIND', DEFAULT_BIND))
+    parser.add_argument('--workers', type=int, default=int(env.get('SERVER_WORKERS', default_workers())),
+                        help='Worker processes, twice the available CPUs plus one by default')
+    parser.add_argument('--threads', type=int, default=int(env.get('SERVER_THREADS', DEFAULT_THREADS)),
+                        help='Threads per worker')
+    parser.add_argument('--max-requests', type=int,
+                        default=int(env.get('SERVER_MAX_REQUESTS', DEFAULT_MAX_REQUESTS)),
+                        help='Requests after which a worker is replaced, 0 to keep workers forever')
+    parser.add_argument('--graceful-timeout', type=int,
+                        default=int(env.get('SERVER_GRACEFUL_TIMEOUT', DEFAULT_GRACEFUL_TIMEOUT)),
+                        help='Seconds workers get to finish their requests on shutdown')
+    args = parser.parse_args(argv)
+
+    return {
+        'bind': args.bind,
+        'workers': args.workers,
+        'worker_class': 'gthread',
+        'threads': args.threads,
+        'preload_app': True,
+        'max_requests': args.max_requests,
+        # Spreads restarts out, so workers started together aren't all replaced at the same time
+        'max_requests_jitter': args.max_requests // 10,
+        'graceful_timeout': args.graceful_timeout,
+        'worker_exit': worker_exit,
+        'accesslog': '-',
+    }
+
+
+def main(argv: list[str] | None = None):
+    options = get_options(argv)
+    if options['workers'] > 1:
+        aliases = local_caches()
+        if aliases:
+            raise SystemExit(f'The {", ".join(aliases)} cache is kept by each process, set REDIS_URL to share it '
+                             f'between the {options["workers"]} workers, or run a single worker')
+    Server(options).run()
+
+
+if __name__ == '__main__':
+    main()
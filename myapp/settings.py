@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -50,6 +51,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so that it times the whole request
+    'issue_tracker.metrics.TimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -84,10 +87,15 @@ WSGI_APPLICATION = 'myapp.wsgi.application'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
 # Default value
+# The SQLite test database is a file rather than in memory, so that tests can use several connections at once, as
+# concurrent requests do. Transactions start IMMEDIATE, so that concurrent writers wait for each other instead of
+# failing to upgrade their read lock
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 # Handling environmental variables according to README.md
@@ -109,6 +117,36 @@ if not database:
         }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The local-memory cache is per process. With several workers, set REDIS_URL to share the cache between them (needs
+# `redis`), `python -m myapp.server` refuses to start more than one worker otherwise. `roles` keeps the markers of
+# AUTH_API_ROLE_CLAIMS, an evicted marker would make stale role claims trusted again: it never culls, and the Redis
+# server must not evict keys (maxmemory-policy noeviction)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'roles': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'roles',
+        # Markers expire with the access tokens, there are at most as many as users
+        'OPTIONS': {'MAX_ENTRIES': sys.maxsize},
+    },
+}
+if os.environ.get('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+    }
+    CACHES['roles'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+        'KEY_PREFIX': 'roles',
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -128,6 +166,25 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+
+AUTHENTICATION_BACKENDS = [
+    'auth_api.backends.PooledModelBackend',
+]
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'auth_api.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# Hash new passwords with Argon2 (needs argon2-cffi), existing ones are hashed again on their next login
+if os.environ.get('PASSWORD_HASHER') == 'ARGON2':
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(2))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -153,7 +210,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'auth_api.authentication.CachedJWTAuthentication',
     ),
 }
 
@@ -162,4 +219,96 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(hours=24),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_OBTAIN_SERIALIZER': 'auth_api.tokens.RoleTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'auth_api.tokens.RoleTokenRefreshSerializer',
+}
+
+# Page size of cursor-paginated listings, `?limit=` may lower or raise it up to the hard maximum
+ISSUE_TRACKER_PAGE_SIZE = 50
+ISSUE_TRACKER_MAX_PAGE_SIZE = 500
+
+# Maximum number of issues accepted by one bulk create request
+ISSUE_TRACKER_BULK_CREATE_LIMIT = 1000
+
+# Serve GET requests to issues, issue lists, projects and members with async views. myapp/asgi.py turns it on, as
+# async views only pay off under an ASGI server
+ISSUE_TRACKER_ASYNC_READS = os.environ.get('ASYNC_READS', 'false').lower() == 'true'
+
+# Maximum number of changes accepted by one bulk assignment request
+ISSUE_TRACKER_BULK_ASSIGN_LIMIT = 1000
+
+# Number of rows fetched per round trip while streaming an issue export
+ISSUE_TRACKER_EXPORT_CHUNK_SIZE = 2000
+
+# Send the time spent in authentication, permission checks, SQL and serializers in a Server-Timing header, which shows
+# every client the number of queries: only in development by default. Requests are timed and served at /metrics either
+# way, as long as issue_tracker.metrics.TimingMiddleware is installed. /metrics is only served to staff users and to
+# scrapers sending `Authorization: Bearer <ISSUE_TRACKER_METRICS_TOKEN>`
+ISSUE_TRACKER_SERVER_TIMING = DEBUG
+ISSUE_TRACKER_METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# Log queries slower than this many milliseconds with their route and view, and count them by shape in the
+# slow_queries table along with the plan of the first one, see `manage.py slow_queries`. Off when unset. On
+# PostgreSQL the plan comes from EXPLAIN ANALYZE, which runs the first slow SELECT of each shape a second time in the
+# request that ran it
+ISSUE_TRACKER_SLOW_QUERY_MS = float(os.environ['SLOW_QUERY_MS']) if os.environ.get('SLOW_QUERY_MS') else None
+
+# Per-process cache of project roles. Changes are picked up immediately by the process that made them and after
+# at most ISSUE_TRACKER_PERMISSION_CACHE_TTL seconds by the other ones
+ISSUE_TRACKER_PERMISSION_CACHE_SIZE = 10000
+ISSUE_TRACKER_PERMISSION_CACHE_TTL = 60
+
+# Cache alias and lifetime of cached issue responses. Entries are keyed on a per-project version that every write
+# bumps, so the timeout only bounds memory use, as long as the cache is shared by every worker process
+ISSUE_TRACKER_RESPONSE_CACHE = 'default'
+ISSUE_TRACKER_RESPONSE_CACHE_TIMEOUT = 300
+
+# Issues a user may create, and issues that may be created in one project, e.g. '5/min'. None disables a limit.
+# Each worker process enforces them on its own, unless ISSUE_TRACKER_THROTTLE_CACHE names a cache shared by all of them
+ISSUE_TRACKER_ISSUE_CREATION_RATES = {
+    'user': '5/min',
+    'project': '60/min',
+}
+# Same for issues created through the bulk endpoint, which are counted apart. Larger batches than a limit are refused
+ISSUE_TRACKER_BULK_ISSUE_CREATION_RATES = {
+    'user': '600000/min',
+    'project': '600000/min',
 }
+ISSUE_TRACKER_THROTTLE_CACHE = None
+
+# Per-process cache of the users behind access tokens. Saved users are picked up immediately by the process that saved
+# them and after at most AUTH_API_USER_CACHE_TTL seconds by the other ones
+AUTH_API_USER_CACHE_SIZE = 10000
+AUTH_API_USER_CACHE_TTL = 60
+
+# Put the user's project roles, read by AUTH_API_ROLE_CLAIMS_LOADER, into access tokens, so permission checks don't
+# need the database. Tokens issued before a membership change aren't trusted anymore: the change is recorded in
+# AUTH_API_ROLE_CLAIMS_CACHE, which has to be shared by every worker process and must never evict entries. Users with
+# more than AUTH_API_ROLE_CLAIMS_MAX_PROJECTS projects get no claim
+AUTH_API_ROLE_CLAIMS = False
+AUTH_API_ROLE_CLAIMS_LOADER = 'issue_tracker.services.permissions.claimable_roles'
+AUTH_API_ROLE_CLAIMS_CACHE = 'roles'
+AUTH_API_ROLE_CLAIMS_MAX_PROJECTS = 100
+
+# Refresh tokens rotated by token/refresh/ are revoked. Each worker checks them against a Bloom filter sized for
+# AUTH_API_REVOCATION_CAPACITY tokens, synced with the revoked_tokens table every AUTH_API_REVOCATION_SYNC_INTERVAL
+# seconds and rebuilt in the background every AUTH_API_REVOCATION_REBUILD_INTERVAL seconds. Each sync reads again the
+# rows revoked up to AUTH_API_REVOCATION_SYNC_OVERLAP seconds before the previous one, it must exceed the longest
+# transaction revoking a token plus the clock skew between servers. Run `manage.py compact_revoked_tokens`
+# periodically to delete expired rows
+AUTH_API_REVOCATION_CAPACITY = 1000000
+AUTH_API_REVOCATION_ERROR_RATE = 0.001
+AUTH_API_REVOCATION_SYNC_INTERVAL = 1
+AUTH_API_REVOCATION_SYNC_OVERLAP = 60
+AUTH_API_REVOCATION_REBUILD_INTERVAL = 3600
+
+# Passwords are hashed and checked on a pool of AUTH_API_HASHING_WORKERS processes (0 hashes on the request thread).
+# Past AUTH_API_HASHING_QUEUE_LIMIT jobs queued or running in one worker process, logins get 503 Service Unavailable
+AUTH_API_HASHING_WORKERS = 2
+AUTH_API_HASHING_QUEUE_LIMIT = 16
+AUTH_API_HASHING_TIMEOUT = 10
+
+# Argon2 costs, see `manage.py tune_argon2`. Memory is in KiB
+AUTH_API_ARGON2_TIME_COST = 2
+AUTH_API_ARGON2_MEMORY_COST = 65536
+AUTH_API_ARGON2_PARALLELISM = 1